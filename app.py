@@ -3,16 +3,30 @@ Black Monkeys 전용 세이버메트릭스
 Streamlit 웹 애플리케이션
 """
 
+import hmac
+import os
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
 from sabermetrics import (
-    BattingStats, PitchingStats, SabermetricsCalculator,
-    format_avg, format_era, format_percentage
+    SabermetricsCalculator, batting_leaders, calculate_player_batting_stats, calculate_player_pitching_stats,
+    format_avg, format_era, format_percentage, roster_batting_rows, team_comparison_table
+)
+from sheets_db import (
+    SHEET_AT_BATS, SHEET_ATTENDANCE, SHEET_GAMES, SHEET_PITCHING, SHEET_PLAYERS,
+    MockSheetsDB, SheetsDB, WriteBehindBuffer, attendance_stats, filter_records, format_date
 )
-from sheets_db import MockSheetsDB, SheetsDB
+from distributions import PRIOR_PLATE_APPEARANCES, OutcomeDistribution
+from instrumentation import METRICS, cached, configure_log, page_timer, span
+from lineup import LineupEvaluator, optimize_lineup
+from rolling import RollingWindows
+from simulation import LINEUP_SIZE
+from snapshot_cache import SnapshotCache
+from splits import BattingSplitCube, PitchingSplitCube
+from sqlite_db import SqliteDB
 import time
 
 # 페이지 설정
@@ -266,151 +280,249 @@ def show_grade_legend():
     """, unsafe_allow_html=True)
 
 
+def show_lineup_cards(lineup):
+    """타순 카드 표시 ((타순, 선수명, 설명) 목록)"""
+    for order, name, reason in lineup:
+        st.markdown(f"""
+        <div style="display: flex; align-items: center; padding: 12px; background: {'#0f3460' if order <= 4 else '#16213e'}; margin: 5px 0; border-radius: 10px; border: 1px solid #0f3460;">
+            <div style="font-size: 1.5rem; font-weight: bold; width: 40px; color: #64b5f6;">{order}</div>
+            <div style="flex: 1;">
+                <strong style="color: #e2e8f0;">{name}</strong><br/>
+                <span style="color: #a0aec0; font-size: 0.85rem;">{reason}</span>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart + 차트 직렬화 시간 계측 (관리자 화면의 plotly 구간)"""
+    with span('plotly'):
+        st.plotly_chart(fig, **kwargs)
+
+
+def make_write_buffer() -> WriteBehindBuffer:
+    """Sheets 쓰기 버퍼 (대기 행은 STATZ_WRITE_SPOOL 파일에 보관)"""
+    return WriteBehindBuffer(spool_path=os.environ.get('STATZ_WRITE_SPOOL', '.statz_pending.jsonl'))
+
+
+@st.cache_resource
 def get_db():
-    """데이터베이스 인스턴스 가져오기"""
-    if 'db' not in st.session_state:
+    """프로세스 공용 데이터베이스 클라이언트 (모든 세션이 공유, 인증/연결은 1회)
+
+    STATZ_DB_BACKEND 환경 변수로 저장소 선택: sheets(기본) / sqlite / mock
+    """
+    configure_log(os.environ.get('STATZ_METRICS_LOG'))  # 계측 이벤트 JSON Lines 로그 (설정한 경우만)
+    backend = os.environ.get('STATZ_DB_BACKEND', 'sheets').lower()
+    if backend == 'sqlite':
+        # 로컬 SQLite (STATZ_SQLITE_PATH, 기본 statz.db)
+        db = SqliteDB()
+    elif backend == 'mock':
+        db = MockSheetsDB()
+    else:
         # Streamlit Cloud secrets 또는 로컬 credentials 사용
         try:
             # Streamlit Cloud 환경
             from sheets_db import SheetsDBFromSecrets
-            st.session_state.db = SheetsDBFromSecrets(
+            db = SheetsDBFromSecrets(
                 credentials_dict=dict(st.secrets["gcp_service_account"]),
-                spreadsheet_url=st.secrets["spreadsheet_url"]
+                spreadsheet_url=st.secrets["spreadsheet_url"],
+                write_buffer=make_write_buffer(),
+                snapshot_cache=SnapshotCache()
             )
         except (FileNotFoundError, KeyError):
             # 로컬 환경
-            st.session_state.db = SheetsDB(
+            db = SheetsDB(
                 credentials_path="credentials.json",
-                spreadsheet_url="https://docs.google.com/spreadsheets/d/1rcWR_qwVAo_PU0ecO4_gVpWjolOq07Uifs0NlqTn5FY/edit"
+                spreadsheet_url="https://docs.google.com/spreadsheets/d/1rcWR_qwVAo_PU0ecO4_gVpWjolOq07Uifs0NlqTn5FY/edit",
+                write_buffer=make_write_buffer(),
+                snapshot_cache=SnapshotCache()
             )
-        st.session_state.db.connect()
-    return st.session_state.db
+    db.connect()  # 실패하면 캐시되지 않으므로 다음 실행에서 재시도
+    return db
+
+
+def use_snapshot(db) -> bool:
+    """원격 저장소(Google Sheets)는 시트 전체를 읽어 두고 메모리에서 필터링"""
+    return isinstance(db, SheetsDB)
+
+
+# 캐시 키에 시트 데이터 버전을 포함: 쓰기가 있었던 시트만 다시 읽고 나머지는 계속 캐시 사용
+# (버전마다 항목이 생기므로 오래된 버전은 max_entries로 정리)
+CACHE_MAX_ENTRIES = 64
+
+
+@cached('load_table', st.cache_data(max_entries=CACHE_MAX_ENTRIES))
+def _load_table(_db, title, version):
+    """시트 전체 캐싱 로드"""
+    return _db.load_tables([title])[title]
+
+
+@cached('load_records', st.cache_data(max_entries=CACHE_MAX_ENTRIES))
+def _load_records(_db, title, version, game_id=None, player_id=None):
+    """경기ID/선수ID로 필터링한 기록 캐싱 로드"""
+    if use_snapshot(_db):
+        return filter_records(load_table(_db, title), game_id, player_id)
+    getters = {SHEET_AT_BATS: _db.get_at_bats, SHEET_PITCHING: _db.get_pitching}
+    return getters[title](game_id=game_id, player_id=player_id)
+
+
+def load_table(db, title):
+    """시트 데이터 로드 (해당 시트 버전이 바뀌었을 때만 다시 읽음)"""
+    return _load_table(db, title, db.data_version(title))
 
 
-@st.cache_data(ttl=60)  # 60초 캐싱
-def load_games(_db):
-    """경기 데이터 캐싱 로드"""
-    return _db.get_games()
+def load_games(db):
+    """경기 데이터 로드"""
+    return load_table(db, SHEET_GAMES)
 
 
-@st.cache_data(ttl=60)
-def load_players(_db):
-    """선수 데이터 캐싱 로드"""
-    return _db.get_players()
+def load_players(db):
+    """선수 데이터 로드"""
+    return load_table(db, SHEET_PLAYERS)
 
 
-@st.cache_data(ttl=60)
-def load_at_bats(_db, game_id=None, player_id=None):
-    """타석 데이터 캐싱 로드"""
-    return _db.get_at_bats(game_id=game_id, player_id=player_id)
+def load_at_bats(db, game_id=None, player_id=None):
+    """타석 데이터 로드"""
+    if not game_id and not player_id:
+        return load_table(db, SHEET_AT_BATS)
+    return _load_records(db, SHEET_AT_BATS, db.data_version(SHEET_AT_BATS), game_id, player_id)
 
 
-@st.cache_data(ttl=60)
-def load_pitching(_db, game_id=None, player_id=None):
-    """투구 데이터 캐싱 로드"""
-    return _db.get_pitching(game_id=game_id, player_id=player_id)
+def load_pitching(db, game_id=None, player_id=None):
+    """투구 데이터 로드"""
+    if not game_id and not player_id:
+        return load_table(db, SHEET_PITCHING)
+    return _load_records(db, SHEET_PITCHING, db.data_version(SHEET_PITCHING), game_id, player_id)
 
 
-def calculate_player_batting_stats(df: pd.DataFrame) -> BattingStats:
-    """타석 기록 DataFrame에서 BattingStats 계산"""
-    stats = BattingStats()
+def load_attendance(db):
+    """참석 데이터 로드"""
+    return load_table(db, SHEET_ATTENDANCE)
 
-    if len(df) == 0:
-        return stats
 
-    # 타석 수
-    stats.plate_appearances = len(df)
+@cached('load_attendance_stats', st.cache_data(max_entries=CACHE_MAX_ENTRIES))
+def _load_attendance_stats(_db, version):
+    if use_snapshot(_db):
+        return attendance_stats(load_attendance(_db))
+    return _db.get_attendance_stats()
 
-    # 결과별 집계
-    for _, row in df.iterrows():
-        result = row.get('결과', '')
-        hit_type = row.get('안타종류', '')
 
-        # 안타 종류 분류
-        if result == '안타':
-            stats.hits += 1
-            if hit_type == '1루타':
-                pass  # singles는 property로 계산
-            elif hit_type == '2루타':
-                stats.doubles += 1
-            elif hit_type == '3루타':
-                stats.triples += 1
-            elif hit_type == '홈런':
-                stats.home_runs += 1
+def load_attendance_stats(db):
+    """선수별 참석률 통계 로드"""
+    return _load_attendance_stats(db, db.data_version(SHEET_ATTENDANCE))
 
-        # 볼넷, 삼진 등
-        stats.walks += int(row.get('볼넷', 0))
-        stats.strikeouts += int(row.get('삼진', 0))
-        stats.hit_by_pitch += int(row.get('사구', 0))
-        stats.sacrifice_flies += int(row.get('희생플라이', 0))
-        stats.sacrifice_bunts += int(row.get('희생번트', 0))
-        stats.rbis += int(row.get('타점', 0))
-        stats.runs += int(row.get('득점', 0))
-        stats.stolen_bases += int(row.get('도루', 0))
-        stats.caught_stealing += int(row.get('도실', 0))
 
-    # 타수 = 타석 - 볼넷 - 사구 - 희생플라이 - 희생번트
-    stats.at_bats = stats.plate_appearances - stats.walks - stats.hit_by_pitch - stats.sacrifice_flies - stats.sacrifice_bunts
+@cached('load_batting_table', st.cache_data(max_entries=CACHE_MAX_ENTRIES))
+def _load_batting_table(_db, version):
+    return SabermetricsCalculator.batting_table(load_at_bats(_db))
 
-    return stats
 
+def load_batting_table(db):
+    """선수별 타격 기록 테이블 로드 (모든 페이지 공용, 타석기록 버전 단위 캐싱)"""
+    return _load_batting_table(db, db.data_version(SHEET_AT_BATS))
 
-def calculate_player_pitching_stats(df: pd.DataFrame) -> PitchingStats:
-    """투구 기록 DataFrame에서 PitchingStats 계산"""
-    stats = PitchingStats()
 
-    if len(df) == 0:
-        return stats
+@cached('load_box_scores', st.cache_data(max_entries=CACHE_MAX_ENTRIES))
+def _load_box_scores(_db, version):
+    return _db.get_box_scores()
 
-    for _, row in df.iterrows():
-        stats.innings_pitched += float(row.get('이닝', 0))
-        stats.hits_allowed += int(row.get('피안타', 0))
-        stats.runs_allowed += int(row.get('실점', 0))
-        stats.earned_runs += int(row.get('자책', 0))
-        stats.walks += int(row.get('볼넷', 0))
-        stats.strikeouts += int(row.get('삼진', 0))
-        stats.home_runs_allowed += int(row.get('피홈런', 0))
-        stats.wins += int(row.get('승', 0))
-        stats.losses += int(row.get('패', 0))
-        stats.saves += int(row.get('세이브', 0))
 
-    return stats
+def load_box_scores(db):
+    """경기별 선수 박스스코어 로드 (저장소가 증분 유지, 타석기록 버전 단위 캐싱)"""
+    return _load_box_scores(db, db.data_version(SHEET_AT_BATS))
+
+
+@st.cache_resource
+def split_cubes() -> dict:
+    """프로세스 공용 스플릿 큐브 (새 기록만 증분 반영)"""
+    return {SHEET_AT_BATS: BattingSplitCube(), SHEET_PITCHING: PitchingSplitCube()}
+
+
+def load_split_cube(db, title):
+    """타석기록/투구기록 스플릿 큐브를 최신 기록에 맞춰 반환"""
+    records = load_at_bats(db) if title == SHEET_AT_BATS else load_pitching(db)
+    return split_cubes()[title].sync(records, load_games(db))
+
+
+@cached('load_optimal_lineup', st.cache_data(max_entries=CACHE_MAX_ENTRIES))
+def _load_optimal_lineup(_db, players_version, at_bats_version, start_names):
+    roster = roster_batting_rows(load_players(_db), load_batting_table(_db))
+    roster = roster[roster['타수'] >= 1].reset_index(drop=True)
+    names = tuple(roster['이름'])
+    positions = {name: i for i, name in enumerate(names)}
+    start = [positions[name] for name in start_names] if len(start_names) == LINEUP_SIZE else None
+    distribution = OutcomeDistribution.from_batting(roster, name_column='이름')
+    return names, optimize_lineup(LineupEvaluator(distribution), start)
+
+
+def load_optimal_lineup(db, start_names):
+    """시뮬레이션 기반 최적 타순 -> (후보 선수명, LineupResult), 선수/타석기록 버전 단위 캐싱
+
+    start_names(9명)가 있으면 그 타순에서 탐색을 시작한다.
+    """
+    return _load_optimal_lineup(db, db.data_version(SHEET_PLAYERS), db.data_version(SHEET_AT_BATS),
+                                tuple(start_names))
 
 
 # ===== 메인 앱 =====
 
+# 관리자 메뉴 (STATZ_ADMIN_KEY를 설정하고 주소에 ?admin=<그 값>을 붙였을 때만 표시)
+ADMIN_MENU = "🔧 계측"
+
+
+def is_admin() -> bool:
+    key = os.environ.get('STATZ_ADMIN_KEY')
+    if not key:
+        return False  # 키를 설정하지 않으면 관리자 화면 비활성
+    return hmac.compare_digest(st.query_params.get("admin", ""), key)
+
+
 def main():
     db = get_db()
+    db.flush_if_due()  # 쓰기 버퍼 백그라운드 전송 예약 (재시작 후 스풀에 남은 행 등)
 
     # 사이드바 - 네비게이션
     st.sidebar.title("🐵 Black Monkeys")
     st.sidebar.markdown("전용 세이버메트릭스")
     st.sidebar.divider()
 
+    menu_items = ["대시보드", "📋 참석 관리", "🧠 AI 코치", "성장 리포트", "팀 인사이트", "경기 기록", "선수 통계", "선수 관리", "경기 관리"]
+    if is_admin():
+        menu_items.append(ADMIN_MENU)
+
     menu = st.sidebar.radio(
         "메뉴",
-        ["대시보드", "📋 참석 관리", "🧠 AI 코치", "성장 리포트", "팀 인사이트", "경기 기록", "선수 통계", "선수 관리", "경기 관리"],
+        menu_items,
         label_visibility="collapsed"
     )
 
-    if menu == "대시보드":
-        show_dashboard(db)
-    elif menu == "📋 참석 관리":
-        show_attendance(db)
-    elif menu == "🧠 AI 코치":
-        show_ai_coach(db)
-    elif menu == "성장 리포트":
-        show_growth_report(db)
-    elif menu == "팀 인사이트":
-        show_team_insight(db)
-    elif menu == "경기 기록":
-        show_game_recording(db)
-    elif menu == "선수 통계":
-        show_player_stats(db)
-    elif menu == "선수 관리":
-        show_player_management(db)
-    elif menu == "경기 관리":
-        show_game_management(db)
+    # 원격 변경은 주기적으로 자동 확인하고, 바로 반영하고 싶으면 전체 시트를 다시 읽음
+    st.sidebar.divider()
+    if st.sidebar.button("🔄 새로고침", help="스프레드시트에서 직접 수정한 내용 등을 바로 다시 읽습니다"):
+        db.invalidate()  # 모든 시트 버전 증가 -> 다음 조회 시 다시 읽음
+        st.rerun()
+
+    with page_timer(menu):  # 페이지별 렌더 시간 / API 호출 / 캐시 적중 집계
+        if menu == "대시보드":
+            show_dashboard(db)
+        elif menu == "📋 참석 관리":
+            show_attendance(db)
+        elif menu == "🧠 AI 코치":
+            show_ai_coach(db)
+        elif menu == "성장 리포트":
+            show_growth_report(db)
+        elif menu == "팀 인사이트":
+            show_team_insight(db)
+        elif menu == "경기 기록":
+            show_game_recording(db)
+        elif menu == "선수 통계":
+            show_player_stats(db)
+        elif menu == "선수 관리":
+            show_player_management(db)
+        elif menu == "경기 관리":
+            show_game_management(db)
+        elif menu == ADMIN_MENU:
+            show_admin(db)
 
 
 def show_dashboard(db):
@@ -424,7 +536,7 @@ def show_dashboard(db):
         st.error("데이터를 불러오는 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
         st.caption(f"오류: {type(e).__name__}")
         if st.button("새로고침"):
-            st.cache_data.clear()
+            db.invalidate()  # 모든 시트 버전 증가 -> 다음 조회 시 다시 읽음
             st.rerun()
         return
 
@@ -453,26 +565,12 @@ def show_dashboard(db):
 
     with col1:
         st.subheader("타율 TOP 5")
-        at_bats = load_at_bats(db)
-        if len(at_bats) > 0:
-            player_avgs = []
-            for player_id in at_bats['선수ID'].unique():
-                player_abs = at_bats[at_bats['선수ID'] == player_id]
-                player_name = player_abs['선수명'].iloc[0]
-                stats = calculate_player_batting_stats(player_abs)
-                if stats.at_bats >= 1:  # 최소 1타수
-                    avg = SabermetricsCalculator.avg(stats)
-                    if avg:
-                        player_avgs.append({
-                            '선수': player_name,
-                            '타율': avg,
-                            '타수': stats.at_bats,
-                            '안타': stats.hits
-                        })
-
-            if player_avgs:
-                avg_df = pd.DataFrame(player_avgs)
-                avg_df = avg_df.sort_values('타율', ascending=False).head(5)
+        batting = load_batting_table(db)
+        if len(batting) > 0:
+            avg_df = batting_leaders(batting, 'AVG')  # 최소 1타수
+
+            if len(avg_df) > 0:
+                avg_df = avg_df[['선수명', 'AVG', '타수', '안타']].rename(columns={'선수명': '선수', 'AVG': '타율'})
                 avg_df['타율'] = avg_df['타율'].apply(lambda x: f"{x:.3f}")
                 st.dataframe(avg_df, hide_index=True, use_container_width=True)
             else:
@@ -482,25 +580,11 @@ def show_dashboard(db):
 
     with col2:
         st.subheader("OPS TOP 5")
-        if len(at_bats) > 0:
-            player_ops = []
-            for player_id in at_bats['선수ID'].unique():
-                player_abs = at_bats[at_bats['선수ID'] == player_id]
-                player_name = player_abs['선수명'].iloc[0]
-                stats = calculate_player_batting_stats(player_abs)
-                if stats.at_bats >= 1:
-                    ops = SabermetricsCalculator.ops(stats)
-                    if ops:
-                        player_ops.append({
-                            '선수': player_name,
-                            'OPS': ops,
-                            'OBP': SabermetricsCalculator.obp(stats),
-                            'SLG': SabermetricsCalculator.slg(stats)
-                        })
-
-            if player_ops:
-                ops_df = pd.DataFrame(player_ops)
-                ops_df = ops_df.sort_values('OPS', ascending=False).head(5)
+        if len(batting) > 0:
+            ops_df = batting_leaders(batting, 'OPS')
+
+            if len(ops_df) > 0:
+                ops_df = ops_df[['선수명', 'OPS', 'OBP', 'SLG']].rename(columns={'선수명': '선수'})
                 ops_df['OPS'] = ops_df['OPS'].apply(lambda x: f"{x:.3f}")
                 ops_df['OBP'] = ops_df['OBP'].apply(lambda x: f"{x:.3f}" if x else "-")
                 ops_df['SLG'] = ops_df['SLG'].apply(lambda x: f"{x:.3f}" if x else "-")
@@ -534,7 +618,8 @@ def show_dashboard(db):
             d = len(sub[sub['결과'] == '무'])
             title = lg if lg else '전체'
             st.markdown(f"**{title}**  ·  {len(sub)}경기  {w}승 {l}패" + (f" {d}무" if d else ""))
-            st.dataframe(sub[cols], hide_index=True, use_container_width=True)
+            st.dataframe(sub[cols], hide_index=True, use_container_width=True,
+                         column_config={'날짜': st.column_config.DateColumn(format="YYYY-MM-DD")})
     else:
         st.info("등록된 경기가 없습니다.")
 
@@ -561,12 +646,12 @@ def show_attendance(db):
             game_date = st.date_input("경기 날짜")
         with col2:
             if len(games) > 0:
-                game_options = ["새 경기 (훈련/연습)"] + [f"{row['날짜']} vs {row['상대팀']}" for _, row in games.iterrows()]
+                game_options = ["새 경기 (훈련/연습)"] + [f"{format_date(row['날짜'])} vs {row['상대팀']}" for _, row in games.iterrows()]
                 selected_game = st.selectbox("경기 선택", game_options)
                 if selected_game == "새 경기 (훈련/연습)":
                     game_id = f"TRAIN_{game_date.strftime('%Y%m%d')}"
                 else:
-                    game_id = games[games.apply(lambda r: f"{r['날짜']} vs {r['상대팀']}" == selected_game, axis=1)]['경기ID'].iloc[0]
+                    game_id = games[games.apply(lambda r: f"{format_date(r['날짜'])} vs {r['상대팀']}" == selected_game, axis=1)]['경기ID'].iloc[0]
             else:
                 game_id = f"TRAIN_{game_date.strftime('%Y%m%d')}"
                 st.info("등록된 경기가 없습니다. 훈련/연습으로 기록됩니다.")
@@ -616,7 +701,6 @@ def show_attendance(db):
                 count = db.add_attendance_batch(attendance_records)
                 attended_count = sum(1 for r in attendance_records if r['attended'])
                 st.success(f"✅ {count}명 참석 기록 저장 완료! (참석: {attended_count}명, 불참: {count - attended_count}명)")
-                st.cache_data.clear()
                 time.sleep(1)
                 st.rerun()
             except Exception as e:
@@ -626,7 +710,7 @@ def show_attendance(db):
         st.subheader("선수별 참석률 현황")
 
         try:
-            stats = db.get_attendance_stats()
+            stats = load_attendance_stats(db)
             if len(stats) > 0:
                 # 참석률에 따른 색상
                 def highlight_rate(val):
@@ -663,11 +747,11 @@ def show_attendance(db):
         st.subheader("경기별 참석 현황")
 
         try:
-            attendance_df = db.get_attendance()
+            attendance_df = load_attendance(db)
             if len(attendance_df) > 0:
                 # 경기별로 그룹화
-                game_dates = attendance_df['경기일'].unique()
-                selected_date = st.selectbox("경기 날짜 선택", sorted(game_dates, reverse=True))
+                game_dates = attendance_df['경기일'].dropna().unique()
+                selected_date = st.selectbox("경기 날짜 선택", sorted(game_dates, reverse=True), format_func=format_date)
 
                 game_attendance = attendance_df[attendance_df['경기일'] == selected_date]
 
@@ -691,6 +775,26 @@ def show_attendance(db):
             st.error(f"경기별 참석 조회 중 오류: {e}")
 
 
+def show_pending_writes(db, key: str):
+    """전송 대기 중인 기록 수 표시 + 즉시 전송 버튼"""
+    pending = db.pending_writes()
+    if pending == 0:
+        return
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"⏳ 전송 대기 중인 기록 {pending}건 (잠시 후 자동 전송)")
+        error = db.last_flush_error()
+        if error:
+            st.caption(f"⚠️ 마지막 전송 실패: {error} (대기열에 보관되어 재시도됩니다)")
+    with col2:
+        if st.button("지금 전송", key=key):
+            try:
+                sent = db.flush()
+                st.success(f"{sent}건 전송 완료")
+            except Exception as e:
+                st.error(f"전송 실패 (대기열에 보관되어 재시도됩니다): {e}")
+
+
 def show_game_recording(db):
     """경기 기록 화면"""
     st.title("경기 기록 입력")
@@ -707,7 +811,7 @@ def show_game_recording(db):
         return
 
     # 경기 선택
-    game_options = {f"{row['날짜']} vs {row['상대팀']}": row['경기ID']
+    game_options = {f"{format_date(row['날짜'])} vs {row['상대팀']}": row['경기ID']
                     for _, row in games.iterrows()}
     selected_game = st.selectbox("경기 선택", list(game_options.keys()))
     game_id = game_options[selected_game]
@@ -777,6 +881,8 @@ def show_game_recording(db):
             st.success(f"기록 저장 완료! {player_name} - {inning}회 {result}")
             st.rerun()
 
+        show_pending_writes(db, key="flush_batting")
+
         # 이 경기 타석 기록 표시
         st.divider()
         st.subheader("이 경기 타석 기록")
@@ -833,6 +939,8 @@ def show_game_recording(db):
             st.success(f"투구 기록 저장 완료! {pitcher_name} - {innings}이닝")
             st.rerun()
 
+        show_pending_writes(db, key="flush_pitching")
+
         # 이 경기 투구 기록 표시
         st.divider()
         st.subheader("이 경기 투구 기록")
@@ -867,8 +975,8 @@ def show_player_stats(db):
 
     st.divider()
 
-    # 타격/투구 탭
-    tab1, tab2 = st.tabs(["타격 기록", "투구 기록"])
+    # 타격/투구/스플릿 탭
+    tab1, tab2, tab3 = st.tabs(["타격 기록", "투구 기록", "스플릿"])
 
     with tab1:
         at_bats = load_at_bats(db, player_id=player_id)
@@ -990,6 +1098,52 @@ def show_player_stats(db):
                 use_container_width=True
             )
 
+    with tab3:
+        show_player_splits(db, player_id)
+
+
+# 스플릿 화면의 기준 차원 (표시 이름 -> 큐브 차원)
+SPLIT_GROUPS = {'이닝': '이닝', '타순': '타순', '상대팀': '상대팀', '구장': '구장', '홈/원정': '홈/원정', '리그': '리그'}
+
+
+def show_player_splits(db, player_id):
+    """상황별(이닝/타순/상대팀/구장/홈·원정/리그) 기록 - 스플릿 큐브 조회"""
+    kind = st.radio("구분", ["타격", "투구"], horizontal=True, key="split_kind")
+    cube = load_split_cube(db, SHEET_AT_BATS if kind == "타격" else SHEET_PITCHING)
+    group_options = [label for label, dim in SPLIT_GROUPS.items() if dim in cube.dimensions]
+    group = st.selectbox("기준", group_options, key="split_group")
+
+    # 조건: 경기 차원은 값 선택, 이닝은 범위
+    where = {'선수ID': player_id}
+    filter_dims = [dim for dim in ('상대팀', '구장', '홈/원정', '리그') if dim in cube.dimensions]
+    cols = st.columns(len(filter_dims))
+    for col, dim in zip(cols, filter_dims):
+        with col:
+            chosen = st.multiselect(dim, [v for v in cube.levels(dim) if v], key=f"split_filter_{dim}")
+        if chosen:
+            where[dim] = chosen
+    if '이닝' in cube.dimensions and cube.levels('이닝'):
+        innings = cube.levels('이닝')
+        low, high = int(min(innings)), int(max(innings))
+        if low < high:
+            start, end = st.slider("이닝", low, high, (low, high), key="split_innings")
+            if (start, end) != (low, high):
+                where['이닝'] = lambda inning: start <= inning <= end
+
+    table = cube.query(by=[SPLIT_GROUPS[group]], where=where)
+    if kind == "타격":
+        table = table[table['타석'] > 0]
+        columns = [SPLIT_GROUPS[group], '타석', '타수', '안타', '홈런', '타점', '볼넷', '삼진', 'AVG', 'OBP', 'SLG', 'OPS']
+    else:
+        table = table[table['경기'] > 0]
+        columns = [SPLIT_GROUPS[group], '경기', '이닝', '피안타', '자책', '볼넷', '삼진', 'ERA', 'WHIP', 'K/9']
+    if len(table) == 0:
+        st.info("조건에 맞는 기록이 없습니다.")
+        return
+    st.dataframe(table[columns], hide_index=True, use_container_width=True,
+                 column_config={column: st.column_config.NumberColumn(format="%.3f")
+                                for column in ('AVG', 'OBP', 'SLG', 'OPS')})
+
 
 def show_player_management(db):
     """선수 관리 화면"""
@@ -1050,31 +1204,32 @@ def show_growth_report(db):
     player_id = player_options[selected_player]
     player_info = players[players['선수ID'] == player_id].iloc[0]
 
-    # 타석 데이터 가져오기 - 선수명으로도 필터링 (ID 불일치 대비)
-    all_at_bats = load_at_bats(db)
+    # 박스스코어 가져오기 - 선수명으로도 필터링 (ID 불일치 대비)
+    box_scores = load_box_scores(db)
     player_name = player_info['이름']
 
     # 선수ID 또는 선수명으로 필터링
-    at_bats = all_at_bats[
-        (all_at_bats['선수ID'] == player_id) |
-        (all_at_bats['선수명'] == player_name)
+    player_box = box_scores[
+        (box_scores['선수ID'] == player_id) |
+        (box_scores['선수명'] == player_name)
     ]
 
-    # 경기별로 그룹화
-    games = at_bats['경기ID'].unique() if len(at_bats) > 0 else []
+    # 경기 날짜순 누적합 (선수명으로 찾은 행도 같은 선수로 합산)
     total_games = load_games(db)
+    windows = RollingWindows(player_box.assign(선수ID=player_id), total_games)
+    games = list(windows.lines['경기ID'])
 
     st.markdown(f"### {player_info['이름']} #{player_info['등번호']}")
     st.caption(f"출전: {len(games)}경기 / 전체 {len(total_games)}경기")
     st.divider()
 
-    if len(at_bats) == 0:
+    if len(games) == 0:
         st.info("아직 기록이 없습니다. 경기에 출전하면 기록이 생성됩니다!")
         return
 
-    # 현재 성적 표시 (1경기 이상이면 표시)
-    stats = calculate_player_batting_stats(at_bats)
+    # 현재 성적 표시 (1경기 이상이면 표시) - 시즌/구간 성적은 모두 누적합의 차이
     calc = SabermetricsCalculator
+    stats = calc.stats_from_counts(windows.season().iloc[0])
 
     st.subheader("📊 현재 성적")
     col1, col2, col3, col4 = st.columns(4)
@@ -1094,43 +1249,33 @@ def show_growth_report(db):
         return
 
     # 경기별 성적 계산
-    game_stats = []
-    for game_id in games:
-        game_abs = at_bats[at_bats['경기ID'] == game_id]
-        stats = calculate_player_batting_stats(game_abs)
-        calc = SabermetricsCalculator
-
-        game_stats.append({
-            '경기': game_id[-4:],  # 마지막 4자리만
-            '타수': stats.at_bats,
-            '안타': stats.hits,
-            '타율': calc.avg(stats) or 0,
-            'OPS': calc.ops(stats) or 0,
-            '삼진': stats.strikeouts,
-            '볼넷': stats.walks,
-            '삼진률': (stats.strikeouts / stats.plate_appearances * 100) if stats.plate_appearances > 0 else 0,
-            '볼넷률': (stats.walks / stats.plate_appearances * 100) if stats.plate_appearances > 0 else 0,
-        })
-
-    game_df = pd.DataFrame(game_stats)
+    game_rates = windows.per_game()
+    game_df = pd.DataFrame({
+        '경기': game_rates['경기ID'].astype(str).str[-4:],  # 마지막 4자리만
+        '타수': game_rates['타수'],
+        '안타': game_rates['안타'],
+        '타율': game_rates['AVG'].fillna(0),
+        'OPS': game_rates['OPS'].fillna(0),
+        '삼진': game_rates['삼진'],
+        '볼넷': game_rates['볼넷'],
+        '삼진률': (game_rates['K%'] * 100).fillna(0),
+        '볼넷률': (game_rates['BB%'] * 100).fillna(0),
+    })
 
     # === 트렌드 분석 ===
     st.subheader("📊 최근 경기 트렌드")
 
-    # 최근 5경기 vs 이전 경기 비교
+    # 최근 5경기 vs 이전 경기 비교 (경기 날짜순)
     recent_n = min(5, len(games))
-    recent_games = list(games)[-recent_n:]
-    older_games = list(games)[:-recent_n] if len(games) > recent_n else []
+    older_games = games[:-recent_n] if len(games) > recent_n else []
 
-    recent_abs = at_bats[at_bats['경기ID'].isin(recent_games)]
-    recent_stats = calculate_player_batting_stats(recent_abs)
+    recent_stats = calc.stats_from_counts(windows.last_games(recent_n).iloc[0])
     recent_avg = SabermetricsCalculator.avg(recent_stats) or 0
     recent_ops = SabermetricsCalculator.ops(recent_stats) or 0
     recent_k_rate = (recent_stats.strikeouts / recent_stats.plate_appearances * 100) if recent_stats.plate_appearances > 0 else 0
 
     if older_games:
-        older_abs = at_bats[at_bats['경기ID'].isin(older_games)]
-        older_stats = calculate_player_batting_stats(older_abs)
+        older_stats = calc.stats_from_counts(windows.before_last_games(recent_n).iloc[0])
         older_avg = SabermetricsCalculator.avg(older_stats) or 0
         older_ops = SabermetricsCalculator.ops(older_stats) or 0
         older_k_rate = (older_stats.strikeouts / older_stats.plate_appearances * 100) if older_stats.plate_appearances > 0 else 0
@@ -1175,7 +1320,7 @@ def show_growth_report(db):
             yaxis=dict(range=[0, max(0.5, game_df['타율'].max() + 0.1)]),
             height=300
         )
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart(fig, use_container_width=True)
 
     st.divider()
 
@@ -1185,8 +1330,7 @@ def show_growth_report(db):
     advice_list = []
 
     # 전체 통계
-    total_stats = calculate_player_batting_stats(at_bats)
-    calc = SabermetricsCalculator
+    total_stats = stats
 
     total_avg = calc.avg(total_stats) or 0
     total_ops = calc.ops(total_stats) or 0
@@ -1643,21 +1787,14 @@ def show_ai_coach(db):
             st.markdown("#### 🔍 선수별 상세 분석")
 
             player_analysis = []
-            for _, player in players.iterrows():
-                player_abs = at_bats[at_bats['선수ID'] == player['선수ID']]
-                if len(player_abs) == 0:
-                    continue
-
-                stats = calculate_player_batting_stats(player_abs)
-                if stats.plate_appearances < 3:
-                    continue
-
-                avg = calc.avg(stats) or 0
-                obp = calc.obp(stats) or 0
-                ops = calc.ops(stats) or 0
-                iso = calc.iso(stats) or 0
-                k_rate = (stats.strikeouts / stats.plate_appearances * 100) if stats.plate_appearances > 0 else 0
-                bb_rate = (stats.walks / stats.plate_appearances * 100) if stats.plate_appearances > 0 else 0
+            roster = roster_batting_rows(players, load_batting_table(db))
+            for player in roster[roster['타석'] >= 3].to_dict('records'):
+                avg = player['AVG']
+                obp = player['OBP']
+                ops = player['OPS']
+                iso = player['ISO']
+                k_rate = player['K%'] * 100
+                bb_rate = player['BB%'] * 100
 
                 # 타입 판별
                 if iso >= 0.150 and k_rate > 20:
@@ -1684,7 +1821,7 @@ def show_ai_coach(db):
 
                 player_analysis.append({
                     '선수': player['이름'],
-                    '타석': stats.plate_appearances,
+                    '타석': player['타석'],
                     '타율': avg,
                     'OPS': ops,
                     'K%': k_rate,
@@ -1802,39 +1939,11 @@ def show_team_insight(db):
         st.subheader("팀원 성적 비교")
         show_grade_legend()
 
-        # 모든 선수 성적 계산
-        player_stats_list = []
-        for _, player in players.iterrows():
-            player_abs = at_bats[at_bats['선수ID'] == player['선수ID']]
-            if len(player_abs) > 0:
-                stats = calculate_player_batting_stats(player_abs)
-                calc = SabermetricsCalculator
-                if stats.at_bats >= 1:  # 최소 1타수
-                    avg = calc.avg(stats) or 0
-                    ops = calc.ops(stats) or 0
-                    obp = calc.obp(stats) or 0
-                    slg = calc.slg(stats) or 0
-
-                    woba = calc.woba(stats) or 0
-
-                    player_stats_list.append({
-                        '선수': player['이름'],
-                        '타수': stats.at_bats,
-                        '안타': stats.hits,
-                        '타율': avg,
-                        '출루율': obp,
-                        '장타율': slg,
-                        'OPS': ops,
-                        'wOBA': woba,
-                        '홈런': stats.home_runs,
-                        '타점': stats.rbis,
-                        '삼진': stats.strikeouts,
-                        '볼넷': stats.walks,
-                    })
+        # 모든 선수 성적 계산 (최소 1타수, OPS 순)
+        stats_df = team_comparison_table(players, load_batting_table(db))
+        player_stats_list = stats_df.sort_index().to_dict('records')  # 비교 차트 기본 선택은 등록 순서
 
         if player_stats_list:
-            stats_df = pd.DataFrame(player_stats_list)
-            stats_df = stats_df.sort_values('OPS', ascending=False)
 
             # 등급 색상 적용
             def color_grade(val, stat_name):
@@ -1843,7 +1952,7 @@ def show_team_insight(db):
                 grade, color = get_grade(stat_name, val)
                 return f'color: {color}; font-weight: bold'
 
-            styled_df = stats_df.copy()
+            styled_df = stats_df.drop(columns=['선수ID'])
             styled_df['타율'] = styled_df['타율'].apply(lambda x: f"{x:.3f}")
             styled_df['출루율'] = styled_df['출루율'].apply(lambda x: f"{x:.3f}")
             styled_df['장타율'] = styled_df['장타율'].apply(lambda x: f"{x:.3f}")
@@ -1891,29 +2000,29 @@ def show_team_insight(db):
                         showlegend=True,
                         height=400
                     )
-                    st.plotly_chart(fig, use_container_width=True)
+                    plotly_chart(fig, use_container_width=True)
+
+            # 전 선수 롤링 OPS (경기 날짜순 누적합으로 한 번에 계산)
+            st.subheader("롤링 OPS 추이")
+            window_n = st.slider("구간 (최근 N경기)", 1, 10, 5, key="rolling_ops_window")
+            rolling = RollingWindows(load_box_scores(db), games).rolling(window_n)
+            rolling = rolling[rolling['선수ID'].isin(stats_df['선수ID'])]
+            if len(rolling) > 0:
+                fig = px.line(rolling, x='날짜', y='OPS', color='선수명', markers=True,
+                              labels={'날짜': '경기일', '선수명': '선수'})
+                fig.update_layout(height=400)
+                plotly_chart(fig, use_container_width=True)
         else:
             st.info("충분한 타석 기록이 있는 선수가 없습니다.")
 
     with tab2:
         st.subheader("🎯 최적 타순 추천")
-        st.caption("OPS 기반 타순 최적화")
+        st.caption("득점 기대값 기반 타순 최적화 (경기당 기대 득점)")
 
         if player_stats_list:
-            # 타순 추천 로직
+            # OPS 기반 타순 (탐색 시작점 + 비교용)
             sorted_players = sorted(player_stats_list, key=lambda x: x['OPS'], reverse=True)
 
-            st.markdown("""
-            **타순 구성 원칙:**
-            - 1번: 출루율 높은 선수
-            - 2번: 컨택 좋고 출루율 높은 선수
-            - 3번: 가장 좋은 타자 (OPS 최고)
-            - 4번: 장타력 + 타점 능력
-            - 5번 이하: OPS 순
-            """)
-
-            st.divider()
-
             # 출루율 기준 정렬 (1,2번용)
             by_obp = sorted(player_stats_list, key=lambda x: x['출루율'], reverse=True)
             # 장타율 기준 정렬 (4번용)
@@ -1957,17 +2066,40 @@ def show_team_insight(db):
                     used.add(p['선수'])
                     order_num += 1
 
-            # 표시
-            for order, name, reason in recommended_order:
-                st.markdown(f"""
-                <div style="display: flex; align-items: center; padding: 12px; background: {'#0f3460' if order <= 4 else '#16213e'}; margin: 5px 0; border-radius: 10px; border: 1px solid #0f3460;">
-                    <div style="font-size: 1.5rem; font-weight: bold; width: 40px; color: #64b5f6;">{order}</div>
-                    <div style="flex: 1;">
-                        <strong style="color: #e2e8f0;">{name}</strong><br/>
-                        <span style="color: #a0aec0; font-size: 0.85rem;">{reason}</span>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            if len(player_stats_list) >= LINEUP_SIZE:
+                with st.spinner("타순 시뮬레이션 중..."):
+                    names, result = load_optimal_lineup(db, tuple(name for _, name, _ in recommended_order))
+                stats_by_name = {p['선수']: p for p in player_stats_list}
+
+                col1, col2, col3 = st.columns(3)
+                col1.metric("경기당 기대 득점", f"{result.runs:.2f}",
+                            delta=f"{result.runs - result.start_runs:+.2f} (OPS 기반 대비)")
+                col2.metric("OPS 기반 타순", f"{result.start_runs:.2f}")
+                col3.metric("평가한 타순", f"{result.evaluations}개")
+
+                optimized_order = []
+                for order, index in enumerate(result.lineup, start=1):
+                    name = names[index]
+                    p = stats_by_name[name]
+                    optimized_order.append((order, name, f"출루율 {p['출루율']:.3f} · 장타율 {p['장타율']:.3f} · OPS {p['OPS']:.3f}"))
+                show_lineup_cards(optimized_order)
+
+                with st.expander("OPS 기반 타순 (비교)"):
+                    st.markdown("""
+                    **타순 구성 원칙:**
+                    - 1번: 출루율 높은 선수
+                    - 2번: 컨택 좋고 출루율 높은 선수
+                    - 3번: 가장 좋은 타자 (OPS 최고)
+                    - 4번: 장타력 + 타점 능력
+                    - 5번 이하: OPS 순
+                    """)
+                    show_lineup_cards(recommended_order)
+
+                st.caption(f"선수별 타석 결과 분포(팀 평균 {PRIOR_PLATE_APPEARANCES}타석 보정)로 "
+                           f"타순마다 주자·아웃 24개 상황의 마르코프 체인 기대 득점을 계산해 비교합니다.")
+            else:
+                st.info(f"시뮬레이션 타순 추천은 기록 있는 선수가 {LINEUP_SIZE}명 이상일 때 가능합니다. OPS 기반 타순을 표시합니다.")
+                show_lineup_cards(recommended_order)
         else:
             st.info("충분한 기록이 있는 선수가 필요합니다.")
 
@@ -2088,7 +2220,7 @@ def show_game_management(db):
 
             styled_df = games[['날짜', '상대팀', '홈/원정', '우리점수', '상대점수', '결과', '구장']].style.map(
                 highlight_result, subset=['결과']
-            )
+            ).format({'날짜': format_date})
             st.dataframe(styled_df, hide_index=True, use_container_width=True)
 
             # 통계
@@ -2107,5 +2239,59 @@ def show_game_management(db):
             st.info("등록된 경기가 없습니다.")
 
 
+def show_admin(db):
+    """계측 화면 (숨김 메뉴): 페이지별 시간, Sheets API 호출, 캐시 적중률"""
+    st.title("🔧 계측")
+    st.caption(f"집계 시작: {METRICS.started_at:%Y-%m-%d %H:%M:%S} (프로세스 공용)")
+
+    pages = METRICS.page_table()
+    apis = METRICS.api_table()
+    caches = METRICS.cache_table()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("API 호출", int(apis['호출'].sum()))
+    with col2:
+        st.metric("읽은 행", f"{int(apis['읽은 행'].sum()):,}")
+    with col3:
+        lookups = caches['적중'].sum() + caches['실패'].sum()
+        st.metric("캐시 적중률", format_percentage(caches['적중'].sum() / lookups) if lookups else "-")
+    with col4:
+        st.metric("렌더", int(pages['렌더'].sum()))
+    if hasattr(db, 'api_stats'):
+        limiter = db.api_stats()
+        st.caption(f"할당량 limiter: 호출 {limiter['calls']} · 대기 {limiter['throttled']} · "
+                   f"재시도 {limiter['retried']} · 실패 {limiter['failed']}")
+
+    st.subheader("페이지별")
+    if len(pages):
+        pages = pages.sort_values('API 호출', ascending=False)
+        fig = px.bar(pages, x='페이지', y='API 호출', title="페이지별 Sheets API 호출")
+        plotly_chart(fig, use_container_width=True)
+        st.dataframe(pages.round(1), hide_index=True, use_container_width=True)
+        st.caption("로드: 캐시 실패로 load_* 본문(API 호출 포함)을 실행한 시간, 평균 - 로드 = 집계/렌더 시간")
+    else:
+        st.info("아직 기록이 없습니다.")
+
+    st.subheader("Sheets API")
+    if len(apis):
+        st.dataframe(apis.sort_values('호출', ascending=False).round(1), hide_index=True, use_container_width=True)
+    else:
+        st.info("API 호출이 없습니다 (SQLite/인메모리 저장소 또는 스냅샷으로 응답 중).")
+
+    st.subheader("load_* 캐시")
+    if len(caches):
+        st.dataframe(caches.round(3), hide_index=True, use_container_width=True)
+
+    with st.expander("최근 이벤트"):
+        st.dataframe(METRICS.recent_events(), hide_index=True, use_container_width=True)
+    if os.environ.get('STATZ_METRICS_LOG'):
+        st.caption(f"구조화 로그: {os.environ['STATZ_METRICS_LOG']}")
+
+    if st.button("집계 초기화"):
+        METRICS.reset()
+        st.rerun()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,8 @@
+"""
+성능 벤치마크 패키지
+합성 리그(선수 수/경기 수/타석 수 지정)를 저장소에 만들고 앱이 실제로 거치는 경로의 시간을 재서
+커밋 간 비교할 수 있는 JSON으로 출력
+
+    python -m benchmarks --players 50 --games 2000 --output bench.json
+    python -m benchmarks.compare before.json after.json
+"""
@@ -0,0 +1,117 @@
+"""
+벤치마크 실행
+python -m benchmarks [--players 50] [--games 2000 | --plate-appearances 300000] [--output bench.json]
+
+합성 리그를 인메모리(MockSheetsDB)와 SQLite 저장소에 만들고 함수/페이지 벤치마크를 돌려
+결과를 JSON(커밋, 환경, 리그 크기, 항목별 시간)으로 저장
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+from benchmarks.cases import CASES, run_cases
+from benchmarks.league import build_league
+from benchmarks.pages import PAGES, run_pages
+
+SCHEMA_VERSION = 1
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(['git', *args], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def environment() -> dict:
+    """커밋/실행 환경 (결과 비교 시 같은 조건인지 확인용)"""
+    import numpy
+    import pandas
+    import streamlit
+
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'packages': {'numpy': numpy.__version__, 'pandas': pandas.__version__, 'streamlit': streamlit.__version__},
+    }
+
+
+def _print_results(results: list):
+    print(f"\n{'종류':<9}{'저장소':<8}{'항목':<36}{'중앙값(ms)':>12}{'최소(ms)':>12}")
+    for r in results:
+        print(f"{r['kind']:<9}{r['backend']:<8}{r['name']:<36}{r['median'] * 1000:>12.1f}{r['min'] * 1000:>12.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="합성 리그 성능 벤치마크")
+    parser.add_argument('--players', type=int, default=50, help="선수 수")
+    parser.add_argument('--games', type=int, default=2000, help="경기 수")
+    parser.add_argument('--plate-appearances', type=int, default=None, help="타석 수 (주면 --games 대신 사용)")
+    parser.add_argument('--seed', type=int, default=0, help="리그 생성 시드")
+    parser.add_argument('--repeat', type=int, default=5, help="항목별 측정 횟수")
+    parser.add_argument('--backends', nargs='+', choices=['memory', 'sqlite'], default=['memory', 'sqlite'])
+    parser.add_argument('--cases', nargs='+', choices=[name for name, _ in CASES], default=None,
+                        help="함수 벤치마크 항목 (기본: 전체)")
+    parser.add_argument('--pages', nargs='*', choices=PAGES, default=None,
+                        help="페이지 벤치마크 메뉴 (기본: 전체, 값 없이 주면 생략)")
+    parser.add_argument('--sqlite-path', default=None, help="SQLite 리그 파일 (기본: 임시 파일)")
+    parser.add_argument('--output', default=None, help="결과 JSON 파일 (기본: 표준 출력에 표만)")
+    args = parser.parse_args(argv)
+
+    from sheets_db import MockSheetsDB
+    from sqlite_db import SqliteDB
+
+    report = {'schema': SCHEMA_VERSION, 'environment': environment(), 'league': None, 'results': []}
+    run_pages_ = args.pages != []
+    needs_sqlite = 'sqlite' in args.backends or run_pages_
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_path = args.sqlite_path or os.path.join(tmp, 'league.db')
+        dbs = {}
+        if 'memory' in args.backends:
+            dbs['memory'] = MockSheetsDB()
+        if needs_sqlite:
+            dbs['sqlite'] = SqliteDB(sqlite_path)
+
+        for backend, db in dbs.items():
+            db.connect()
+            league = build_league(db, args.players, args.games, args.plate_appearances, args.seed)
+            print(f"[{backend}] 리그 생성: 선수 {league['players']}명, 경기 {league['games']:,}, "
+                  f"타석 {league['plate_appearances']:,}, 참석 {league['attendance']:,} "
+                  f"({league['build_seconds']:.1f}초)", file=sys.stderr)
+            report['league'] = {key: value for key, value in league.items() if key != 'build_seconds'}
+            report.setdefault('build_seconds', {})[backend] = league['build_seconds']
+
+        for backend, db in dbs.items():
+            if backend in args.backends:
+                print(f"[{backend}] 함수 벤치마크", file=sys.stderr)
+                report['results'] += run_cases(db, backend, args.repeat, args.cases)
+        if run_pages_:
+            print("[sqlite] 페이지 벤치마크", file=sys.stderr)
+            report['results'] += run_pages(sqlite_path, args.repeat, args.pages)
+        for db in dbs.values():
+            if hasattr(db, 'close'):
+                db.close()
+
+    _print_results(report['results'])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+함수 단위 벤치마크
+app.py의 페이지가 호출하는 저장소 조회/집계 경로를 Streamlit 없이 실행
+(app.py 화면이 쓰는 sabermetrics의 공용 집계 함수와 load_* 래퍼가 위임하는 저장소 메서드)
+"""
+
+import statistics
+import time
+
+from distributions import OutcomeDistribution
+from lineup import LineupEvaluator, optimize_lineup
+from rolling import RollingWindows
+from sabermetrics import (
+    SabermetricsCalculator, batting_leaders, calculate_player_batting_stats, roster_batting_rows,
+    team_comparison_table
+)
+from sheets_db import ALL_SHEETS, SHEET_AT_BATS, SHEET_ATTENDANCE, SHEET_GAMES, SHEET_PLAYERS, attendance_stats
+
+
+def measure(fn, repeat: int = 5, warmup: int = 1, setup=None) -> dict:
+    """fn()을 warmup회 버리고 repeat회 실행한 시간(초) 통계 (setup은 매 실행 전에 호출, 측정 제외)"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {
+        'repeat': repeat,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'max': max(samples),
+        'samples': samples,
+    }
+
+
+def _load_tables(db, data):
+    """앱 첫 화면: 전체 시트 로드 (_load_table)"""
+    db.load_tables(list(ALL_SHEETS))
+
+
+def _batting_table(db, data):
+    """선수별 타격 테이블 (load_batting_table, 대시보드/팀 인사이트 공용)"""
+    SabermetricsCalculator.batting_table(data[SHEET_AT_BATS])
+
+
+def _dashboard_top5(db, data):
+    """대시보드 타율/OPS TOP 5 (타격 테이블 + batting_leaders)"""
+    batting = SabermetricsCalculator.batting_table(data[SHEET_AT_BATS])
+    batting_leaders(batting, 'AVG')
+    batting_leaders(batting, 'OPS')
+
+
+def _calculate_player_batting_stats(db, data):
+    """선수 통계/AI 코치: 전 선수의 선수별 타석 조회 + calculate_player_batting_stats"""
+    for player_id in data[SHEET_PLAYERS]['선수ID']:
+        calculate_player_batting_stats(db.get_at_bats(player_id=player_id))
+
+
+def _get_attendance_stats(db, data):
+    """참석 관리: 저장소의 선수별 참석률 집계 (load_attendance_stats)"""
+    db.get_attendance_stats()
+
+
+def _attendance_stats_frame(db, data):
+    """참석 관리 (스냅샷 모드): 참석 기록 DataFrame 집계"""
+    attendance_stats(data[SHEET_ATTENDANCE])
+
+
+def _team_insight_table(db, data):
+    """팀 인사이트 팀원 비교 표 (team_comparison_table)"""
+    team_comparison_table(data[SHEET_PLAYERS], SabermetricsCalculator.batting_table(data[SHEET_AT_BATS]))
+
+
+def _optimal_lineup(db, data):
+    """팀 인사이트 최적 타순 (기록 기반 분포 + 기대 득점 국소 탐색)"""
+    roster = roster_batting_rows(data[SHEET_PLAYERS], SabermetricsCalculator.batting_table(data[SHEET_AT_BATS]))
+    roster = roster[roster['타수'] >= 1].reset_index(drop=True)
+    optimize_lineup(LineupEvaluator(OutcomeDistribution.from_batting(roster, name_column='이름')))
+
+
+def _growth_report(db, data):
+    """성장 리포트: 전 선수의 박스스코어 누적합 + 시즌/최근 5경기/경기별 성적"""
+    box_scores = db.get_box_scores()
+    games = data[SHEET_GAMES]
+    for player_id in data[SHEET_PLAYERS]['선수ID']:
+        windows = RollingWindows(box_scores[box_scores['선수ID'] == player_id], games)
+        if len(windows.lines) == 0:
+            continue
+        windows.season()
+        windows.last_games(5)
+        windows.before_last_games(5)
+        windows.per_game()
+
+
+def _rolling_ops(db, data):
+    """팀 인사이트 롤링 OPS 추이 (전 선수 최근 5경기)"""
+    RollingWindows(db.get_box_scores(), data[SHEET_GAMES]).rolling(5)
+
+
+# (이름, 함수) - 함수는 (db, 미리 읽은 시트별 DataFrame)을 받음
+CASES = [
+    ('load_tables', _load_tables),
+    ('batting_table', _batting_table),
+    ('dashboard_top5', _dashboard_top5),
+    ('calculate_player_batting_stats', _calculate_player_batting_stats),
+    ('get_attendance_stats', _get_attendance_stats),
+    ('attendance_stats_frame', _attendance_stats_frame),
+    ('team_insight_table', _team_insight_table),
+    ('optimal_lineup', _optimal_lineup),
+    ('growth_report', _growth_report),
+    ('rolling_ops', _rolling_ops),
+]
+
+
+def run_cases(db, backend: str, repeat: int = 5, names=None) -> list:
+    """저장소 하나에서 CASES 실행 -> 결과 레코드 목록"""
+    data = db.load_tables(list(ALL_SHEETS))
+    results = []
+    for name, fn in CASES:
+        if names and name not in names:
+            continue
+        timing = measure(lambda: fn(db, data), repeat=repeat)
+        results.append({'kind': 'function', 'backend': backend, 'name': name,
+                        'description': fn.__doc__, **timing})
+    return results
@@ -0,0 +1,56 @@
+"""
+벤치마크 결과 비교
+python -m benchmarks.compare before.json after.json [--threshold 1.2]
+
+두 결과의 같은 항목(종류, 저장소, 이름) 중앙값을 비교해 threshold배 이상 느려진 항목이 있으면 종료 코드 1
+"""
+
+import argparse
+import json
+import sys
+
+THRESHOLD = 1.2
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(before: dict, after: dict, threshold: float = THRESHOLD) -> list:
+    """항목별 (키, 이전 중앙값, 이후 중앙값, 비율, 회귀 여부) 목록 (양쪽에 모두 있는 항목만)"""
+    old = {(r['kind'], r['backend'], r['name']): r['median'] for r in before['results']}
+    rows = []
+    for r in after['results']:
+        key = (r['kind'], r['backend'], r['name'])
+        if key in old:
+            ratio = r['median'] / old[key] if old[key] > 0 else float('inf')
+            rows.append((key, old[key], r['median'], ratio, ratio >= threshold))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare', description="벤치마크 결과 비교")
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help="회귀로 볼 중앙값 비율")
+    args = parser.parse_args(argv)
+
+    before, after = _load(args.before), _load(args.after)
+    if before.get('league') != after.get('league'):
+        print(f"주의: 리그 크기가 다릅니다 ({before.get('league')} / {after.get('league')})")
+    print(f"이전 {before['environment']['commit'][:10]} -> 이후 {after['environment']['commit'][:10]}")
+
+    rows = compare(before, after, args.threshold)
+    print(f"\n{'종류':<9}{'저장소':<8}{'항목':<36}{'이전(ms)':>10}{'이후(ms)':>10}{'비율':>8}")
+    for (kind, backend, name), old, new, ratio, regressed in rows:
+        mark = "  회귀" if regressed else ""
+        print(f"{kind:<9}{backend:<8}{name:<36}{old * 1000:>10.1f}{new * 1000:>10.1f}{ratio:>8.2f}{mark}")
+
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n회귀 {regressions}건 (기준 {args.threshold:.2f}배)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
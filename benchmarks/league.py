@@ -0,0 +1,81 @@
+"""
+합성 리그 생성
+선수 수에 맞춘 명단(rosters.Team)을 만들고 synthetic의 배치 생성기로 저장소에 기록
+"""
+
+import time
+from datetime import date
+
+import numpy as np
+
+from rosters import Team
+from synthetic import DatabaseSink, SimulatedBatch, generate_batches
+
+POSITIONS = ["투수", "포수", "1루수", "2루수", "유격수", "3루수", "좌익수", "중견수", "우익수"]
+BAT_THROWS = ["우투우타", "우투좌타", "좌투좌타"]
+
+# 대시보드가 메모를 리그로 묶어 표시하므로 리그 이름을 돌려가며 기록
+LEAGUES = ["일요루키A", "일요루키B", "일요우수"]
+
+# 리그 첫 경기 날짜 (실행 날짜와 무관하게 같은 데이터가 나오도록 고정)
+START_DATE = date(2020, 3, 1)
+
+# 타석 수로 크기를 정할 때 경기 수 상한 계산용 (9이닝 최소 27타석)
+MIN_PLATE_APPEARANCES_PER_GAME = 27
+
+
+def league_team(players: int, seed: int = 0) -> Team:
+    """선수 players명의 합성 팀 (타격 보정은 시드 고정 난수)"""
+    rng = np.random.default_rng(seed)
+    skills = np.clip(rng.normal(0.02, 0.03, players), -0.10, 0.12)
+    roster = [
+        (f"선수{i + 1:03d}", i + 1, POSITIONS[i % len(POSITIONS)], BAT_THROWS[i % len(BAT_THROWS)])
+        for i in range(players)
+    ]
+    return Team(
+        key=f"league{players}",
+        name=f"벤치마크 리그 ({players}명)",
+        players=roster,
+        skills={name: float(skill) for (name, _, _, _), skill in zip(roster, skills)},
+    )
+
+
+def _truncate(batch: SimulatedBatch, plate_appearances: int) -> SimulatedBatch:
+    """타석 수가 plate_appearances에 처음 닿는 경기까지만 남김"""
+    per_game = batch.at_bats.groupby('game_number', sort=True).size().cumsum()
+    last = per_game.index[min(np.searchsorted(per_game.to_numpy(), plate_appearances), len(per_game) - 1)]
+    keep = {name: frame[frame['game_number'] <= last].reset_index(drop=True)
+            for name, frame in (('games', batch.games), ('at_bats', batch.at_bats),
+                                ('pitching', batch.pitching), ('attendance', batch.attendance))}
+    return SimulatedBatch(batch.first_game, **keep)
+
+
+def build_league(db, players: int = 50, games: int = 2000, plate_appearances: int = None,
+                 seed: int = 0, batch_games: int = 1000) -> dict:
+    """db(MockSheetsDB/SqliteDB)를 비우고 합성 리그 기록
+
+    plate_appearances를 주면 경기 수 대신 타석 수가 그 값에 처음 닿는 경기까지 생성한다.
+
+    Returns:
+        리그 크기 요약 (선수/경기/타석/투구/참석 행 수, 생성 시간)
+    """
+    team = league_team(players, seed)
+    if plate_appearances:
+        games = -(-plate_appearances // MIN_PLATE_APPEARANCES_PER_GAME)
+
+    started = time.perf_counter()
+    sink = DatabaseSink(db, team, reset=True)
+    counts = {'games': 0, 'plate_appearances': 0, 'pitching': 0, 'attendance': 0}
+    for batch in generate_batches(team, games, seed, batch_games, START_DATE):
+        if plate_appearances:
+            batch = _truncate(batch, plate_appearances - counts['plate_appearances'])
+        batch.games['memo'] = np.asarray(LEAGUES, dtype=object)[(batch.games['game_number'] - 1) % len(LEAGUES)]
+        sink.write(batch)
+        counts['games'] += len(batch.games)
+        counts['plate_appearances'] += len(batch.at_bats)
+        counts['pitching'] += len(batch.pitching)
+        counts['attendance'] += len(batch.attendance)
+        if plate_appearances and counts['plate_appearances'] >= plate_appearances:
+            break
+    sink.close()
+    return {'players': players, **counts, 'seed': seed, 'build_seconds': time.perf_counter() - started}
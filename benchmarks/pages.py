@@ -0,0 +1,47 @@
+"""
+페이지 단위 벤치마크
+Streamlit AppTest로 app.py를 SQLite 저장소(STATZ_DB_BACKEND=sqlite)에 붙여 메뉴별 한 번 그리기 시간 측정
+
+cold: load_* 캐시(st.cache_data)를 비운 직후 첫 렌더, warm: 캐시가 찬 상태의 재렌더
+(MockSheetsDB는 앱 프로세스 안에서 새로 만들어져 비어 있으므로 페이지 측정은 SQLite만)
+"""
+
+import os
+
+from benchmarks.cases import measure
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+# 읽기 전용 페이지 (메뉴 표시 이름)
+PAGES = ["대시보드", "📋 참석 관리", "🧠 AI 코치", "성장 리포트", "팀 인사이트", "선수 통계"]
+
+TIMEOUT = 600
+
+
+def run_pages(sqlite_path: str, repeat: int = 3, pages=None) -> list:
+    """sqlite_path의 리그로 페이지별 cold/warm 렌더 시간 측정 -> 결과 레코드 목록"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    os.environ['STATZ_DB_BACKEND'] = 'sqlite'
+    os.environ['STATZ_SQLITE_PATH'] = sqlite_path
+    st.cache_resource.clear()  # get_db()가 위 경로로 다시 연결되도록
+    st.cache_data.clear()
+
+    app = AppTest.from_file(APP_PATH, default_timeout=TIMEOUT)
+    app.run()
+    results = []
+    for page in pages or PAGES:
+        app.sidebar.radio[0].set_value(page)
+
+        def render():
+            app.run()
+            if app.exception:
+                raise RuntimeError(f"{page}: {app.exception[0].value}")
+
+        # cold: 매 실행 전에 st.cache_data를 비움 (비우는 시간은 측정 제외)
+        for mode, timing in (('cold', measure(render, repeat=repeat, warmup=0, setup=st.cache_data.clear)),
+                             ('warm', measure(render, repeat=repeat))):
+            results.append({'kind': 'page', 'backend': 'sqlite', 'name': f"{page} ({mode})",
+                            'description': f"{page} 페이지 렌더 ({mode})", **timing})
+    return results
@@ -0,0 +1,129 @@
+"""
+경기별 박스스코어 모듈
+(경기, 선수) 쌍마다 타격 누적 기록 한 행을 유지하는 집계 테이블
+타석이 추가되면 새 타석만 인코딩해 해당 행에 더한다.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from events import EVENT_STAT_COLUMNS, OUTCOME_COUNT, counting_columns, encode_at_bats
+from sabermetrics import BATTING_COUNT_COLUMNS
+
+BOX_SCORE_KEY_COLUMNS = ['경기ID', '선수ID', '선수명']
+BOX_SCORE_COLUMNS = BOX_SCORE_KEY_COLUMNS + BATTING_COUNT_COLUMNS
+
+# pandas 3부터 기본인 Copy-on-Write: 얕은 복사도 수정 시점에만 데이터를 복사
+COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+def private_copy(frame: pd.DataFrame) -> pd.DataFrame:
+    """캐시해 둔 DataFrame을 호출자에게 넘길 때의 복사본
+
+    Copy-on-Write면 데이터를 공유하는 얕은 복사(수정하는 쪽만 복사)이고, 아니면 깊은 복사.
+    어느 쪽이든 호출자가 고쳐도 캐시와 다른 호출자에게 보이지 않는다.
+    """
+    return frame.copy(deep=not COPY_ON_WRITE)
+
+
+class BoxScoreTable:
+    """(경기ID, 선수ID)별 타격 누적 기록 테이블
+
+    행은 경기가 타석 기록에 처음 등장한 순서(같은 경기 안에서는 선수 등장 순서)로 쌓이며,
+    결과 코드 개수(행 x OUTCOME_COUNT)와 타점/득점/도루/도실 합계를 정수 배열로 보관한다.
+    append()는 새 타석만 더하고, sync()는 추가 전용 타석 기록에서 아직 반영하지 않은 꼬리만 찾아 append한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """모든 행 삭제 (타석 기록이 수정/삭제된 경우 다시 쌓기 위해)"""
+        self._rows = {}  # (경기ID, 선수ID) -> 행 번호
+        self._game_ids = []
+        self._player_ids = []
+        self._player_names = []
+        self._counts = np.zeros((0, OUTCOME_COUNT), dtype=np.int64)
+        self._stats = np.zeros((0, len(EVENT_STAT_COLUMNS)), dtype=np.int64)
+        self.consumed = 0  # 반영한 타석 수
+        self.last_record_id = None  # 마지막으로 반영한 타석의 기록ID
+        self.version = 0
+        self._frame = None
+        self._frame_version = -1
+
+    def __len__(self) -> int:
+        return len(self._game_ids)
+
+    def _grow(self, size: int):
+        if size > len(self._counts):
+            capacity = max(size, len(self._counts) * 2, 16)
+            counts = np.zeros((capacity, OUTCOME_COUNT), dtype=np.int64)
+            stats = np.zeros((capacity, len(EVENT_STAT_COLUMNS)), dtype=np.int64)
+            counts[:len(self._counts)] = self._counts
+            stats[:len(self._stats)] = self._stats
+            self._counts, self._stats = counts, stats
+
+    def append(self, at_bats: pd.DataFrame):
+        """새 타석 기록을 (경기, 선수) 행에 더함"""
+        if len(at_bats) == 0:
+            return
+        log = encode_at_bats(at_bats)
+        # 이번 묶음 안의 (경기, 선수) 쌍 번호 -> 전체 테이블 행 번호
+        pair_keys = log.game.astype(np.int64) * log.n_players + log.player
+        pair, first_rows = np.unique(pair_keys, return_index=True)
+        pair_index = np.searchsorted(pair, pair_keys).astype(np.int32)
+        names = log.player_names[log.player[first_rows]]
+
+        with self._lock:
+            rows = np.empty(len(pair), dtype=np.int64)
+            for i, first in enumerate(first_rows):
+                key = (log.game_ids[log.game[first]], log.player_ids[log.player[first]])
+                row = self._rows.get(key)
+                if row is None:
+                    row = len(self._game_ids)
+                    self._rows[key] = row
+                    self._game_ids.append(key[0])
+                    self._player_ids.append(key[1])
+                    self._player_names.append(names[i])
+                rows[i] = row
+            self._grow(len(self._game_ids))
+            self._counts[rows] += log.outcome_counts(pair_index, len(pair))
+            sums = log.stat_sums(pair_index, len(pair))
+            for j, column in enumerate(EVENT_STAT_COLUMNS):
+                self._stats[rows, j] += sums[column]
+            self.consumed += len(at_bats)
+            if '기록ID' in at_bats.columns:
+                self.last_record_id = at_bats['기록ID'].iloc[-1]
+            self.version += 1
+
+    def sync(self, at_bats: pd.DataFrame) -> 'BoxScoreTable':
+        """전체 타석 기록 중 아직 반영하지 않은 뒤쪽 행만 append
+
+        반영했던 마지막 타석이 같은 자리에 없으면(삭제/수정) 처음부터 다시 쌓는다.
+        """
+        if self.consumed:
+            last = at_bats['기록ID'].iloc[self.consumed - 1] if len(at_bats) >= self.consumed else None
+            if last is None or last != self.last_record_id:
+                self.reset()
+        self.append(at_bats.iloc[self.consumed:])
+        return self
+
+    def frame(self) -> pd.DataFrame:
+        """박스스코어 DataFrame (BOX_SCORE_COLUMNS, 버전당 한 번 생성해 복사본 반환)"""
+        with self._lock:
+            if self._frame_version != self.version:
+                size = len(self._game_ids)
+                stats = {column: self._stats[:size, j] for j, column in enumerate(EVENT_STAT_COLUMNS)}
+                frame = pd.DataFrame({
+                    '경기ID': pd.Series(self._game_ids, dtype=object),
+                    '선수ID': pd.Series(self._player_ids, dtype=object),
+                    '선수명': pd.Series(self._player_names, dtype=object),
+                    **counting_columns(self._counts[:size], stats),
+                })
+                self._frame = frame[BOX_SCORE_COLUMNS]
+                self._frame_version = self.version
+            return private_copy(self._frame)
+
@@ -0,0 +1,158 @@
+"""
+타석 결과 분포 모듈
+선수별 타석 결과 확률(skill 파라미터 또는 타격 기록에서 추정)과
+O(1) 표본 추출용 별칭 테이블(alias table)을 함께 보관
+"""
+
+import numpy as np
+import pandas as pd
+
+from events import (
+    DOUBLE, HIT_BY_PITCH, HOME_RUN, OUT, OUTCOME_COUNT, SAC_BUNT, SAC_FLY, SINGLE, STRIKEOUT, TRIPLE, WALK
+)
+
+# 안타 종류 비율 (1루타, 2루타, 3루타, 홈런)
+HIT_TYPE_SPLIT = (0.65, 0.20, 0.10, 0.05)
+
+# 타격 누적 기록 컬럼 -> 결과 코드 (아웃은 타석에서 나머지를 뺀 값)
+_COUNT_CODES = {'1루타': SINGLE, '2루타': DOUBLE, '3루타': TRIPLE, '홈런': HOME_RUN, '볼넷': WALK,
+                '사구': HIT_BY_PITCH, '삼진': STRIKEOUT, '희생플라이': SAC_FLY, '희생번트': SAC_BUNT}
+
+# 팀 평균 분포 쪽으로 당기는 가상 타석 수 (타석이 적은 선수의 분포 안정화)
+PRIOR_PLATE_APPEARANCES = 20
+
+
+def batter_probabilities(skill: float = 0.0, walk: float = 0.10, strikeout: float = 0.18,
+                         hit_by_pitch: float = 0.03) -> np.ndarray:
+    """타자 한 명의 타석 결과 확률 (OUTCOME_COUNT 길이, 스크립트의 get_at_bat_result와 동일)
+
+    안타 확률은 0.25 + skill, 나머지 확률은 아웃
+    """
+    probs = np.zeros(OUTCOME_COUNT)
+    hit_chance = 0.25 + skill
+    for code, share in zip((SINGLE, DOUBLE, TRIPLE, HOME_RUN), HIT_TYPE_SPLIT):
+        probs[code] = hit_chance * share
+    probs[WALK] = walk
+    probs[STRIKEOUT] = strikeout
+    probs[HIT_BY_PITCH] = hit_by_pitch
+    probs[OUT] = 1.0 - probs.sum()
+    return probs
+
+
+def lineup_probabilities(skills, **kwargs) -> np.ndarray:
+    """타순 9명의 skill 목록 -> (9, OUTCOME_COUNT) 확률 행렬"""
+    return np.vstack([batter_probabilities(skill, **kwargs) for skill in skills])
+
+
+def outcome_counts(batting: pd.DataFrame) -> np.ndarray:
+    """선수별 타격 누적 기록(batting_table 형식) -> (선수 수, OUTCOME_COUNT) 결과 코드 개수"""
+    counts = np.zeros((len(batting), OUTCOME_COUNT), dtype=np.int64)
+    for column, code in _COUNT_CODES.items():
+        if column in batting.columns:
+            counts[:, code] = batting[column].to_numpy(dtype=np.int64)
+    counts[:, OUT] = np.maximum(batting['타석'].to_numpy(dtype=np.int64) - counts.sum(axis=1), 0)
+    return counts
+
+
+def estimate_probabilities(counts: np.ndarray, prior_weight: float = PRIOR_PLATE_APPEARANCES) -> np.ndarray:
+    """선수별 결과 코드 개수 -> 타석 결과 확률 (선수 수 x OUTCOME_COUNT)
+
+    선수 기록에 팀 전체 분포를 prior_weight 타석만큼 섞는다 (기록이 없는 선수는 팀 평균).
+    """
+    counts = np.asarray(counts, dtype=float)
+    team = counts.sum(axis=0)
+    team = team / team.sum() if team.sum() > 0 else np.eye(OUTCOME_COUNT)[OUT]
+    smoothed = counts + prior_weight * team
+    totals = smoothed.sum(axis=1, keepdims=True)
+    return np.divide(smoothed, totals, out=np.tile(team, (len(counts), 1)), where=totals > 0)
+
+
+def _alias_table(probs: np.ndarray):
+    """한 분포의 별칭 테이블 (Vose) -> (칸별 채택 확률, 칸별 별칭 코드)"""
+    size = len(probs)
+    scaled = probs * size
+    accept = np.ones(size)
+    alias = np.arange(size, dtype=np.uint8)
+    small = [i for i in range(size) if scaled[i] < 1.0]
+    large = [i for i in range(size) if scaled[i] >= 1.0]
+    while small and large:
+        low, high = small.pop(), large.pop()
+        accept[low], alias[low] = scaled[low], high
+        scaled[high] -= 1.0 - scaled[low]
+        (small if scaled[high] < 1.0 else large).append(high)
+    # 남은 칸은 부동소수점 오차만 남았으므로 자기 자신 채택
+    return accept, alias
+
+
+class OutcomeDistribution:
+    """선수(행)별 타석 결과 분포
+
+    probabilities: (선수 수, OUTCOME_COUNT) 확률 행렬 (행 합 1)
+    accept / alias: 별칭 테이블. 균등 난수 u 하나로 칸 k = floor(u * OUTCOME_COUNT)를 고르고
+    나머지 소수부가 accept[선수, k]보다 작으면 k, 아니면 alias[선수, k]를 결과로 쓴다.
+    선수 배열과 난수 배열만으로 표본을 뽑으므로 선수가 섞인 수백만 타석도 한 번의 배열 연산이다.
+    """
+
+    def __init__(self, probabilities, names=None):
+        probs = np.atleast_2d(np.asarray(probabilities, dtype=float))
+        if probs.shape[1] != OUTCOME_COUNT:
+            raise ValueError(f"결과 확률은 {OUTCOME_COUNT}개 열이어야 합니다")
+        if (probs < 0).any() or (probs.sum(axis=1) <= 0).any():
+            raise ValueError("결과 확률은 0 이상이고 행 합이 양수여야 합니다")
+        self.probabilities = probs / probs.sum(axis=1, keepdims=True)
+        self.names = list(names) if names is not None else list(range(len(probs)))
+        tables = [_alias_table(row) for row in self.probabilities]
+        self.accept = np.vstack([accept for accept, _ in tables])
+        self.alias = np.vstack([alias for _, alias in tables])
+
+    @classmethod
+    def from_skills(cls, skills, names=None, **kwargs) -> 'OutcomeDistribution':
+        """skill 목록 (스크립트의 get_player_skill 값) -> 분포"""
+        return cls(lineup_probabilities(skills, **kwargs), names)
+
+    @classmethod
+    def from_batting(cls, batting: pd.DataFrame, prior_weight: float = PRIOR_PLATE_APPEARANCES,
+                     name_column: str = '선수명') -> 'OutcomeDistribution':
+        """선수별 타격 누적 기록(batting_table 형식) -> 팀 평균으로 보정한 분포"""
+        names = batting[name_column] if name_column in batting.columns else None
+        return cls(estimate_probabilities(outcome_counts(batting), prior_weight), names)
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def subset(self, players) -> 'OutcomeDistribution':
+        """선수 인덱스 목록 순서의 분포 (타순 구성용, 별칭 테이블은 다시 만들지 않음)"""
+        players = list(players)
+        subset = object.__new__(OutcomeDistribution)
+        subset.probabilities = self.probabilities[players]
+        subset.accept = self.accept[players]
+        subset.alias = self.alias[players]
+        subset.names = [self.names[i] for i in players]
+        return subset
+
+    def sample(self, players, rng, uniforms: np.ndarray = None) -> np.ndarray:
+        """선수 인덱스 배열(또는 선수 하나)마다 결과 코드 하나씩 (uint8 배열)
+
+        uniforms를 주면 그 균등 난수를 쓴다 (같은 난수로 여러 분포를 비교할 때).
+        """
+        players = np.asarray(players)
+        if uniforms is None:
+            uniforms = rng.random(players.shape)
+        scaled = uniforms * OUTCOME_COUNT
+        column = np.minimum(scaled.astype(np.intp), OUTCOME_COUNT - 1)
+        keep = (scaled - column) < self.accept[players, column]
+        return np.where(keep, column, self.alias[players, column]).astype(np.uint8)
+
+    def sample_player(self, player: int, size: int, rng) -> np.ndarray:
+        """선수 한 명의 결과 코드 size개"""
+        return self.sample(np.full(size, player, dtype=np.intp), rng)
+
+
+def as_distribution(probabilities, size: int = None) -> OutcomeDistribution:
+    """OutcomeDistribution 또는 확률 행렬/벡터 -> OutcomeDistribution (벡터는 size명 공통 분포)"""
+    if isinstance(probabilities, OutcomeDistribution):
+        return probabilities
+    probs = np.asarray(probabilities, dtype=float)
+    if probs.ndim == 1 and size is not None:
+        probs = np.broadcast_to(probs, (size, OUTCOME_COUNT))
+    return OutcomeDistribution(probs)
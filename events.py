@@ -0,0 +1,175 @@
+"""
+타석 이벤트 인코딩 모듈
+타석 기록을 타석당 uint8 결과 코드 + int32 선수/경기 인덱스로 변환하고
+np.bincount로 전체 기록을 한 번에 집계
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# 타석 결과 코드 (uint8)
+OUT = 0           # 아웃 (삼진/희생타 제외)
+SINGLE = 1        # 1루타
+DOUBLE = 2        # 2루타
+TRIPLE = 3        # 3루타
+HOME_RUN = 4      # 홈런
+WALK = 5          # 볼넷
+HIT_BY_PITCH = 6  # 사구
+STRIKEOUT = 7     # 삼진
+SAC_FLY = 8       # 희생플라이
+SAC_BUNT = 9      # 희생번트
+OUTCOME_COUNT = 10
+
+OUTCOME_LABELS = ['아웃', '1루타', '2루타', '3루타', '홈런', '볼넷', '사구', '삼진', '희생플라이', '희생번트']
+
+HIT_CODES = (SINGLE, DOUBLE, TRIPLE, HOME_RUN)
+
+# 결과 코드와 별개로 타석마다 합산하는 정수 기록
+EVENT_STAT_COLUMNS = ['타점', '득점', '도루', '도실']
+
+# 안타종류 -> 결과 코드 (그 외 안타는 1루타)
+_HIT_TYPE_CODES = {'2루타': DOUBLE, '3루타': TRIPLE, '홈런': HOME_RUN}
+
+# 플래그 컬럼 -> 결과 코드 (뒤에 있을수록 우선)
+_FLAG_CODES = [('희생번트', SAC_BUNT), ('희생플라이', SAC_FLY), ('삼진', STRIKEOUT),
+               ('사구', HIT_BY_PITCH), ('볼넷', WALK)]
+
+
+def _flag(at_bats: pd.DataFrame, column: str) -> np.ndarray:
+    """정수 플래그 컬럼이 양수인지 (누락 컬럼은 False)"""
+    if column not in at_bats.columns:
+        return np.zeros(len(at_bats), dtype=bool)
+    values = at_bats[column]
+    if not pd.api.types.is_integer_dtype(values):
+        values = pd.to_numeric(values, errors='coerce').fillna(0)
+    return values.to_numpy() > 0
+
+
+def _stat(at_bats: pd.DataFrame, column: str) -> np.ndarray:
+    """정수 기록 컬럼을 int32 배열로 (누락 컬럼은 0)"""
+    if column not in at_bats.columns:
+        return np.zeros(len(at_bats), dtype=np.int32)
+    values = at_bats[column]
+    if not pd.api.types.is_integer_dtype(values):
+        values = pd.to_numeric(values, errors='coerce').fillna(0)
+    return values.to_numpy().astype(np.int32)
+
+
+def _index(at_bats: pd.DataFrame, column: str):
+    """컬럼 값을 등장 순서대로 0부터 번호 매김 -> (int32 인덱스, 고유값 배열)"""
+    if column not in at_bats.columns:
+        return np.zeros(len(at_bats), dtype=np.int32), np.array([""], dtype=object)
+    codes, uniques = pd.factorize(at_bats[column], sort=False, use_na_sentinel=False)
+    return codes.astype(np.int32), np.asarray(uniques, dtype=object)
+
+
+def encode_outcomes(at_bats: pd.DataFrame) -> np.ndarray:
+    """타석 기록 -> 타석당 uint8 결과 코드
+
+    안타는 결과='안타'와 안타종류로, 나머지는 볼넷/사구/삼진/희생플라이/희생번트 플래그로 판정
+    (한 타석에 여러 플래그가 있으면 볼넷 > 사구 > 삼진 > 희생플라이 > 희생번트 순)
+    """
+    codes = np.full(len(at_bats), OUT, dtype=np.uint8)
+    for column, code in _FLAG_CODES:
+        codes[_flag(at_bats, column)] = code
+
+    if '결과' in at_bats.columns:
+        is_hit = (at_bats['결과'] == '안타').to_numpy(dtype=bool)
+        hit_codes = np.full(len(at_bats), SINGLE, dtype=np.uint8)
+        if '안타종류' in at_bats.columns:
+            hit_type = at_bats['안타종류']
+            for label, code in _HIT_TYPE_CODES.items():
+                hit_codes[(hit_type == label).to_numpy(dtype=bool)] = code
+        codes[is_hit] = hit_codes[is_hit]
+    return codes
+
+
+@dataclass
+class EventLog:
+    """인코딩된 타석 로그 (행 순서는 원본 타석 기록과 같음)"""
+    outcome: np.ndarray        # uint8 결과 코드
+    player: np.ndarray         # int32 선수 인덱스 (player_ids 위치)
+    game: np.ndarray           # int32 경기 인덱스 (game_ids 위치)
+    player_ids: np.ndarray     # 선수ID (등장 순서)
+    player_names: np.ndarray   # 선수별 첫 타석의 선수명
+    game_ids: np.ndarray       # 경기ID (등장 순서)
+    stats: dict = field(default_factory=dict)  # EVENT_STAT_COLUMNS -> int32 배열
+
+    def __len__(self) -> int:
+        return len(self.outcome)
+
+    @property
+    def n_players(self) -> int:
+        return len(self.player_ids)
+
+    @property
+    def n_games(self) -> int:
+        return len(self.game_ids)
+
+    def outcome_counts(self, index=None, size: int = None) -> np.ndarray:
+        """그룹별 결과 코드 개수 행렬 (size x OUTCOME_COUNT), 기본 그룹은 선수"""
+        if index is None:
+            index, size = self.player, self.n_players
+        keys = index.astype(np.int64) * OUTCOME_COUNT + self.outcome
+        return np.bincount(keys, minlength=size * OUTCOME_COUNT).reshape(size, OUTCOME_COUNT)
+
+    def stat_sums(self, index=None, size: int = None) -> dict:
+        """그룹별 타점/득점/도루/도실 합계, 기본 그룹은 선수"""
+        if index is None:
+            index, size = self.player, self.n_players
+        return {column: np.bincount(index, weights=values, minlength=size).astype(np.int64)
+                for column, values in self.stats.items()}
+
+    def games_played(self) -> np.ndarray:
+        """선수별 출전 경기 수 (선수-경기 쌍의 고유 개수)"""
+        pairs = np.unique(self.player.astype(np.int64) * max(self.n_games, 1) + self.game)
+        return np.bincount(pairs // max(self.n_games, 1), minlength=self.n_players)
+
+
+def encode_at_bats(at_bats: pd.DataFrame) -> EventLog:
+    """타석 기록 DataFrame -> EventLog"""
+    player, player_ids = _index(at_bats, '선수ID')
+    game, game_ids = _index(at_bats, '경기ID')
+    if '선수명' in at_bats.columns and len(at_bats) > 0:
+        _, first_rows = np.unique(player, return_index=True)
+        player_names = np.asarray(at_bats['선수명'], dtype=object)[first_rows]
+    else:
+        player_names = np.full(len(player_ids), "", dtype=object)
+    return EventLog(
+        outcome=encode_outcomes(at_bats),
+        player=player,
+        game=game,
+        player_ids=player_ids,
+        player_names=player_names,
+        game_ids=game_ids,
+        stats={column: _stat(at_bats, column) for column in EVENT_STAT_COLUMNS},
+    )
+
+
+def counting_columns(outcome_counts: np.ndarray, stat_sums: dict) -> dict:
+    """결과 코드 개수 행렬(그룹 x OUTCOME_COUNT)과 기록 합계 -> 타격 누적 기록 컬럼
+
+    BattingStats/batting_table과 같은 이름(타석, 타수, 안타, 1루타, ..., 도실)을 쓴다.
+    """
+    counts = np.asarray(outcome_counts, dtype=np.int64)
+    columns = {
+        '타석': counts.sum(axis=1),
+        '안타': counts[:, list(HIT_CODES)].sum(axis=1),
+        '1루타': counts[:, SINGLE],
+        '2루타': counts[:, DOUBLE],
+        '3루타': counts[:, TRIPLE],
+        '홈런': counts[:, HOME_RUN],
+        '볼넷': counts[:, WALK],
+        '삼진': counts[:, STRIKEOUT],
+        '사구': counts[:, HIT_BY_PITCH],
+        '희생플라이': counts[:, SAC_FLY],
+        '희생번트': counts[:, SAC_BUNT],
+    }
+    columns['타수'] = (columns['타석'] - columns['볼넷'] - columns['사구']
+                     - columns['희생플라이'] - columns['희생번트'])
+    columns['루타'] = columns['1루타'] + columns['2루타'] * 2 + columns['3루타'] * 3 + columns['홈런'] * 4
+    for column in EVENT_STAT_COLUMNS:
+        columns[column] = stat_sums[column]
+    return columns
@@ -0,0 +1,284 @@
+"""
+핫패스 계측 모듈
+페이지별 렌더 시간, Sheets API 호출 수/지연/읽은 행 수, load_* 캐시 적중/실패를 프로세스 단위로 집계하고
+이벤트마다 구조화 로그(statz.metrics 로거, JSON 한 줄)를 남김
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+logger = logging.getLogger('statz.metrics')
+
+# 관리자 화면에 보여줄 최근 이벤트 수
+RECENT_EVENTS = 500
+
+# 관리자 화면 표 컬럼 (페이지 표에는 구간별 "(ms)" 컬럼이 더 붙음)
+PAGE_COLUMNS = ['페이지', '렌더', '평균(ms)', '최대(ms)', 'API 호출', 'API(ms)', '할당량 대기(ms)', '읽은 행',
+                '캐시 적중', '캐시 실패', '로드(ms)', '오류']
+API_COLUMNS = ['종류', '메서드', '호출', '평균(ms)', '최대(ms)', '할당량 대기(ms)', '읽은 행', '오류']
+CACHE_COLUMNS = ['로더', '적중', '실패', '적중률', '실패 시 평균(ms)']
+
+# 페이지 밖(백그라운드 연결/재검증 스레드 등)에서 일어난 호출의 페이지 이름
+NO_PAGE = "(페이지 밖)"
+
+
+@dataclass
+class RenderStats:
+    """페이지 한 번 그리는 동안의 누적값 (페이지 전체 집계에도 같은 필드를 더함)"""
+    api_calls: int = 0
+    api_seconds: float = 0.0
+    api_wait_seconds: float = 0.0   # 할당량 대기 시간
+    rows: int = 0                   # API 응답으로 받은 행 수
+    cache_hits: int = 0
+    cache_misses: int = 0
+    load_seconds: float = 0.0       # 캐시 실패로 load_* 본문을 실행한 시간 (가장 바깥 호출만)
+    spans: dict = field(default_factory=dict)  # 구간 이름 -> 초 (예: plotly)
+
+    def add(self, other: 'RenderStats'):
+        self.api_calls += other.api_calls
+        self.api_seconds += other.api_seconds
+        self.api_wait_seconds += other.api_wait_seconds
+        self.rows += other.rows
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        self.load_seconds += other.load_seconds
+        for name, seconds in other.spans.items():
+            self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+
+@dataclass
+class PageStats(RenderStats):
+    renders: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+_page = contextvars.ContextVar('statz_page', default=None)      # 현재 페이지 이름
+_render = contextvars.ContextVar('statz_render', default=None)  # 현재 렌더의 RenderStats
+_cache_stack = threading.local()                                # 진행 중인 load_* 호출별 캐시 실패 여부
+
+
+def row_count(result) -> int:
+    """Sheets API 응답 -> 행 수 (get_all_values 목록, values_batch_get 응답)"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return sum(len(value_range.get('values', [])) for value_range in result.get('valueRanges', []))
+    return 0
+
+
+class Metrics:
+    """프로세스 공용 계측 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._pages = {}   # 페이지 -> PageStats
+            self._apis = {}    # (종류, 메서드) -> [호출, 초, 최대 초, 대기 초, 행, 오류]
+            self._caches = {}  # 로더 -> [적중, 실패, 실패 시 초]
+            self._events = deque(maxlen=RECENT_EVENTS)
+
+    def _emit(self, event: dict):
+        event = {'ts': datetime.now().isoformat(timespec='milliseconds'), **event}
+        self._events.append(event)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(event, ensure_ascii=False, default=str))
+
+    def record_page(self, page: str, seconds: float, render: RenderStats, error: Optional[str] = None):
+        with self._lock:
+            stats = self._pages.setdefault(page, PageStats())
+            stats.add(render)
+            stats.renders += 1
+            stats.errors += error is not None
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            self._emit({'event': 'page', 'page': page, 'seconds': round(seconds, 4),
+                        **{key: round(value, 4) if isinstance(value, float) else value
+                           for key, value in render.__dict__.items()},
+                        'error': error})
+
+    def record_api_call(self, kind: str, method: str, seconds: float, wait: float = 0.0,
+                        rows: int = 0, error: Optional[str] = None):
+        render = _render.get()
+        if render is not None:
+            render.api_calls += 1
+            render.api_seconds += seconds
+            render.api_wait_seconds += wait
+            render.rows += rows
+        with self._lock:
+            stats = self._apis.setdefault((kind, method), [0, 0.0, 0.0, 0.0, 0, 0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3] += wait
+            stats[4] += rows
+            stats[5] += error is not None
+            # 페이지 밖 호출은 렌더 집계가 없으므로 여기서 페이지 표에 더함
+            if render is None:
+                outside = self._pages.setdefault(NO_PAGE, PageStats())
+                outside.add(RenderStats(api_calls=1, api_seconds=seconds, api_wait_seconds=wait, rows=rows))
+            self._emit({'event': 'api', 'page': _page.get() or NO_PAGE, 'kind': kind, 'method': method,
+                        'seconds': round(seconds, 4), 'wait': round(wait, 4), 'rows': rows, 'error': error})
+
+    def record_cache(self, name: str, hit: bool, seconds: float, outermost: bool):
+        render = _render.get()
+        if render is not None:
+            if hit:
+                render.cache_hits += 1
+            else:
+                render.cache_misses += 1
+                if outermost:
+                    render.load_seconds += seconds
+        with self._lock:
+            stats = self._caches.setdefault(name, [0, 0, 0.0])
+            stats[0 if hit else 1] += 1
+            if not hit:
+                stats[2] += seconds
+                self._emit({'event': 'cache_miss', 'page': _page.get() or NO_PAGE, 'loader': name,
+                            'seconds': round(seconds, 4)})
+
+    def record_event(self, event: str, **fields):
+        """그 밖의 이벤트(쓰기 버퍼 전송 실패 등)를 최근 이벤트와 구조화 로그에 기록"""
+        with self._lock:
+            self._emit({'event': event, 'page': _page.get() or NO_PAGE, **fields})
+
+    # === 조회 (관리자 화면용) ===
+
+    def page_table(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [{
+                '페이지': page,
+                '렌더': stats.renders,
+                '평균(ms)': stats.seconds / stats.renders * 1000 if stats.renders else 0.0,
+                '최대(ms)': stats.max_seconds * 1000,
+                'API 호출': stats.api_calls,
+                'API(ms)': stats.api_seconds * 1000,
+                '할당량 대기(ms)': stats.api_wait_seconds * 1000,
+                '읽은 행': stats.rows,
+                '캐시 적중': stats.cache_hits,
+                '캐시 실패': stats.cache_misses,
+                '로드(ms)': stats.load_seconds * 1000,
+                **{f"{name}(ms)": seconds * 1000 for name, seconds in stats.spans.items()},
+                '오류': stats.errors,
+            } for page, stats in self._pages.items()]
+        return pd.DataFrame(rows).fillna(0) if rows else pd.DataFrame(columns=PAGE_COLUMNS)
+
+    def api_table(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [{
+                '종류': kind, '메서드': method, '호출': calls,
+                '평균(ms)': seconds / calls * 1000, '최대(ms)': max_seconds * 1000,
+                '할당량 대기(ms)': wait * 1000, '읽은 행': fetched, '오류': errors,
+            } for (kind, method), (calls, seconds, max_seconds, wait, fetched, errors) in self._apis.items()]
+        return pd.DataFrame(rows) if rows else pd.DataFrame(columns=API_COLUMNS)
+
+    def cache_table(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [{
+                '로더': name, '적중': hits, '실패': misses,
+                '적중률': hits / (hits + misses) if hits + misses else 0.0,
+                '실패 시 평균(ms)': seconds / misses * 1000 if misses else 0.0,
+            } for name, (hits, misses, seconds) in self._caches.items()]
+        return pd.DataFrame(rows) if rows else pd.DataFrame(columns=CACHE_COLUMNS)
+
+    def recent_events(self) -> pd.DataFrame:
+        with self._lock:
+            events = list(self._events)
+        # 구간 시간(dict)은 표에서 한 칸으로 보이도록 JSON 문자열로
+        return pd.DataFrame([{key: json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else value
+                              for key, value in event.items()} for event in reversed(events)])
+
+
+# 프로세스 공용 집계 (Streamlit 세션들이 공유)
+METRICS = Metrics()
+
+
+@contextmanager
+def page_timer(page: str):
+    """페이지 함수 한 번 실행의 전체 시간과 그 동안의 API/캐시 기록을 페이지 이름으로 집계"""
+    page_token = _page.set(page)
+    render = RenderStats()
+    render_token = _render.set(render)
+    started = time.perf_counter()
+    error = None
+    try:
+        yield render
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _render.reset(render_token)
+        _page.reset(page_token)
+        METRICS.record_page(page, time.perf_counter() - started, render, error)
+
+
+@contextmanager
+def span(name: str):
+    """현재 렌더 안의 구간 시간 (예: plotly 차트 직렬화)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        render = _render.get()
+        if render is not None:
+            render.spans[name] = render.spans.get(name, 0.0) + time.perf_counter() - started
+
+
+def cached(name: str, cache):
+    """캐시 데코레이터(st.cache_data(...) 등)를 씌우면서 적중/실패를 name으로 집계
+
+    캐시 본문이 실행되면 실패, 실행되지 않고 값이 돌아오면 적중으로 센다.
+    중첩 호출(load_batting_table -> load_table)은 호출별 스택으로 구분한다.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _cache_stack.frames[-1] = True  # 캐시 실패: 본문 실행
+            return fn(*args, **kwargs)
+
+        cached_fn = cache(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            frames = getattr(_cache_stack, 'frames', None)
+            if frames is None:
+                frames = _cache_stack.frames = []
+            frames.append(False)
+            started = time.perf_counter()
+            try:
+                return cached_fn(*args, **kwargs)
+            finally:
+                missed = frames.pop()
+                METRICS.record_cache(name, not missed, time.perf_counter() - started, outermost=not frames)
+
+        call.clear = getattr(cached_fn, 'clear', None)
+        return call
+    return decorate
+
+
+def configure_log(path: Optional[str]):
+    """statz.metrics 로거를 path 파일(JSON Lines)에 기록 (path가 없으면 아무것도 안 함, 중복 설정 무시)"""
+    if not path or any(getattr(handler, '_statz_metrics', False) for handler in logger.handlers):
+        return
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    handler._statz_metrics = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
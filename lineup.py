@@ -0,0 +1,118 @@
+"""
+타순 최적화 모듈
+선수별 타석 결과 분포(OutcomeDistribution)로
+경기당 기대 득점이 가장 높은 9명 타순을 국소 탐색으로 찾음
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from distributions import as_distribution
+from events import DOUBLE, HIT_BY_PITCH, HOME_RUN, SINGLE, TRIPLE, WALK
+from run_expectancy import expected_runs
+from simulation import LINEUP_SIZE, simulate_games
+
+# 시뮬레이션으로 평가할 때의 시드 (모든 타순에 같은 난수 사용)
+EVALUATION_SEED = 0
+
+MAX_EVALUATIONS = 2000
+
+
+class LineupEvaluator:
+    """타순(선수 인덱스 9개) -> 경기당 기대 득점, 평가한 타순은 캐시
+
+    기본은 run_expectancy의 마르코프 체인으로 정확한 기대 득점을 계산한다.
+    games를 주면 games 경기를 같은 시드로 시뮬레이션해(공통 난수) 평균 득점을 쓴다.
+    """
+
+    def __init__(self, distribution, games: int = None, seed: int = EVALUATION_SEED):
+        self.distribution = as_distribution(distribution)
+        self.games = games
+        self.seed = seed
+        self.cache = {}
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.distribution)
+
+    @property
+    def evaluations(self) -> int:
+        return len(self.cache)
+
+    def expected_runs(self, lineup) -> float:
+        key = tuple(int(i) for i in lineup)
+        runs = self.cache.get(key)
+        if runs is None:
+            lineup = self.distribution.subset(key)
+            if self.games:
+                runs = simulate_games(lineup, self.games, self.seed).runs_per_game()
+            else:
+                runs = expected_runs(lineup)
+            self.cache[key] = runs
+        else:
+            self.hits += 1
+        return runs
+
+
+@dataclass
+class LineupResult:
+    """타순 최적화 결과"""
+    lineup: tuple        # 타순별 선수 인덱스
+    runs: float          # 경기당 기대 득점
+    start_runs: float    # 시작 타순의 경기당 기대 득점
+    evaluations: int     # 평가한 타순 수
+    cache_hits: int      # 캐시로 답한 평가 수
+
+
+def default_lineup(probabilities: np.ndarray) -> list:
+    """출루 확률(안타+볼넷+사구) 상위 9명을 출루 확률 순으로 (탐색 시작점)"""
+    probs = np.asarray(probabilities)
+    on_base = probs[:, [SINGLE, DOUBLE, TRIPLE, HOME_RUN, WALK, HIT_BY_PITCH]].sum(axis=1)
+    return [int(i) for i in np.argsort(-on_base, kind='stable')[:LINEUP_SIZE]]
+
+
+def _moves(lineup: list, bench: list):
+    """현재 타순의 이웃: 타순 안 두 자리 교환 + 벤치 선수와 교체"""
+    for i in range(LINEUP_SIZE):
+        for j in range(i + 1, LINEUP_SIZE):
+            candidate = list(lineup)
+            candidate[i], candidate[j] = candidate[j], candidate[i]
+            yield candidate
+    for i in range(LINEUP_SIZE):
+        for player in bench:
+            candidate = list(lineup)
+            candidate[i] = player
+            yield candidate
+
+
+def optimize_lineup(evaluator: LineupEvaluator, start=None, max_evaluations: int = MAX_EVALUATIONS) -> LineupResult:
+    """국소 탐색(first improvement)으로 기대 득점이 높은 타순 찾기
+
+    두 자리 교환과 벤치 선수 교체 중 득점이 오르는 이동을 찾는 즉시 옮기고,
+    더 오르는 이동이 없거나 평가한 타순 수가 max_evaluations에 닿으면 멈춘다.
+    """
+    if len(evaluator) < LINEUP_SIZE:
+        raise ValueError(f"타순을 짜려면 선수가 {LINEUP_SIZE}명 이상 필요합니다")
+    current = list(start) if start is not None else default_lineup(evaluator.distribution.probabilities)
+    best = start_runs = evaluator.expected_runs(current)
+
+    improved = True
+    while improved and evaluator.evaluations < max_evaluations:
+        improved = False
+        bench = [i for i in range(len(evaluator)) if i not in current]
+        for candidate in _moves(current, bench):
+            if evaluator.evaluations >= max_evaluations:
+                break
+            runs = evaluator.expected_runs(candidate)
+            if runs > best:
+                current, best, improved = candidate, runs, True
+                break
+
+    return LineupResult(
+        lineup=tuple(current),
+        runs=best,
+        start_runs=start_runs,
+        evaluations=evaluator.evaluations,
+        cache_hits=evaluator.hits,
+    )
@@ -0,0 +1,150 @@
+"""
+롤링 구간 성적 모듈
+선수별로 경기 날짜순 누적합(prefix sum)을 만들어 두고
+최근 N경기 / 최근 N타석 / 기간 / 지수가중 구간 성적을 누적합 차이로 계산
+"""
+
+import numpy as np
+import pandas as pd
+
+from sabermetrics import BATTING_COUNT_COLUMNS, SabermetricsCalculator
+
+# 날짜 없는 경기(경기 시트에 없는 경기ID)는 가장 뒤로 정렬
+_NO_DATE_DAYS = 10 ** 6 - 1
+_DAY_NS = 86_400 * 10 ** 9
+
+
+def _date_days(values) -> np.ndarray:
+    """날짜 -> 1970-01-01 기준 일수 (NaT는 _NO_DATE_DAYS)"""
+    dates = pd.to_datetime(pd.Series(values), errors='coerce')
+    days = dates.to_numpy(dtype='datetime64[ns]').astype('int64') // _DAY_NS
+    return np.where(dates.isna().to_numpy(), _NO_DATE_DAYS, days)
+
+
+class RollingWindows:
+    """선수별 경기 단위 누적합 테이블
+
+    박스스코어(경기, 선수별 누적 기록)를 선수별 날짜순 경기 행으로 정렬하고
+    누적 기록 컬럼의 전역 누적합을 한 번 계산한다.
+    구간 합계는 누적합 두 행의 차이이므로 선수당 O(1)이며(타석/기간 기준은 이진 탐색),
+    모든 메서드는 선수 전원을 한 번에 벡터 연산으로 계산한다.
+
+    구간 결과는 선수당 한 행(선수ID, 선수명, 경기 + BATTING_COUNT_COLUMNS + 비율 지표) DataFrame.
+    """
+
+    def __init__(self, box_scores: pd.DataFrame, games: pd.DataFrame):
+        # 같은 (선수, 경기) 행이 여럿이면 합산
+        lines = box_scores.groupby(['선수ID', '경기ID'], sort=False, observed=True).agg(
+            선수명=('선수명', 'first'),
+            **{column: (column, 'sum') for column in BATTING_COUNT_COLUMNS}
+        ).reset_index()
+        lines['선수ID'] = lines['선수ID'].astype(object)
+        lines['경기ID'] = lines['경기ID'].astype(object)
+        if len(games) > 0:
+            dates = games.drop_duplicates('경기ID').set_index('경기ID')['날짜']
+            lines['날짜'] = pd.to_datetime(lines['경기ID'].map(dates), errors='coerce')
+        else:
+            lines['날짜'] = pd.Series(pd.NaT, index=lines.index, dtype='datetime64[ns]')
+
+        # 선수(첫 등장 순서) -> 날짜 -> 박스스코어 순서로 정렬
+        player, player_ids = pd.factorize(lines['선수ID'])
+        days = _date_days(lines['날짜'])
+        order = np.lexsort((np.arange(len(lines)), days, player))
+        self.lines = lines.iloc[order].reset_index(drop=True)
+        self._player = player[order]
+        self._days = days[order]
+
+        self.player_ids = np.asarray(player_ids, dtype=object)
+        self._counts = np.bincount(self._player, minlength=len(self.player_ids))
+        self.starts = np.concatenate([[0], np.cumsum(self._counts)])[:-1].astype(np.int64)
+        self.ends = self.starts + self._counts
+        self.player_names = self.lines['선수명'].to_numpy(dtype=object)[self.starts]
+        self.lines['경기순번'] = np.arange(len(lines)) - np.repeat(self.starts, self._counts) + 1
+
+        values = self.lines[BATTING_COUNT_COLUMNS].to_numpy(dtype=np.int64)
+        self._values = values
+        self._cum = np.vstack([np.zeros((1, len(BATTING_COUNT_COLUMNS)), dtype=np.int64), np.cumsum(values, axis=0)])
+        self._pa_cum = self._cum[:, BATTING_COUNT_COLUMNS.index('타석')]
+        # (선수, 날짜) 정렬 키 - 기간 구간의 이진 탐색용
+        self._keys = self._player.astype(np.int64) * (_NO_DATE_DAYS + 1) + self._days
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    # === 구간 합계 ===
+
+    def _window(self, lo: np.ndarray, hi: np.ndarray) -> pd.DataFrame:
+        """선수별 [lo, hi) 경기 행 구간 합계 + 비율 지표"""
+        sums = self._cum[hi] - self._cum[lo]
+        table = pd.DataFrame(sums, columns=BATTING_COUNT_COLUMNS)
+        table.insert(0, '선수ID', self.player_ids)
+        table.insert(1, '선수명', self.player_names)
+        table.insert(2, '경기', hi - lo)
+        return SabermetricsCalculator.add_batting_rates(table)
+
+    def season(self) -> pd.DataFrame:
+        """전체 경기"""
+        return self._window(self.starts, self.ends)
+
+    def last_games(self, n: int) -> pd.DataFrame:
+        """최근 n경기"""
+        return self._window(np.maximum(self.ends - n, self.starts), self.ends)
+
+    def before_last_games(self, n: int) -> pd.DataFrame:
+        """최근 n경기를 뺀 이전 경기 전체"""
+        return self._window(self.starts, np.maximum(self.ends - n, self.starts))
+
+    def last_plate_appearances(self, n: int) -> pd.DataFrame:
+        """최근 n타석 이상을 포함하는 가장 짧은 최근 경기 구간 (경기 단위로 자름)"""
+        target = self._pa_cum[self.ends] - n
+        lo = np.searchsorted(self._pa_cum, target, side='right') - 1
+        return self._window(np.clip(lo, self.starts, self.ends), self.ends)
+
+    def date_range(self, start=None, end=None) -> pd.DataFrame:
+        """start ~ end 날짜(양끝 포함) 경기"""
+        base = np.arange(len(self.player_ids), dtype=np.int64) * (_NO_DATE_DAYS + 1)
+        start_days = _date_days([start])[0] if start is not None else 0
+        end_days = _date_days([end])[0] if end is not None else _NO_DATE_DAYS - 1
+        lo = np.searchsorted(self._keys, base + start_days, side='left')
+        hi = np.searchsorted(self._keys, base + end_days, side='right')
+        return self._window(lo, np.maximum(hi, lo))
+
+    # === 경기별 시계열 ===
+
+    def _series(self, sums: np.ndarray, games: np.ndarray) -> pd.DataFrame:
+        table = pd.DataFrame(sums, columns=BATTING_COUNT_COLUMNS)
+        table.insert(0, '선수ID', self.lines['선수ID'])
+        table.insert(1, '선수명', self.lines['선수명'])
+        table.insert(2, '경기ID', self.lines['경기ID'])
+        table.insert(3, '날짜', self.lines['날짜'])
+        table.insert(4, '경기순번', self.lines['경기순번'])
+        table.insert(5, '경기', games)
+        return SabermetricsCalculator.add_batting_rates(table)
+
+    def per_game(self) -> pd.DataFrame:
+        """경기별 성적 (선수별 날짜순)"""
+        return self._series(self._values, np.ones(len(self.lines), dtype=np.int64))
+
+    def rolling(self, n: int) -> pd.DataFrame:
+        """각 경기 시점의 최근 n경기 성적 (선수별 날짜순, 전 선수 한 번에)"""
+        hi = np.arange(1, len(self.lines) + 1)
+        lo = np.maximum(hi - n, np.repeat(self.starts, self._counts))
+        return self._series(self._cum[hi] - self._cum[lo], hi - lo)
+
+    def ewm(self, halflife: float) -> pd.DataFrame:
+        """각 경기 시점의 지수가중 성적 (halflife 경기 전 기록의 가중치가 1/2)
+
+        가중 합계는 경기 순번별로 한 번씩 점화식(s_i = x_i + d * s_(i-1))으로 계산한다.
+        """
+        decay = 0.5 ** (1.0 / halflife)
+        sums = self._values.astype(float)
+        for step in range(1, int(self._counts.max(initial=0))):
+            rows = self.starts[self._counts > step] + step
+            sums[rows] += decay * sums[rows - 1]
+        position = self.lines['경기순번'].to_numpy()
+        weight = (1 - decay ** position) / (1 - decay) if decay < 1 else position.astype(float)
+        return self._series(sums, weight)
+
+    def latest(self, series: pd.DataFrame) -> pd.DataFrame:
+        """경기별 시계열에서 선수별 마지막 경기 행 (rolling/ewm 결과의 현재 값)"""
+        return series.iloc[self.ends[self.ends > self.starts] - 1].reset_index(drop=True)
@@ -0,0 +1,134 @@
+"""
+시뮬레이션용 팀 명단 모듈
+simulate_*.py 스크립트에 있던 선수 명단, 타격 보정(skill), 상대팀/구장 목록
+"""
+
+from dataclasses import dataclass, field
+
+from distributions import OutcomeDistribution
+
+# 상대팀 목록 (경기 순서대로 돌아가며 사용)
+OPPONENTS = [
+    "청룡 베이스볼", "화이트삭스", "레드불스", "블루윙스", "골든이글스",
+    "실버스타즈", "그린몬스터즈", "블랙팬서스", "오렌지타이거즈", "퍼플드래곤즈"
+]
+
+# 구장 목록
+STADIUMS = ["잠실야구장", "목동야구장", "고척돔", "문학야구장", "대전한밭야구장"]
+
+
+@dataclass
+class Team:
+    """시뮬레이션 팀 (선수: (이름, 등번호, 포지션, 투타))"""
+    key: str
+    name: str
+    players: list
+    skills: dict = field(default_factory=dict)  # 이름 -> 안타 확률 보정
+    strikeout: float = 0.18
+    opponents: list = field(default_factory=lambda: list(OPPONENTS))
+    stadiums: list = field(default_factory=lambda: list(STADIUMS))
+
+    @property
+    def names(self) -> list:
+        return [name for name, _, _, _ in self.players]
+
+    @property
+    def pitchers(self) -> list:
+        """투수 포지션 선수 번호 (없으면 전원)"""
+        indices = [i for i, (_, _, position, _) in enumerate(self.players) if position == "투수"]
+        return indices or list(range(len(self.players)))
+
+    def skill(self, name: str) -> float:
+        return self.skills.get(name, 0)
+
+    def distribution(self) -> OutcomeDistribution:
+        """선수별 타석 결과 분포 (스크립트의 get_at_bat_result와 같은 확률)"""
+        return OutcomeDistribution.from_skills([self.skill(name) for name in self.names], self.names,
+                                               strikeout=self.strikeout)
+
+
+BLACK_MONKEYS = Team(
+    key="blackmonkeys",
+    name="Black Monkeys",
+    players=[
+        ("이용권", 1, "투수", "우투우타"),
+        ("한혜용", 2, "포수", "우투우타"),
+        ("조상현", 3, "1루수", "우투좌타"),
+        ("장동연", 4, "2루수", "우투우타"),
+        ("이강원", 5, "유격수", "우투우타"),
+        ("은표", 6, "3루수", "우투좌타"),
+        ("성은", 7, "좌익수", "좌투좌타"),
+        ("서기정", 8, "중견수", "우투우타"),
+        ("우", 9, "우익수", "우투우타"),
+        ("김성민", 10, "내야수", "우투우타"),
+        ("김영주", 11, "외야수", "우투좌타"),
+        ("명환", 12, "내야수", "우투우타"),
+        ("박계태", 13, "외야수", "좌투좌타"),
+        ("박동우", 14, "내야수", "우투우타"),
+        ("박진호", 15, "투수", "우투우타"),
+        ("박창희", 16, "투수", "좌투좌타"),
+        ("박태석", 17, "포수", "우투우타"),
+        ("백선중", 18, "외야수", "우투좌타"),
+    ],
+    skills={
+        "이용권": 0.03, "한혜용": 0.02, "조상현": 0.04, "장동연": 0.01,
+        "이강원": 0.03, "서기정": 0.02, "김성민": 0.01, "박계태": 0.02
+    },
+)
+
+MIRACLE_DONGSAN = Team(
+    key="miracle",
+    name="미라클 동산",
+    players=[
+        ("심재완", 1, "투수", "우투우타"),
+        ("성승훈", 2, "포수", "우투우타"),
+        ("김성호", 3, "1루수", "우투좌타"),
+        ("서용만", 4, "2루수", "우투우타"),
+        ("최정열", 5, "유격수", "우투우타"),
+        ("south..ten", 6, "3루수", "우투좌타"),
+        ("r_재현", 7, "좌익수", "좌투좌타"),
+        ("강원철", 8, "중견수", "우투우타"),
+        ("규식", 9, "우익수", "우투우타"),
+        ("김명환", 10, "내야수", "우투우타"),
+        ("김민찬", 11, "외야수", "우투좌타"),
+        ("김태훈", 12, "내야수", "우투우타"),
+        ("백지영", 13, "외야수", "좌투좌타"),
+        ("언제나하루를즐겁게", 14, "내야수", "우투우타"),
+        ("윤도혁", 15, "투수", "우투우타"),
+        ("최병준", 16, "투수", "좌투좌타"),
+        ("hwang's", 17, "포수", "우투우타"),
+        ("jy", 18, "외야수", "우투좌타"),
+    ],
+    skills={
+        "심재완": 0.03, "성승훈": 0.02, "김성호": 0.04, "서용만": 0.01,
+        "강원철": 0.03, "r_재현": 0.02, "규식": 0.01, "김민찬": 0.02
+    },
+)
+
+# simulate_game.py의 단일 경기 데모 팀 (삼진 20%, 상대는 청룡 베이스볼 / 잠실야구장 고정)
+DEMO_TEAM = Team(
+    key="demo",
+    name="우리팀",
+    players=[
+        ("김민수", 1, "투수", "우투우타"),
+        ("이정훈", 7, "중견수", "우투좌타"),
+        ("박성호", 25, "1루수", "우투우타"),
+        ("최동욱", 22, "포수", "우투우타"),
+        ("정재원", 3, "유격수", "우투좌타"),
+        ("한승우", 14, "3루수", "우투우타"),
+        ("오준혁", 8, "우익수", "좌투좌타"),
+        ("신동현", 5, "2루수", "우투우타"),
+        ("윤태호", 11, "좌익수", "우투좌타"),
+    ],
+    strikeout=0.20,
+    opponents=["청룡 베이스볼"],
+    stadiums=["잠실야구장"],
+)
+
+TEAMS = {team.key: team for team in (BLACK_MONKEYS, MIRACLE_DONGSAN, DEMO_TEAM)}
+
+
+def get_team(key: str) -> Team:
+    if key not in TEAMS:
+        raise ValueError(f"알 수 없는 팀: {key} (가능: {', '.join(TEAMS)})")
+    return TEAMS[key]
@@ -0,0 +1,185 @@
+"""
+득점 기대값 모듈
+주자(8) x 아웃(3) 24개 상황의 흡수 마르코프 체인으로
+이닝/경기 기대 득점, 득점 기대값표(RE24), 타석 결과별 득점 가치를 정확히 계산
+진루 규칙은 simulation.transition_table()과 같음
+"""
+
+import numpy as np
+import pandas as pd
+
+from distributions import OutcomeDistribution
+from events import (
+    DOUBLE, HIT_BY_PITCH, HOME_RUN, OUT, OUTCOME_COUNT, OUTCOME_LABELS, SINGLE, TRIPLE, WALK
+)
+from simulation import BASE_STATES, INNINGS, LINEUP_SIZE, NEXT_BASES, OUTS_ADDED, RUNS_SCORED
+
+OUTS_PER_INNING = 3
+BASE_OUT_STATES = BASE_STATES * OUTS_PER_INNING  # 24
+
+# 주자 상황 표기 (비트마스크 순서: 1루=1, 2루=2, 3루=4)
+BASE_LABELS = ['주자 없음', '1루', '2루', '1,2루', '3루', '1,3루', '2,3루', '만루']
+
+# SabermetricsCalculator.WOBA_WEIGHTS 키 -> 결과 코드
+WOBA_OUTCOMES = {'bb': WALK, 'hbp': HIT_BY_PITCH, 'single': SINGLE, 'double': DOUBLE,
+                 'triple': TRIPLE, 'hr': HOME_RUN}
+
+
+def state_index(bases, outs):
+    """(주자 비트마스크, 아웃) -> 24개 상황 번호"""
+    return np.asarray(outs) * BASE_STATES + np.asarray(bases)
+
+
+def _state_id(slot, bases, outs, slots: int):
+    """(타순, 주자, 아웃) -> 체인 상태 번호 (아웃이 같은 상태끼리 연속 구간)"""
+    return (outs * slots + slot) * BASE_STATES + bases
+
+
+def _transitions(slots: int):
+    """(타순, 주자, 아웃, 결과)마다의 (출발 상태, 도착 상태 또는 -1(이닝 종료), 다음 타순, 득점)
+
+    확률과 무관한 구조라 타순 수별로 한 번만 만든다.
+    """
+    slot, outs, bases, outcome = np.meshgrid(
+        np.arange(slots), np.arange(OUTS_PER_INNING), np.arange(BASE_STATES), np.arange(OUTCOME_COUNT),
+        indexing='ij')
+    slot, outs, bases, outcome = (a.ravel() for a in (slot, outs, bases, outcome))
+    next_slot = (slot + 1) % slots
+    next_outs = outs + OUTS_ADDED[bases, outcome]
+    source = _state_id(slot, bases, outs, slots)
+    target = np.where(next_outs >= OUTS_PER_INNING, -1,
+                      _state_id(next_slot, NEXT_BASES[bases, outcome], np.minimum(next_outs, 2), slots))
+    return source, target, slot, outcome, next_slot, RUNS_SCORED[bases, outcome].astype(float)
+
+
+_TRANSITIONS = {slots: _transitions(slots) for slots in (1, LINEUP_SIZE)}
+
+
+def _solve(probabilities: np.ndarray):
+    """타순별 결과 확률 (slots x OUTCOME_COUNT) -> (상태별 남은 이닝 기대 득점, 상태별 다음 이닝 선두 타순 확률)
+
+    전이 행렬 Q(이닝 안의 상황 -> 상황)에 대해 (I - Q) x = [r | A]를 한 번에 푼다.
+    r은 한 타석의 기대 득점, A는 이번 타석에 3아웃이 되어 이닝이 끝나고 다음 이닝 선두가 되는 타순 확률.
+    """
+    slots = len(probabilities)
+    source, target, slot, outcome, next_slot, runs = _TRANSITIONS[slots]
+    weight = probabilities[slot, outcome]
+    size = slots * BASE_OUT_STATES
+
+    ends = target < 0
+    system = np.eye(size) - np.bincount(
+        source[~ends] * size + target[~ends], weights=weight[~ends], minlength=size * size).reshape(size, size)
+    rhs = np.bincount(source * (1 + slots), weights=weight * runs, minlength=size * (1 + slots))
+    rhs += np.bincount(source[ends] * (1 + slots) + 1 + next_slot[ends], weights=weight[ends],
+                       minlength=size * (1 + slots))
+    rhs = rhs.reshape(size, 1 + slots)
+
+    # 아웃은 줄지 않으므로 (I - Q)는 아웃 기준 블록 상삼각: 2아웃 -> 1아웃 -> 무사 순으로 작은 블록만 푼다
+    solution = np.zeros_like(rhs)
+    block = slots * BASE_STATES
+    for outs in reversed(range(OUTS_PER_INNING)):
+        lo, hi = outs * block, (outs + 1) * block
+        known = rhs[lo:hi] - system[lo:hi, hi:] @ solution[hi:]
+        solution[lo:hi] = np.linalg.solve(system[lo:hi, lo:hi], known)
+    return solution[:, 0], solution[:, 1:]
+
+
+def _as_lineup(probabilities) -> np.ndarray:
+    """OutcomeDistribution 또는 확률 행렬/벡터 -> 행 합 1인 (타순 수, OUTCOME_COUNT) 행렬"""
+    if isinstance(probabilities, OutcomeDistribution):
+        return probabilities.probabilities
+    probs = np.asarray(probabilities, dtype=float)
+    if probs.ndim == 1:
+        probs = probs[None, :]
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+class LineupExpectancy:
+    """타순 하나의 정확한 득점 기대값
+
+    state_values[s, i]: s번 타자 타석, i번 상황에서 이닝이 끝날 때까지의 기대 득점
+    inning_runs[s]: s번 타자가 선두인 이닝의 기대 득점
+    leadoff[s, t]: s번 타자가 선두인 이닝 다음 이닝의 선두가 t번 타자일 확률
+    """
+
+    def __init__(self, probabilities):
+        self.probabilities = _as_lineup(probabilities)
+        self.slots = len(self.probabilities)
+        values, leadoff = _solve(self.probabilities)
+        self.state_values = values.reshape(OUTS_PER_INNING, self.slots, BASE_STATES).transpose(1, 0, 2).reshape(
+            self.slots, BASE_OUT_STATES)
+        starts = _state_id(np.arange(self.slots), 0, 0, self.slots)  # 주자 없음, 무사
+        self.inning_runs = values[starts]
+        self.leadoff = leadoff[starts]
+
+    def leadoff_distribution(self, innings: int = INNINGS) -> np.ndarray:
+        """(innings, slots) 이닝별 선두 타순 확률 (1회는 1번 타자)"""
+        distribution = np.zeros((innings, self.slots))
+        current = np.eye(self.slots)[0]
+        for inning in range(innings):
+            distribution[inning] = current
+            current = current @ self.leadoff
+        return distribution
+
+    def runs_per_inning(self, innings: int = INNINGS) -> np.ndarray:
+        """이닝별 기대 득점"""
+        return self.leadoff_distribution(innings) @ self.inning_runs
+
+    def runs_per_game(self, innings: int = INNINGS) -> float:
+        """경기당 기대 득점 (simulate_games의 득점 평균과 같은 값)"""
+        return float(self.runs_per_inning(innings).sum())
+
+
+def expected_runs(probabilities, innings: int = INNINGS) -> float:
+    """타순(OutcomeDistribution, 9 x OUTCOME_COUNT 또는 1명 공통 분포)의 경기당 기대 득점"""
+    return LineupExpectancy(probabilities).runs_per_game(innings)
+
+
+def run_expectancy_matrix(probabilities) -> pd.DataFrame:
+    """한 타자 분포가 계속 타석에 설 때의 득점 기대값표 (RE24, 행: 주자 상황, 열: 아웃)"""
+    values = LineupExpectancy(np.mean(_as_lineup(probabilities), axis=0)).state_values[0]
+    return pd.DataFrame(values.reshape(OUTS_PER_INNING, BASE_STATES).T,
+                        index=pd.Index(BASE_LABELS, name='주자'),
+                        columns=pd.Index(range(OUTS_PER_INNING), name='아웃'))
+
+
+def state_frequencies(probabilities) -> np.ndarray:
+    """이닝 하나에서 24개 상황에 타석이 돌아오는 기대 횟수 (한 타자 분포 기준)"""
+    probs = np.mean(_as_lineup(probabilities), axis=0)
+    source, target, _, outcome, _, _ = _TRANSITIONS[1]
+    inner = target >= 0
+    transition = np.zeros((BASE_OUT_STATES, BASE_OUT_STATES))
+    np.add.at(transition, (source[inner], target[inner]), probs[outcome[inner]])
+    start = np.eye(BASE_OUT_STATES)[state_index(0, 0)]
+    return np.linalg.solve(np.eye(BASE_OUT_STATES) - transition.T, start)
+
+
+def run_values(probabilities) -> pd.Series:
+    """결과 코드별 평균 득점 가치 (득점 + 상황 변화에 따른 기대 득점 변화, 상황 빈도 가중 평균)
+
+    한 타자 분포가 계속 타석에 서는 환경 기준. 결과 코드 순서의 Series (index: OUTCOME_LABELS).
+    """
+    probs = np.mean(_as_lineup(probabilities), axis=0)
+    before = LineupExpectancy(probs).state_values[0]
+    after = np.append(before, 0.0)  # 이닝 종료 = 0
+    frequency = state_frequencies(probs)
+
+    source, target, _, outcome, _, runs = _TRANSITIONS[1]
+    value = runs + after[target] - before[source]
+    totals = np.bincount(outcome, weights=frequency[source] * value, minlength=OUTCOME_COUNT)
+    return pd.Series(totals / frequency.sum(), index=OUTCOME_LABELS, name='득점 가치')
+
+
+def woba_weights(probabilities) -> dict:
+    """득점 가치로부터 wOBA 가중치 유도 (SabermetricsCalculator.WOBA_WEIGHTS와 같은 키)
+
+    아웃 대비 득점 가치를 구한 뒤, 같은 분포의 wOBA가 출루율과 같아지도록 배율을 맞춘다.
+    """
+    probs = np.mean(_as_lineup(probabilities), axis=0)
+    values = run_values(probs).to_numpy()
+    values = values - values[OUT]
+    on_base_codes = list(WOBA_OUTCOMES.values())
+    scale_base = (probs[on_base_codes] * values[on_base_codes]).sum()
+    on_base = probs[on_base_codes].sum()
+    scale = on_base / scale_base if scale_base > 0 else 0.0
+    return {key: round(float(values[code] * scale), 2) for key, code in WOBA_OUTCOMES.items()}
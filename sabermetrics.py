@@ -6,6 +6,11 @@
 from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
+import pandas as pd
+
+from events import OUTCOME_COUNT, counting_columns, encode_at_bats
+
 
 @dataclass
 class BattingStats:
@@ -61,6 +66,67 @@ class PitchingStats:
         return full_innings + (outs / 3)
 
 
+# 타격 집계 테이블 컬럼 (batting_table 반환 순서)
+BATTING_COUNT_COLUMNS = [
+    '타석', '타수', '안타', '1루타', '2루타', '3루타', '홈런', '루타',
+    '볼넷', '삼진', '사구', '희생플라이', '희생번트', '타점', '득점', '도루', '도실'
+]
+BATTING_RATE_COLUMNS = ['AVG', 'OBP', 'SLG', 'OPS', 'ISO', 'wOBA', 'BABIP', 'K%', 'BB%']
+BATTING_TABLE_COLUMNS = ['선수ID', '선수명', '경기'] + BATTING_COUNT_COLUMNS + BATTING_RATE_COLUMNS
+
+# 투구 집계 테이블 컬럼 (pitching_table 반환 순서)
+PITCHING_COUNT_COLUMNS = ['아웃', '이닝', '피안타', '실점', '자책', '볼넷', '삼진', '피홈런', '승', '패', '세이브']
+PITCHING_RATE_COLUMNS = ['ERA', 'WHIP', 'K/9', 'BB/9', 'HR/9', 'K/BB', 'FIP']
+PITCHING_TABLE_COLUMNS = ['선수ID', '선수명', '경기'] + PITCHING_COUNT_COLUMNS + PITCHING_RATE_COLUMNS
+
+# 투구 기록에서 그대로 합산하는 정수 컬럼
+_PITCHING_SUM_COLUMNS = ['피안타', '실점', '자책', '볼넷', '삼진', '피홈런', '승', '패', '세이브']
+
+
+def _int_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """정수 컬럼 추출 (빈 값/누락 컬럼은 0)
+
+    저장소가 스키마대로 변환해 둔 정수 컬럼은 그대로 쓰고,
+    타입이 지정되지 않은 DataFrame만 숫자로 변환한다.
+    """
+    if column not in df.columns:
+        return pd.Series(0, index=df.index, dtype='int64')
+    if pd.api.types.is_integer_dtype(df[column]):
+        return df[column]
+    return pd.to_numeric(df[column], errors='coerce').fillna(0).astype('int64')
+
+
+def innings_to_outs(innings) -> np.ndarray:
+    """야구식 이닝 표기를 아웃카운트로 변환 (5.1 -> 16, 5.2 -> 17)"""
+    values = pd.to_numeric(pd.Series(innings), errors='coerce').fillna(0).to_numpy(dtype=float)
+    full_innings = np.floor(values + 1e-9)
+    partial_outs = np.rint((values - full_innings) * 10)
+    return (full_innings * 3 + partial_outs).astype('int64')
+
+
+def outs_to_innings(outs):
+    """아웃카운트를 야구식 이닝 표기로 변환 (16 -> 5.1, 18 -> 6.0)"""
+    outs = np.asarray(outs, dtype='int64')
+    innings = outs // 3 + (outs % 3) / 10
+    return float(innings) if innings.ndim == 0 else innings
+
+
+def pitching_lines(pitching: pd.DataFrame) -> pd.DataFrame:
+    """투구 기록 -> 합산용 정수 컬럼(아웃 + 피안타 ... 세이브) DataFrame (행 순서/인덱스 유지)"""
+    lines = pd.DataFrame({column: _int_column(pitching, column) for column in _PITCHING_SUM_COLUMNS},
+                         index=pitching.index)
+    lines.insert(0, '아웃', innings_to_outs(pitching['이닝']) if '이닝' in pitching.columns else 0)
+    return lines
+
+
+def _ratio(numerator, denominator) -> np.ndarray:
+    """분모가 0이면 NaN을 돌려주는 벡터 나눗셈"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator != 0, numerator / denominator, np.nan)
+
+
 class SabermetricsCalculator:
     """세이버메트릭스 지표 계산기"""
 
@@ -213,6 +279,207 @@ class SabermetricsCalculator:
         numerator = (13 * stats.home_runs_allowed) + (3 * stats.walks) - (2 * stats.strikeouts)
         return (numerator / stats.innings_decimal) + SabermetricsCalculator.FIP_CONSTANT
 
+    # === 집계 테이블 ===
+
+    @staticmethod
+    def batting_totals(at_bats: pd.DataFrame) -> BattingStats:
+        """타석 기록 전체를 하나의 BattingStats로 합산"""
+        stats = BattingStats()
+        if len(at_bats) == 0:
+            return stats
+
+        log = encode_at_bats(at_bats)
+        counts = np.bincount(log.outcome, minlength=OUTCOME_COUNT).reshape(1, OUTCOME_COUNT)
+        totals = counting_columns(counts, {column: values.sum(keepdims=True) for column, values in log.stats.items()})
+        return SabermetricsCalculator.stats_from_counts({column: values[0] for column, values in totals.items()})
+
+    @staticmethod
+    def stats_from_counts(counts) -> BattingStats:
+        """누적 기록 컬럼(타석, 타수, 안타, ..., 도실) 합계 -> BattingStats
+
+        batting_table/박스스코어 행이나 그 합계(Series, dict)를 그대로 받는다.
+        """
+        return BattingStats(
+            plate_appearances=int(counts['타석']),
+            at_bats=int(counts['타수']),
+            hits=int(counts['안타']),
+            doubles=int(counts['2루타']),
+            triples=int(counts['3루타']),
+            home_runs=int(counts['홈런']),
+            walks=int(counts['볼넷']),
+            strikeouts=int(counts['삼진']),
+            hit_by_pitch=int(counts['사구']),
+            sacrifice_flies=int(counts['희생플라이']),
+            sacrifice_bunts=int(counts['희생번트']),
+            rbis=int(counts['타점']),
+            runs=int(counts['득점']),
+            stolen_bases=int(counts['도루']),
+            caught_stealing=int(counts['도실']),
+        )
+
+    @staticmethod
+    def batting_table(at_bats: pd.DataFrame) -> pd.DataFrame:
+        """선수별 타격 기록 테이블 (인코딩한 타석 로그를 np.bincount 한 번으로 집계)
+
+        선수당 한 행이며 누적 기록(타석, 안타, 홈런 ...)과
+        비율 지표(AVG/OBP/SLG/OPS/ISO/wOBA/BABIP/K%/BB%)를 모두 컬럼으로 가진다.
+        계산할 수 없는 비율 지표는 NaN.
+        """
+        if len(at_bats) == 0:
+            return pd.DataFrame(columns=BATTING_TABLE_COLUMNS)
+
+        log = encode_at_bats(at_bats)
+        table = pd.DataFrame({
+            '선수ID': log.player_ids,
+            '선수명': log.player_names,
+            '경기': log.games_played(),
+            **counting_columns(log.outcome_counts(), log.stat_sums()),
+        })
+        table = SabermetricsCalculator.add_batting_rates(table)
+        return table[BATTING_TABLE_COLUMNS]
+
+    @staticmethod
+    def pitching_totals(pitching: pd.DataFrame) -> PitchingStats:
+        """투구 기록 전체를 하나의 PitchingStats로 합산 (이닝은 아웃카운트로 합산)"""
+        stats = PitchingStats()
+        if len(pitching) == 0:
+            return stats
+
+        outs = int(innings_to_outs(pitching['이닝']).sum()) if '이닝' in pitching.columns else 0
+        stats.innings_pitched = outs_to_innings(outs)
+        stats.hits_allowed = int(_int_column(pitching, '피안타').sum())
+        stats.runs_allowed = int(_int_column(pitching, '실점').sum())
+        stats.earned_runs = int(_int_column(pitching, '자책').sum())
+        stats.walks = int(_int_column(pitching, '볼넷').sum())
+        stats.strikeouts = int(_int_column(pitching, '삼진').sum())
+        stats.home_runs_allowed = int(_int_column(pitching, '피홈런').sum())
+        stats.wins = int(_int_column(pitching, '승').sum())
+        stats.losses = int(_int_column(pitching, '패').sum())
+        stats.saves = int(_int_column(pitching, '세이브').sum())
+        return stats
+
+    @staticmethod
+    def pitching_table(pitching: pd.DataFrame) -> pd.DataFrame:
+        """투수별 투구 기록 테이블 (전체 투구 기록을 한 번의 groupby로 집계)
+
+        이닝은 아웃카운트('아웃')로 바꿔 정수로 합산한 뒤 야구식 표기('이닝')로 되돌린다.
+        ERA/WHIP/K/9/BB/9/HR/9/K/BB/FIP는 아웃카운트 기준으로 계산하며,
+        계산할 수 없는 지표는 NaN.
+        """
+        if len(pitching) == 0:
+            return pd.DataFrame(columns=PITCHING_TABLE_COLUMNS)
+
+        lines = pitching_lines(pitching)
+        lines['선수ID'] = pitching['선수ID']
+        lines['선수명'] = pitching['선수명'] if '선수명' in pitching.columns else ''
+
+        aggregations = {
+            '선수명': ('선수명', 'first'),
+            '경기': ('아웃', 'size'),
+            '아웃': ('아웃', 'sum'),
+        }
+        for column in _PITCHING_SUM_COLUMNS:
+            aggregations[column] = (column, 'sum')
+
+        table = lines.groupby('선수ID', sort=False, observed=True).agg(**aggregations).reset_index()
+        table['이닝'] = outs_to_innings(table['아웃'].to_numpy())
+        table = SabermetricsCalculator.add_pitching_rates(table)
+        return table[PITCHING_TABLE_COLUMNS]
+
+    @staticmethod
+    def add_pitching_rates(table: pd.DataFrame) -> pd.DataFrame:
+        """아웃카운트와 누적 기록 컬럼으로부터 투구 지표 컬럼 계산 (벡터 연산)"""
+        innings = table['아웃'] / 3
+
+        table['ERA'] = _ratio(table['자책'] * 9, innings)
+        table['WHIP'] = _ratio(table['볼넷'] + table['피안타'], innings)
+        table['K/9'] = _ratio(table['삼진'] * 9, innings)
+        table['BB/9'] = _ratio(table['볼넷'] * 9, innings)
+        table['HR/9'] = _ratio(table['피홈런'] * 9, innings)
+        # 볼넷 0개: 삼진이 있으면 inf, 없으면 NaN (k_bb_ratio와 동일)
+        table['K/BB'] = np.where(
+            table['볼넷'] > 0,
+            _ratio(table['삼진'], table['볼넷']),
+            np.where(table['삼진'] > 0, np.inf, np.nan)
+        )
+        table['FIP'] = _ratio(13 * table['피홈런'] + 3 * table['볼넷'] - 2 * table['삼진'], innings) \
+            + SabermetricsCalculator.FIP_CONSTANT
+        return table
+
+    @staticmethod
+    def add_batting_rates(table: pd.DataFrame) -> pd.DataFrame:
+        """누적 기록 컬럼으로부터 비율 지표 컬럼 계산 (벡터 연산)"""
+        weights = SabermetricsCalculator.WOBA_WEIGHTS
+        at_bats = table['타수']
+        on_base_den = at_bats + table['볼넷'] + table['사구'] + table['희생플라이']
+
+        table['AVG'] = _ratio(table['안타'], at_bats)
+        table['OBP'] = _ratio(table['안타'] + table['볼넷'] + table['사구'], on_base_den)
+        table['SLG'] = _ratio(table['루타'], at_bats)
+        table['OPS'] = table['OBP'] + table['SLG']
+        table['ISO'] = table['SLG'] - table['AVG']
+        table['wOBA'] = _ratio(
+            weights['bb'] * table['볼넷'] +
+            weights['hbp'] * table['사구'] +
+            weights['single'] * table['1루타'] +
+            weights['double'] * table['2루타'] +
+            weights['triple'] * table['3루타'] +
+            weights['hr'] * table['홈런'],
+            on_base_den
+        )
+        table['BABIP'] = _ratio(table['안타'] - table['홈런'],
+                                at_bats - table['삼진'] - table['홈런'] + table['희생플라이'])
+        table['K%'] = _ratio(table['삼진'], table['타석'])
+        table['BB%'] = _ratio(table['볼넷'], table['타석'])
+        return table
+
+
+# === 화면 공용 집계 (app.py 페이지와 benchmarks가 같은 함수를 호출) ===
+
+def calculate_player_batting_stats(df: pd.DataFrame) -> BattingStats:
+    """타석 기록 DataFrame에서 BattingStats 계산"""
+    return SabermetricsCalculator.batting_totals(df)
+
+
+def calculate_player_pitching_stats(df: pd.DataFrame) -> PitchingStats:
+    """투구 기록 DataFrame에서 PitchingStats 계산"""
+    return SabermetricsCalculator.pitching_totals(df)
+
+
+def roster_batting_rows(players: pd.DataFrame, batting: pd.DataFrame) -> pd.DataFrame:
+    """등록 선수 순서대로 타격 테이블 행 결합 (기록 없는 선수 제외, NaN 지표는 0)"""
+    roster = players[['선수ID', '이름']].merge(batting.drop(columns=['선수명']), on='선수ID', how='inner')
+    roster[BATTING_RATE_COLUMNS] = roster[BATTING_RATE_COLUMNS].astype(float).fillna(0)
+    return roster
+
+
+def batting_leaders(batting: pd.DataFrame, column: str, n: int = 5) -> pd.DataFrame:
+    """타격 테이블에서 column 상위 n명 (최소 1타수, 값이 0보다 큰 선수만)"""
+    qualified = batting[(batting['타수'] >= 1) & (batting[column] > 0)]
+    return qualified.sort_values(column, ascending=False).head(n)
+
+
+def team_comparison_table(players: pd.DataFrame, batting: pd.DataFrame) -> pd.DataFrame:
+    """팀원 성적 비교 표 (최소 1타수, OPS 내림차순, 인덱스는 등록 순서, 선수ID는 표시용이 아님)"""
+    roster = roster_batting_rows(players, batting)
+    roster = roster[roster['타수'] >= 1]
+    table = pd.DataFrame({
+        '선수ID': roster['선수ID'],
+        '선수': roster['이름'],
+        '타수': roster['타수'],
+        '안타': roster['안타'],
+        '타율': roster['AVG'],
+        '출루율': roster['OBP'],
+        '장타율': roster['SLG'],
+        'OPS': roster['OPS'],
+        'wOBA': roster['wOBA'],
+        '홈런': roster['홈런'],
+        '타점': roster['타점'],
+        '삼진': roster['삼진'],
+        '볼넷': roster['볼넷'],
+    })
+    return table.sort_values('OPS', ascending=False)
+
 
 def format_stat(value: Optional[float], decimals: int = 3, multiply_100: bool = False) -> str:
     """지표값을 문자열로 포맷팅"""
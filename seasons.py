@@ -0,0 +1,225 @@
+"""
+시즌 시뮬레이션 모듈
+simulate_games()를 프로세스 풀로 나눠 돌려 여러 시즌을 시뮬레이션하고
+워커마다 시즌 단위 분포(히스토그램/합계)로 줄인 결과만 부모 프로세스로 보내 합친다.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from distributions import as_distribution
+from events import EVENT_STAT_COLUMNS, OUTCOME_COUNT, counting_columns
+from sabermetrics import SabermetricsCalculator
+from simulation import INNINGS, LINEUP_SIZE, simulate_games
+
+# 샤드당 경기 수 기준 (샤드 구성은 워커 수와 무관하므로 같은 시드면 워커 수가 달라도 결과가 같음)
+SHARD_GAMES = 20_000
+
+# 시즌 비율 지표 히스토그램 구간 (0 ~ 3.0, 0.005 단위, 마지막 구간은 그 이상 포함)
+RATE_BIN_WIDTH = 0.005
+RATE_BINS = 600
+RATE_COLUMNS = ['AVG', 'OBP', 'SLG', 'OPS']
+
+
+def _add_histogram(total: np.ndarray, part: np.ndarray) -> np.ndarray:
+    """길이가 다를 수 있는 정수 히스토그램 합산"""
+    if len(part) > len(total):
+        total = np.concatenate([total, np.zeros(len(part) - len(total), dtype=total.dtype)])
+    total[:len(part)] += part
+    return total
+
+
+def _rate_bins(values: np.ndarray) -> np.ndarray:
+    return np.minimum((np.asarray(values) / RATE_BIN_WIDTH).astype(np.int64), RATE_BINS - 1)
+
+
+@dataclass
+class SeasonSummary:
+    """여러 시즌 시뮬레이션의 누적 분포
+
+    모든 필드는 정수 합계/히스토그램이라 merge() 순서와 무관하게 결과가 같다.
+    """
+    games_per_season: int
+    seasons: int = 0
+    win_counts: np.ndarray = None          # 시즌 승수별 시즌 수 (길이 games_per_season + 1)
+    runs_counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))           # 경기 득점별 경기 수
+    opponent_runs_counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))  # 경기 실점별 경기 수
+    losses: int = 0
+    draws: int = 0
+    season_runs_sum: int = 0
+    season_runs_sq_sum: int = 0
+    slot_counts: np.ndarray = field(default_factory=lambda: np.zeros((LINEUP_SIZE, OUTCOME_COUNT), dtype=np.int64))
+    slot_rbis: np.ndarray = field(default_factory=lambda: np.zeros(LINEUP_SIZE, dtype=np.int64))
+    slot_rates: dict = field(default_factory=lambda: {
+        column: np.zeros((LINEUP_SIZE, RATE_BINS), dtype=np.int64) for column in RATE_COLUMNS
+    })  # 지표 -> (타순, 구간) 시즌 수
+
+    def __post_init__(self):
+        if self.win_counts is None:
+            self.win_counts = np.zeros(self.games_per_season + 1, dtype=np.int64)
+
+    @classmethod
+    def from_result(cls, result, games_per_season: int) -> 'SeasonSummary':
+        """per_game=True로 돌린 SimulationResult(경기 수 = 시즌 수 x games_per_season) -> 시즌 분포"""
+        seasons = result.games // games_per_season
+        size = seasons * games_per_season
+        runs = result.runs[:size].reshape(seasons, games_per_season)
+        opponent = result.opponent_runs[:size].reshape(seasons, games_per_season)
+        season_runs = runs.sum(axis=1)
+
+        summary = cls(games_per_season=games_per_season, seasons=seasons)
+        summary.win_counts += np.bincount((runs > opponent).sum(axis=1), minlength=games_per_season + 1)
+        summary.runs_counts = np.bincount(runs.ravel())
+        summary.opponent_runs_counts = np.bincount(opponent.ravel())
+        summary.losses = int((runs < opponent).sum())
+        summary.draws = int((runs == opponent).sum())
+        summary.season_runs_sum = int(season_runs.sum())
+        summary.season_runs_sq_sum = int((season_runs ** 2).sum())
+        summary.slot_counts += result.slot_counts
+        summary.slot_rbis += result.slot_rbis
+
+        # 시즌 x 타순별 비율 지표 -> 히스토그램
+        season_counts = result.game_slot_counts[:size].reshape(
+            seasons, games_per_season, LINEUP_SIZE, OUTCOME_COUNT).sum(axis=1, dtype=np.int64)
+        table = _rate_table(season_counts.reshape(-1, OUTCOME_COUNT))
+        slot = np.tile(np.arange(LINEUP_SIZE), seasons)
+        for column in RATE_COLUMNS:
+            keys = slot * RATE_BINS + _rate_bins(table[column].to_numpy())
+            summary.slot_rates[column] += np.bincount(
+                keys, minlength=LINEUP_SIZE * RATE_BINS).reshape(LINEUP_SIZE, RATE_BINS)
+        return summary
+
+    def merge(self, other: 'SeasonSummary') -> 'SeasonSummary':
+        """다른 요약을 더함 (제자리 갱신)"""
+        if other.games_per_season != self.games_per_season:
+            raise ValueError("시즌당 경기 수가 다른 요약은 합칠 수 없습니다")
+        self.seasons += other.seasons
+        self.win_counts += other.win_counts
+        self.runs_counts = _add_histogram(self.runs_counts, other.runs_counts)
+        self.opponent_runs_counts = _add_histogram(self.opponent_runs_counts, other.opponent_runs_counts)
+        self.losses += other.losses
+        self.draws += other.draws
+        self.season_runs_sum += other.season_runs_sum
+        self.season_runs_sq_sum += other.season_runs_sq_sum
+        self.slot_counts += other.slot_counts
+        self.slot_rbis += other.slot_rbis
+        for column in RATE_COLUMNS:
+            self.slot_rates[column] += other.slot_rates[column]
+        return self
+
+    # === 팀 분포 ===
+
+    @property
+    def games(self) -> int:
+        return self.seasons * self.games_per_season
+
+    @property
+    def wins(self) -> int:
+        return int((np.arange(len(self.win_counts)) * self.win_counts).sum())
+
+    def mean_wins(self) -> float:
+        return self.wins / self.seasons if self.seasons else 0.0
+
+    def win_distribution(self) -> pd.Series:
+        """시즌 승수 -> 확률"""
+        total = max(self.seasons, 1)
+        return pd.Series(self.win_counts / total, index=pd.RangeIndex(len(self.win_counts), name='승수'))
+
+    def runs_per_game(self) -> float:
+        games = self.runs_counts.sum()
+        return float((np.arange(len(self.runs_counts)) * self.runs_counts).sum() / games) if games else 0.0
+
+    def season_runs_std(self) -> float:
+        """시즌 총득점의 표준편차"""
+        if not self.seasons:
+            return 0.0
+        mean = self.season_runs_sum / self.seasons
+        return float(np.sqrt(max(self.season_runs_sq_sum / self.seasons - mean ** 2, 0.0)))
+
+    # === 타순별 분포 ===
+
+    def slot_table(self) -> pd.DataFrame:
+        """타순별 전체 시즌 누적 기록 + 비율 지표 (득점/도루/도실은 0)"""
+        table = _rate_table(self.slot_counts, self.slot_rbis)
+        table.insert(0, '타순', np.arange(1, LINEUP_SIZE + 1))
+        return table
+
+    def slot_quantiles(self, column: str = 'OPS', quantiles=(0.1, 0.5, 0.9)) -> pd.DataFrame:
+        """타순별 시즌 비율 지표의 분위수 (히스토그램 구간 중앙값 기준)"""
+        counts = self.slot_rates[column]
+        cumulative = np.cumsum(counts, axis=1)
+        centers = (np.arange(RATE_BINS) + 0.5) * RATE_BIN_WIDTH
+        result = {}
+        for q in quantiles:
+            target = np.maximum(np.ceil(q * cumulative[:, -1]), 1)
+            position = np.array([np.searchsorted(row, t) for row, t in zip(cumulative, target)])
+            result[q] = np.where(cumulative[:, -1] > 0, centers[np.minimum(position, RATE_BINS - 1)], np.nan)
+        return pd.DataFrame(result, index=pd.RangeIndex(1, LINEUP_SIZE + 1, name='타순'))
+
+
+def _rate_table(counts: np.ndarray, rbis: np.ndarray = None) -> pd.DataFrame:
+    """결과 코드 개수 행렬 -> 누적 기록 + 비율 지표 DataFrame"""
+    stats = {column: np.zeros(len(counts), dtype=np.int64) for column in EVENT_STAT_COLUMNS}
+    if rbis is not None:
+        stats['타점'] = np.asarray(rbis, dtype=np.int64)
+    return SabermetricsCalculator.add_batting_rates(pd.DataFrame(counting_columns(counts, stats)))
+
+
+def _simulate_shard(distribution, seasons: int, games_per_season: int, seed, innings: int) -> SeasonSummary:
+    """워커 프로세스: 시즌 묶음 하나를 시뮬레이션하고 요약만 반환"""
+    result = simulate_games(distribution, seasons * games_per_season, np.random.default_rng(seed),
+                            innings=innings, per_game=True)
+    return SeasonSummary.from_result(result, games_per_season)
+
+
+def shard_sizes(n_seasons: int, games_per_season: int) -> list:
+    """시즌 수 -> 샤드별 시즌 수 목록 (SHARD_GAMES 경기 단위, 워커 수와 무관)"""
+    per_shard = max(1, SHARD_GAMES // max(games_per_season, 1))
+    sizes = [per_shard] * (n_seasons // per_shard)
+    if n_seasons % per_shard:
+        sizes.append(n_seasons % per_shard)
+    return sizes
+
+
+def simulate_seasons(probabilities, n_seasons: int, games_per_season: int = 10, seed=None,
+                     workers: int = None, innings: int = INNINGS) -> SeasonSummary:
+    """여러 시즌을 프로세스 풀에서 시뮬레이션
+
+    시즌을 SHARD_GAMES 경기 크기의 샤드로 나누고 샤드마다 SeedSequence.spawn()으로 만든
+    독립 난수 스트림을 준다. 샤드 구성과 스트림은 워커 수와 무관하고 요약 합산은 정수 덧셈이므로
+    같은 시드면 workers 값과 완료 순서에 상관없이 같은 결과가 나온다.
+    워커는 타석 배열 대신 SeasonSummary만 돌려주고, 부모는 완료되는 순서대로 합친다.
+
+    Args:
+        probabilities: 타순 9명의 OutcomeDistribution 또는 (9, OUTCOME_COUNT) 확률
+        n_seasons: 시즌 수
+        games_per_season: 시즌당 경기 수
+        seed: 시드 (int 또는 np.random.SeedSequence)
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        innings: 경기당 공격 이닝 수
+
+    Returns:
+        SeasonSummary
+    """
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    sizes = shard_sizes(n_seasons, games_per_season)
+    seeds = seed_sequence.spawn(len(sizes))
+    distribution = as_distribution(probabilities, LINEUP_SIZE)  # 별칭 테이블은 한 번만 만들어 워커로 보냄
+    summary = SeasonSummary(games_per_season=games_per_season)
+
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers <= 1:
+        for size, shard_seed in zip(sizes, seeds):
+            summary.merge(_simulate_shard(distribution, size, games_per_season, shard_seed, innings))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_simulate_shard, distribution, size, games_per_season, shard_seed, innings)
+                   for size, shard_seed in zip(sizes, seeds)]
+        for future in as_completed(futures):
+            summary.merge(future.result())
+    return summary
@@ -5,7 +5,11 @@ Black Monkeys 전용 v2.0
 """
 
 import json
+import logging
 import os
+import random
+import threading
+import time
 from datetime import datetime
 from typing import Optional
 
@@ -13,6 +17,12 @@ import gspread
 import pandas as pd
 from google.oauth2.service_account import Credentials
 
+from box_scores import BoxScoreTable, private_copy
+from instrumentation import METRICS, row_count
+from snapshot_cache import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
 # Google Sheets API 스코프
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -26,19 +36,425 @@ SHEET_AT_BATS = "타석기록"
 SHEET_PITCHING = "투구기록"
 SHEET_ATTENDANCE = "참석기록"
 
+# 시트별 헤더 (컬럼 순서)
+PLAYERS_HEADERS = ["선수ID", "이름", "등번호", "포지션", "투타", "생성일"]
+GAMES_HEADERS = ["경기ID", "날짜", "상대팀", "홈/원정", "우리점수", "상대점수", "결과", "구장", "메모"]
+AT_BATS_HEADERS = ["기록ID", "경기ID", "선수ID", "선수명", "이닝", "타순",
+                   "결과", "안타종류", "타점", "득점", "도루", "도실",
+                   "볼넷", "삼진", "사구", "희생플라이", "희생번트", "기록일시"]
+PITCHING_HEADERS = ["기록ID", "경기ID", "선수ID", "선수명",
+                    "이닝", "피안타", "실점", "자책", "볼넷", "삼진", "피홈런",
+                    "승", "패", "세이브", "기록일시"]
+ATTENDANCE_HEADERS = ["기록ID", "경기ID", "경기일", "선수ID", "선수명", "참석여부", "사유", "기록일시"]
+
+# 시트별 컬럼 타입 (로드 시 한 번만 변환, 선언하지 않은 컬럼은 문자열)
+# int: 정수(빈 값은 0) / float: 실수 / category: 범주형 / date: 날짜(잘못된 값은 NaT)
+_AT_BAT_COUNT_COLUMNS = ["이닝", "타순", "타점", "득점", "도루", "도실",
+                         "볼넷", "삼진", "사구", "희생플라이", "희생번트"]
+_PITCHING_COUNT_COLUMNS = ["피안타", "실점", "자책", "볼넷", "삼진", "피홈런", "승", "패", "세이브"]
+TABLE_SCHEMAS = {
+    SHEET_PLAYERS: {"선수ID": "category", "등번호": "int", "포지션": "category", "투타": "category"},
+    SHEET_GAMES: {"경기ID": "category", "날짜": "date", "홈/원정": "category",
+                  "우리점수": "int", "상대점수": "int", "결과": "category"},
+    SHEET_AT_BATS: {"경기ID": "category", "선수ID": "category", "결과": "category", "안타종류": "category",
+                    **{column: "int" for column in _AT_BAT_COUNT_COLUMNS}},
+    SHEET_PITCHING: {"경기ID": "category", "선수ID": "category", "이닝": "float",
+                     **{column: "int" for column in _PITCHING_COUNT_COLUMNS}},
+    SHEET_ATTENDANCE: {"경기ID": "category", "경기일": "date", "선수ID": "category", "참석여부": "category"},
+}
+
+# 추가(append)만 일어나는 시트 - 마지막으로 읽은 이후 추가된 행만 가져옴
+APPEND_ONLY_SHEETS = (SHEET_AT_BATS, SHEET_ATTENDANCE)
+
+# 전체 시트 (스냅샷 로드 순서)
+ALL_SHEETS = {
+    SHEET_PLAYERS: PLAYERS_HEADERS,
+    SHEET_GAMES: GAMES_HEADERS,
+    SHEET_AT_BATS: AT_BATS_HEADERS,
+    SHEET_PITCHING: PITCHING_HEADERS,
+    SHEET_ATTENDANCE: ATTENDANCE_HEADERS,
+}
+
+
+def game_result(our_score: int, their_score: int) -> str:
+    """점수로 경기 결과(승/패/무) 판정"""
+    if our_score > their_score:
+        return "승"
+    elif our_score < their_score:
+        return "패"
+    return "무"
+
+
+def values_to_frame(values: list, headers: list) -> pd.DataFrame:
+    """시트 값(헤더 행 + 데이터 행)을 DataFrame으로 변환 (get_all_records와 동일한 숫자 변환)"""
+    if not values:
+        return pd.DataFrame(columns=headers)
+    sheet_headers = values[0] or headers
+    width = len(sheet_headers)
+    records = []
+    for row in values[1:]:
+        row = (list(row) + [""] * width)[:width]
+        records.append(gspread.utils.numericise_all(row, empty2zero=False, default_blank=""))
+    return pd.DataFrame(records, columns=sheet_headers)
+
+
+def apply_schema(df: pd.DataFrame, title: str) -> pd.DataFrame:
+    """TABLE_SCHEMAS에 따라 컬럼 타입 변환 (이미 맞는 타입이면 그대로 둠)"""
+    schema = TABLE_SCHEMAS.get(title)
+    if schema is None:
+        return df
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        kind = schema.get(column, "str")
+        if kind == "int":
+            if not pd.api.types.is_integer_dtype(series):
+                series = pd.to_numeric(series, errors='coerce').fillna(0).astype('int64')
+        elif kind == "float":
+            if not pd.api.types.is_float_dtype(series):
+                series = pd.to_numeric(series, errors='coerce').fillna(0.0).astype('float64')
+        elif kind == "category":
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.fillna("").astype(str).astype('category')
+        elif kind == "date":
+            if not pd.api.types.is_datetime64_any_dtype(series):
+                series = pd.to_datetime(series.fillna("").astype(str), errors='coerce', format='mixed')
+        elif not pd.api.types.is_string_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            series = series.fillna("").astype(str)
+        columns[column] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def format_date(value) -> str:
+    """날짜 컬럼 값을 YYYY-MM-DD 문자열로 (NaT/빈 값은 빈 문자열)"""
+    if value is None or pd.isna(value):
+        return ""
+    if hasattr(value, 'strftime'):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def _pad_row(row: list, width: int) -> list:
+    """시트 행을 헤더 너비에 맞춤 (API는 끝의 빈 셀을 생략함)"""
+    return ([str(value) for value in row] + [""] * width)[:width]
+
+
+def _pad_values(values: list, headers: list) -> list:
+    """시트 값 전체를 직사각형으로 맞춤 (너비는 시트 헤더 행 기준)"""
+    if not values:
+        return [list(headers)]
+    width = len(values[0]) or len(headers)
+    return [_pad_row(row, width) for row in values]
+
+
+# ID 발급 시각 (프로세스 안에서 단조 증가, 마이크로초)
+_id_lock = threading.Lock()
+_last_id_micros = 0
+
+
+def _new_ids(prefix: str, count: int = 1) -> list:
+    """접두어 + 발급 시각(YYYYmmddHHMMSS + 마이크로초 6자리) ID count개
+
+    같은 마이크로초에 여러 개를 발급하거나 같은 초에 배치를 여러 번 등록해도 겹치지 않도록
+    프로세스 안에서 발급 시각을 1마이크로초씩 앞으로 밀어 항상 증가시킨다.
+    """
+    global _last_id_micros
+    with _id_lock:
+        start = max(time.time_ns() // 1000, _last_id_micros + 1)
+        _last_id_micros = start + count - 1
+    seconds = {}
+    ids = []
+    for micros in range(start, start + count):
+        second, fraction = divmod(micros, 1_000_000)
+        if second not in seconds:
+            seconds[second] = datetime.fromtimestamp(second).strftime('%Y%m%d%H%M%S')
+        ids.append(f"{prefix}{seconds[second]}{fraction:06d}")
+    return ids
+
+
+def filter_records(df: pd.DataFrame, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+    """경기ID/선수ID 조건으로 기록 필터링"""
+    if game_id and len(df) > 0:
+        df = df[df['경기ID'] == game_id]
+    if player_id and len(df) > 0:
+        df = df[df['선수ID'] == player_id]
+    return df
+
+
+def attendance_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """참석 기록 DataFrame에서 선수별 참석률 통계 계산"""
+    if len(df) == 0:
+        return pd.DataFrame(columns=['선수명', '총경기', '참석', '불참', '참석률'])
+
+    stats = df.groupby(['선수ID', '선수명'], observed=True).agg(
+        총경기=('기록ID', 'count'),
+        참석=('참석여부', lambda x: (x == '참석').sum())
+    ).reset_index()
+    stats['불참'] = stats['총경기'] - stats['참석']
+    stats['참석률'] = (stats['참석'] / stats['총경기'] * 100).round(1)
+    return stats[['선수명', '총경기', '참석', '불참', '참석률']].sort_values('참석률', ascending=False)
+
+
+class WriteBehindBuffer:
+    """단건 쓰기를 모아 두었다가 워크시트별 append_rows 한 번으로 전송하는 쓰기 버퍼
+
+    - 대기 행이 flush_size개 이상이거나 가장 오래된 행이 flush_interval초를 넘으면 전송 시점
+    - 전송은 take()로 대기 행을 전송 중으로 옮긴 뒤 버퍼 잠금 밖에서 하고,
+      성공하면 acknowledge(), 실패하면 restore()로 대기열 앞에 되돌려 다음 전송에서 재시도
+    - 전송 중인 행도 전송이 확인될 때까지 len()/pending()에 포함
+    - spool_path를 지정하면 대기 행을 파일에 기록해 프로세스가 재시작되어도 유지
+    """
+
+    def __init__(self, flush_size: int = 50, flush_interval: float = 5.0, spool_path: Optional[str] = None):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self._pending = {}  # 시트 이름 -> 대기 행 리스트
+        self._sending = {}  # 시트 이름 -> 전송 중인 행 리스트
+        self._oldest_at = None
+        self._lock = threading.RLock()
+        self._load_spool()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(rows) for rows in self._pending.values()) + sum(len(rows) for rows in self._sending.values())
+
+    def add(self, title: str, rows: list):
+        """대기열에 행 추가"""
+        with self._lock:
+            self._pending.setdefault(title, []).extend(rows)
+            if self._oldest_at is None:
+                self._oldest_at = time.monotonic()
+            if self.spool_path:
+                with open(self.spool_path, 'a', encoding='utf-8') as f:
+                    for row in rows:
+                        f.write(json.dumps({'title': title, 'row': row}, ensure_ascii=False, default=str) + "\n")
+
+    def is_due(self) -> bool:
+        """크기/시간 기준으로 전송할 때가 되었는지"""
+        return self.seconds_until_due() == 0
+
+    def seconds_until_due(self) -> Optional[float]:
+        """전송 기준까지 남은 시간(초). 대기 행이 없으면 None, 이미 기준을 충족했으면 0"""
+        with self._lock:
+            if not self._pending:
+                return None
+            if sum(len(rows) for rows in self._pending.values()) >= self.flush_size:
+                return 0.0
+            return max(0.0, self.flush_interval - (time.monotonic() - self._oldest_at))
+
+    def pending(self, title: str) -> list:
+        """시트의 대기 행 (전송 중인 행 포함, 복사본, 추가 순서)"""
+        with self._lock:
+            return self._sending.get(title, []) + self._pending.get(title, [])
+
+    def take(self) -> dict:
+        """대기 행을 전송 중으로 옮기고 전송할 {시트 이름: 행 리스트} 반환"""
+        with self._lock:
+            for title, rows in self._pending.items():
+                self._sending.setdefault(title, []).extend(rows)
+            self._pending = {}
+            self._oldest_at = None
+            return {title: list(rows) for title, rows in self._sending.items()}
+
+    def acknowledge(self, title: str):
+        """전송이 확인된 시트의 행을 버퍼(와 스풀)에서 제거"""
+        with self._lock:
+            self._sending.pop(title, None)
+            self._rewrite_spool()
+
+    def restore(self, title: str):
+        """전송에 실패한 시트의 행을 대기열 앞에 되돌림 (다음 전송에서 재시도)"""
+        with self._lock:
+            rows = self._sending.pop(title, [])
+            if rows:
+                self._pending[title] = rows + self._pending.get(title, [])
+                if self._oldest_at is None:
+                    self._oldest_at = time.monotonic()
+
+    def _load_spool(self):
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return
+        with open(self.spool_path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._pending.setdefault(entry['title'], []).append(entry['row'])
+        if self._pending:
+            self._oldest_at = time.monotonic()
+
+    def _rewrite_spool(self):
+        if not self.spool_path:
+            return
+        if not self._pending and not self._sending:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            return
+        tmp_path = self.spool_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for title, rows in [*self._sending.items(), *self._pending.items()]:
+                for row in rows:
+                    f.write(json.dumps({'title': title, 'row': row}, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp_path, self.spool_path)
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, per_minute: int, burst: Optional[int] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst if burst is not None else per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개 확보. 부족하면 채워질 때까지 대기
+
+        Returns:
+            대기한 시간(초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1  # 음수면 선점한 만큼 기다림
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class QuotaLimiter:
+    """Sheets API 할당량(읽기/쓰기 분당 요청 수)에 맞춘 호출 제한 + 재시도
+
+    - 모든 워크시트 호출은 call()을 거쳐 읽기/쓰기 버킷에서 토큰을 받은 뒤 실행
+    - 429(할당량 초과)와 5xx 응답은 지수 백오프(+지터)로 max_retries회까지 재시도
+    - 여러 SheetsDB 인스턴스가 같은 limiter를 공유하면 프로세스 전체 호출량이 제한됨
+    """
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, reads_per_minute: int = 60, writes_per_minute: int = 60,
+                 max_retries: int = 5, backoff_base: float = 1.0, backoff_max: float = 32.0):
+        self._buckets = {'read': TokenBucket(reads_per_minute), 'write': TokenBucket(writes_per_minute)}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._counts = {'calls': 0, 'throttled': 0, 'retried': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counts[key] += 1
+
+    def call(self, kind: str, fn, *args, **kwargs):
+        """할당량 안에서 fn(*args, **kwargs) 실행 (kind: 'read' 또는 'write')"""
+        bucket = self._buckets[kind]
+        method = getattr(fn, '__name__', type(fn).__name__)
+        attempt = 0
+        while True:
+            wait = bucket.acquire()
+            if wait > 0:
+                self._count('throttled')
+            self._count('calls')
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+                METRICS.record_api_call(kind, method, time.perf_counter() - started, wait, row_count(result))
+                return result
+            except gspread.exceptions.APIError as e:
+                METRICS.record_api_call(kind, method, time.perf_counter() - started, wait,
+                                        error=f"APIError {getattr(e, 'code', '')}")
+                if getattr(e, 'code', None) not in self.RETRY_STATUS or attempt >= self.max_retries:
+                    self._count('failed')
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+                logger.warning("Sheets API %s 응답, %.1f초 후 재시도 (%d/%d)",
+                               e.code, delay, attempt + 1, self.max_retries)
+                self._count('retried')
+                attempt += 1
+                time.sleep(delay)
+
+    def stats(self) -> dict:
+        """호출/대기/재시도/실패 횟수"""
+        with self._lock:
+            return dict(self._counts)
+
+
+# 프로세스 공유 limiter (할당량은 서비스 계정 단위이므로 인스턴스끼리 공유)
+DEFAULT_LIMITER = QuotaLimiter()
+
 
 class SheetsDB:
     """Google Sheets 기반 데이터베이스"""
 
-    def __init__(self, credentials_path: Optional[str] = None, spreadsheet_url: Optional[str] = None):
+    # 디스크 스냅샷 저장 지연(초): 이 시간 안의 조회/병합은 백그라운드 저장 한 번으로 묶음
+    SNAPSHOT_DEBOUNCE = 5.0
+    # 원격 변경(시트 직접 수정, 다른 프로세스의 쓰기) 확인 주기(초)
+    REVALIDATE_INTERVAL = 60.0
+
+    def __init__(self, credentials_path: Optional[str] = None, spreadsheet_url: Optional[str] = None,
+                 write_buffer: Optional[WriteBehindBuffer] = None, limiter: Optional[QuotaLimiter] = None,
+                 snapshot_cache: Optional[SnapshotCache] = None):
         self.credentials_path = credentials_path or os.environ.get('GOOGLE_CREDENTIALS_PATH')
         self.spreadsheet_url = spreadsheet_url or os.environ.get('STATZ_SPREADSHEET_URL')
         self._client = None
         self._spreadsheet = None
         self._sheet_cache = {}  # 워크시트 캐싱
+        self._frames = {}       # 시트별 마지막으로 읽은 DataFrame
+        self._raw = {}          # 시트별 마지막으로 읽은 원본 값 (스냅샷 저장/재검증 비교용)
+        self._tail_rows = {}    # 추가 전용 시트: 마지막 행 원본 값 (삭제/수정 감지용)
+        self._versions = {title: 0 for title in ALL_SHEETS}  # 시트별 데이터 버전 (쓰기마다 증가)
+        self._loaded_versions = {}  # 시트별 _frames를 읽었을 때의 버전
+        self._box_scores = BoxScoreTable()  # 타석기록에서 증분 유지하는 경기별 박스스코어
+        self._write_buffer = write_buffer  # None이면 즉시 쓰기
+        self._limiter = limiter or DEFAULT_LIMITER
+        self._snapshot_cache = snapshot_cache  # None이면 디스크 스냅샷 사용 안 함
+        self._connecting = None  # 스냅샷으로 시작한 경우 백그라운드 연결 스레드
+        self._opened = threading.Event()  # 백그라운드 연결의 _open() 종료 (성공/실패 모두)
+        self._revalidated_at = time.monotonic()  # 마지막 원격 변경 확인 시각
+        self._revalidating = threading.Lock()    # 원격 변경 확인 진행 중 (백그라운드 1개만)
+        self._revalidation = None                # 마지막 백그라운드 확인 스레드
+        self._flush_timer = None  # 예약된 쓰기 버퍼 백그라운드 전송
+        self._flushing = threading.Lock()  # 쓰기 버퍼 전송 직렬화 (행 순서 유지)
+        self._flush_error = None  # 마지막 전송 실패 메시지 (성공하면 None)
+        self._flush_timer_lock = threading.Lock()
+        self._snapshot_dirty = set()  # 디스크 스냅샷에 아직 저장하지 않은 시트
+        self._snapshot_timer = None   # 예약된 백그라운드 저장
+        self._snapshot_lock = threading.Lock()       # _snapshot_dirty/_snapshot_timer 보호
+        self._snapshot_save_lock = threading.Lock()  # 저장 직렬화 (파일/meta.json 동시 기록 방지)
+        # 세션(스크립트 스레드)들이 한 인스턴스를 공유하므로 캐시 갱신은 직렬화
+        # 잠금 순서: SheetsDB._lock -> WriteBehindBuffer._lock, SheetsDB._lock -> _snapshot_lock
+        # 스냅샷 저장은 _snapshot_save_lock -> SheetsDB._lock (저장 중에는 SheetsDB._lock을 잡지 않음)
+        self._lock = threading.RLock()
+
+    def _read(self, fn, *args, **kwargs):
+        """읽기 할당량 안에서 API 호출"""
+        return self._limiter.call('read', fn, *args, **kwargs)
+
+    def _write(self, fn, *args, **kwargs):
+        """쓰기 할당량 안에서 API 호출"""
+        return self._limiter.call('write', fn, *args, **kwargs)
+
+    def api_stats(self) -> dict:
+        """API 호출/대기/재시도/실패 횟수"""
+        return self._limiter.stats()
 
     def connect(self):
-        """Google Sheets에 연결"""
+        """Google Sheets에 연결
+
+        디스크 스냅샷이 있으면 그것으로 바로 응답하고, 연결과 재검증은 백그라운드에서 진행한다.
+        """
+        if self._restore_snapshot():
+            self._connecting = threading.Thread(target=self._connect_and_revalidate, daemon=True)
+            self._connecting.start()
+            return
+        self._open()
+        self._ensure_all_sheets()
+
+    def _open(self):
+        """인증 후 스프레드시트 열기"""
         if self.credentials_path and os.path.exists(self.credentials_path):
             creds = Credentials.from_service_account_file(self.credentials_path, scopes=SCOPES)
             self._client = gspread.authorize(creds)
@@ -52,40 +468,422 @@ class SheetsDB:
                 raise ValueError("Google credentials not found.")
 
         if self.spreadsheet_url:
-            self._spreadsheet = self._client.open_by_url(self.spreadsheet_url)
+            self._spreadsheet = self._read(self._client.open_by_url, self.spreadsheet_url)
         else:
             raise ValueError("Spreadsheet URL not set.")
 
+    def _wait_ready(self):
+        """백그라운드 연결의 _open()이 끝날 때까지 대기 (실패했으면 직접 다시 연결)
+
+        스레드 전체(join)가 아니라 _open()만 기다린다. 백그라운드 스레드는 _open() 이후
+        self._lock을 잡으므로, 잠금을 쥔 호출자가 스레드 종료를 기다리면 교착된다.
+        """
+        if self._spreadsheet is not None:
+            return
+        if self._connecting is not None:
+            self._opened.wait()
+        if self._spreadsheet is None:
+            self._open()
+
     def _get_or_create_sheet(self, title: str, headers: list) -> gspread.Worksheet:
         """시트 가져오기 또는 생성 (캐싱)"""
-        if title in self._sheet_cache:
-            return self._sheet_cache[title]
+        self._wait_ready()
+        with self._lock:
+            if title in self._sheet_cache:
+                return self._sheet_cache[title]
+
+            try:
+                worksheet = self._read(self._spreadsheet.worksheet, title)
+            except gspread.WorksheetNotFound:
+                worksheet = self._write(self._spreadsheet.add_worksheet, title=title, rows=1000, cols=len(headers))
+                self._write(worksheet.append_row, headers)
+
+            self._sheet_cache[title] = worksheet
+            return worksheet
+
+    # === 쓰기 ===
+
+    def _append(self, title: str, row: list):
+        """한 행 추가 (쓰기 버퍼가 있으면 대기열에 적재)"""
+        self._append_many(title, [row])
 
+    def _append_many(self, title: str, rows: list):
+        """여러 행 추가 (쓰기 버퍼가 있으면 대기열에 적재하고 전송은 기준 충족 시 백그라운드에서)"""
+        if self._write_buffer is None:
+            self._append_rows_now(title, rows)
+            return
+        self._write_buffer.add(title, rows)
+        with self._lock:
+            # 버전은 캐시 키용으로 증가시키되, 원격에서 읽어 둔 캐시는 그대로 유효하므로
+            # 다시 읽지 않고 조회 시 대기 행을 덧붙인다(_with_pending)
+            fresh = self._loaded_versions.get(title) == self._versions[title]
+            self._versions[title] += 1
+            if fresh:
+                self._loaded_versions[title] = self._versions[title]
+        self._schedule_flush()
+
+    def _append_rows_now(self, title: str, rows: list):
+        self._write(self._get_or_create_sheet(title, ALL_SHEETS[title]).append_rows, rows)
+        self._bump(title)
+
+    def flush(self) -> int:
+        """쓰기 버퍼의 대기 행 전송 (실패 시 기록 후 예외, 행은 대기열에 유지)
+
+        전송(연결 대기, 할당량 대기, 재시도 백오프 포함)은 self._lock 밖에서 한다.
+        보낸 행을 버퍼에서 빼는 것과 시트 버전 증가는 한 잠금 안에서 해서
+        조회가 같은 행을 두 번 보거나(대기 행 + 다시 읽은 시트) 놓치지 않게 한다.
+
+        Returns:
+            전송한 행 수
+        """
+        if self._write_buffer is None:
+            return 0
+        with self._flushing:
+            sent = 0
+            error = None
+            for title, rows in self._write_buffer.take().items():
+                try:
+                    self._write(self._get_or_create_sheet(title, ALL_SHEETS[title]).append_rows, rows)
+                except Exception as e:
+                    self._write_buffer.restore(title)
+                    self._record_flush_failure(title, rows, e)
+                    error = e
+                    continue
+                with self._lock:
+                    self._write_buffer.acknowledge(title)
+                    self._versions[title] += 1  # 원격에 반영됨 -> 다음 조회에서 다시 읽음
+                sent += len(rows)
+            if error is not None:
+                raise error
+            if sent:
+                self._flush_error = None
+            return sent
+
+    def _record_flush_failure(self, title: str, rows: list, error: Exception):
+        """전송 실패를 로그/계측 이벤트로 남기고 last_flush_error()로 노출"""
+        message = f"{type(error).__name__}: {error}"
+        self._flush_error = message
+        logger.warning("쓰기 버퍼 전송 실패 (%s, %d행, 대기열에 보관): %s", title, len(rows), message)
+        METRICS.record_event('flush_error', sheet=title, rows=len(rows), error=message)
+
+    def last_flush_error(self) -> Optional[str]:
+        """마지막 쓰기 버퍼 전송 실패 메시지 (이후 전송에 성공했으면 None)"""
+        return self._flush_error
+
+    def flush_if_due(self):
+        """대기 행이 있으면 전송 기준(크기/시간) 시점에 백그라운드 전송 예약 (호출자는 기다리지 않음)"""
+        self._schedule_flush()
+
+    def _schedule_flush(self, delay: Optional[float] = None):
+        """delay초 뒤(기본: 전송 기준까지 남은 시간) 백그라운드 전송 예약
+
+        예약은 하나만 유지하며, 기존 예약보다 이른 시점이면 교체한다.
+        """
+        if self._write_buffer is None:
+            return
+        if delay is None:
+            delay = self._write_buffer.seconds_until_due()
+            if delay is None:
+                return
+        with self._flush_timer_lock:
+            due_at = time.monotonic() + delay
+            if self._flush_timer is not None:
+                if self._flush_timer.due_at <= due_at:
+                    return
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(delay, self._flush_in_background)
+            self._flush_timer.due_at = due_at
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_in_background(self):
+        with self._flush_timer_lock:
+            if self._flush_timer is threading.current_thread():
+                self._flush_timer = None
         try:
-            worksheet = self._spreadsheet.worksheet(title)
-        except gspread.WorksheetNotFound:
-            worksheet = self._spreadsheet.add_worksheet(title=title, rows=1000, cols=len(headers))
-            worksheet.append_row(headers)
+            self.flush()
+        except Exception:
+            # 실패는 flush()가 기록함. 남은 행은 flush_interval초 뒤 재시도
+            self._schedule_flush(self._write_buffer.flush_interval)
+            return
+        self._schedule_flush()  # 전송 중 새로 쌓인 행
+
+    def pending_writes(self) -> int:
+        """전송 대기 중인 행 수"""
+        return len(self._write_buffer) if self._write_buffer is not None else 0
+
+    def clear_records(self, title: str):
+        """시트의 헤더를 제외한 모든 행 삭제"""
+        self._wait_ready()
+        with self._lock:
+            worksheet = self._get_or_create_sheet(title, ALL_SHEETS[title])
+            if worksheet.row_count > 1:
+                self._write(worksheet.delete_rows, 2, worksheet.row_count)
+            self.invalidate(title)
+
+    # === 조회 ===
+
+    def _ensure_all_sheets(self):
+        """전체 시트 존재 확인 (워크시트 목록 1회 조회 후 없는 시트만 생성)"""
+        self._wait_ready()
+        with self._lock:
+            if all(title in self._sheet_cache for title in ALL_SHEETS):
+                return
+            existing = {worksheet.title: worksheet for worksheet in self._read(self._spreadsheet.worksheets)}
+            for title, headers in ALL_SHEETS.items():
+                if title in existing:
+                    self._sheet_cache.setdefault(title, existing[title])
+                else:
+                    self._get_or_create_sheet(title, headers)
+
+    def load_tables(self, titles: Optional[list] = None) -> dict:
+        """시트별 DataFrame 조회 (버전이 바뀐 시트만 한 번의 batch values 요청으로 다시 읽음)
+
+        요청하지 않은 시트도 버전이 바뀌었으면 같은 요청으로 함께 갱신한다.
+        추가 전용 시트는 이전에 읽은 적이 있으면 마지막 행 이후 범위만 요청한다.
+
+        Returns:
+            {시트 이름: DataFrame}
+        """
+        titles = list(titles or ALL_SHEETS)
+        if any(self._loaded_versions.get(t) != self._versions[t] for t in ALL_SHEETS):
+            self._wait_ready()  # 연결 대기는 잠금 밖에서 (백그라운드 연결 스레드도 self._lock을 잡음)
+        with self._lock:
+            stale = [title for title in ALL_SHEETS if self._loaded_versions.get(title) != self._versions[title]]
+            if stale:
+                self._ensure_all_sheets()
+                versions = {title: self._versions[title] for title in stale}
+                ranges = [self._tail_range(title) if title in APPEND_ONLY_SHEETS and title in self._frames
+                          else f"'{title}'" for title in stale]
+                response = self._read(self._spreadsheet.values_batch_get, ranges)
+                for title, value_range in zip(stale, response.get('valueRanges', [])):
+                    values = value_range.get('values', [])
+                    if title not in APPEND_ONLY_SHEETS or title not in self._frames:
+                        self._remember(title, values)
+                    elif not self._merge_tail(title, values):
+                        self._full_reload(title)
+                    self._loaded_versions[title] = versions[title]
+                self._persist_snapshot(stale)
+            return {title: self._with_pending(title) for title in titles}
+
+    def _with_pending(self, title: str) -> pd.DataFrame:
+        """원격에서 읽어 둔 DataFrame + 아직 전송하지 않은 대기 행 (자기 쓰기 반영, 복사본)"""
+        frame = self._frames[title]
+        rows = self._write_buffer.pending(title) if self._write_buffer is not None else []
+        if not rows:
+            return frame.copy()
+        width = len(ALL_SHEETS[title])
+        pending = values_to_frame([ALL_SHEETS[title]] + [_pad_row(row, width) for row in rows], ALL_SHEETS[title])
+        pending.columns = frame.columns
+        return apply_schema(pd.concat([frame, pending], ignore_index=True), title)
+
+    def load_all(self) -> dict:
+        """전체 시트 스냅샷 ({시트 이름: DataFrame})"""
+        return self.load_tables()
+
+    # === 데이터 버전 ===
+
+    def _bump(self, title: str):
+        with self._lock:
+            self._versions[title] += 1
+
+    def data_version(self, title: str) -> int:
+        """시트 데이터 버전 (캐시 키용)
+
+        이 클라이언트를 거친 쓰기/invalidate마다 증가하고, 원격 변경 확인에서 달라진 시트도 증가한다.
+        마지막 확인 후 REVALIDATE_INTERVAL초가 지났으면 확인을 백그라운드로 시작하므로
+        (프로세스당 주기마다 batch values 요청 1회) 조회 경로는 기다리지 않는다.
+        """
+        self._revalidate_if_due()
+        return self._versions[title]
 
-        self._sheet_cache[title] = worksheet
-        return worksheet
+    # === 원격 변경 확인 ===
+
+    def _revalidate_if_due(self):
+        if self._spreadsheet is None or time.monotonic() - self._revalidated_at < self.REVALIDATE_INTERVAL:
+            return  # 연결 전(백그라운드 연결이 재검증함) 또는 주기 전
+        if not self._revalidating.acquire(blocking=False):
+            return  # 이미 진행 중
+        self._revalidated_at = time.monotonic()
+        self._revalidation = threading.Thread(target=self._revalidate_in_background, daemon=True)
+        self._revalidation.start()
+
+    def _revalidate_in_background(self):
+        try:
+            self.revalidate()
+        except Exception as e:
+            logger.warning("원격 변경 확인 실패 (다음 주기에 재시도): %s", e)
+        finally:
+            self._revalidating.release()
+
+    def revalidate(self) -> list:
+        """전체 시트를 다시 읽어 캐시와 달라진 시트만 교체하고 버전 증가
+
+        읽는 동안 이 클라이언트의 쓰기/조회로 버전이 바뀐 시트는 건너뛴다(다음 조회에서 다시 읽음).
+        네트워크 요청은 self._lock 밖에서 한다.
+
+        Returns:
+            바뀐 시트 이름 목록
+        """
+        self._revalidated_at = time.monotonic()
+        self._ensure_all_sheets()
+        with self._lock:
+            versions = dict(self._versions)
+        titles = list(ALL_SHEETS)
+        response = self._read(self._spreadsheet.values_batch_get, [f"'{title}'" for title in titles])
+        with self._lock:
+            changed = []
+            for title, value_range in zip(titles, response.get('valueRanges', [])):
+                if self._versions[title] != versions[title] or self._loaded_versions.get(title) != versions[title]:
+                    continue
+                values = value_range.get('values', [])
+                if _pad_values(values, ALL_SHEETS[title]) == self._raw.get(title):
+                    continue
+                self._remember(title, values)
+                self._versions[title] += 1
+                self._loaded_versions[title] = self._versions[title]
+                changed.append(title)
+            if SHEET_AT_BATS in changed:
+                self._box_scores.reset()  # 기존 행이 수정/삭제되었을 수 있으므로 다시 쌓음
+            self._persist_snapshot(changed)
+        if changed:
+            logger.info("원격 변경 확인: 변경된 시트 %s", ", ".join(changed))
+        return changed
+
+    # === 증분 동기화 (추가 전용 시트) ===
+
+    def _tail_range(self, title: str) -> str:
+        """마지막으로 읽은 행(겹침 확인용)부터 시트 끝까지의 범위"""
+        last_column = gspread.utils.rowcol_to_a1(1, len(ALL_SHEETS[title])).rstrip("0123456789")
+        last_row = len(self._frames[title]) + 1  # 1행은 헤더
+        return f"'{title}'!A{last_row}:{last_column}"
+
+    def _remember(self, title: str, values: list):
+        """시트 전체 값을 DataFrame으로 변환해 캐시하고 증분 동기화 기준으로 저장"""
+        width = len(ALL_SHEETS[title])
+        self._raw[title] = _pad_values(values, ALL_SHEETS[title])
+        self._frames[title] = apply_schema(values_to_frame(values, ALL_SHEETS[title]), title)
+        self._tail_rows[title] = _pad_row(values[-1], width) if values else _pad_row(ALL_SHEETS[title], width)
+
+    def _merge_tail(self, title: str, values: list) -> bool:
+        """겹침 행 + 새 행을 캐시에 병합. 겹침 행이 달라졌으면(삭제/수정) False"""
+        width = len(ALL_SHEETS[title])
+        if not values or _pad_row(values[0], width) != self._tail_rows[title]:
+            return False
+        new_rows = values[1:]
+        if new_rows:
+            new_frame = values_to_frame([ALL_SHEETS[title]] + new_rows, ALL_SHEETS[title])
+            new_frame.columns = self._frames[title].columns
+            # 범주형 컬럼은 합치면 범주가 달라 object가 되므로 합친 뒤 다시 변환
+            self._frames[title] = apply_schema(pd.concat([self._frames[title], new_frame], ignore_index=True), title)
+            self._raw[title] = self._raw[title] + [_pad_row(row, len(self._raw[title][0])) for row in new_rows]
+            self._tail_rows[title] = _pad_row(new_rows[-1], width)
+        return True
+
+    def _full_reload(self, title: str):
+        """시트 전체를 다시 읽어 증분 동기화 기준 재설정"""
+        values = self._read(self._get_or_create_sheet(title, ALL_SHEETS[title]).get_all_values)
+        self._remember(title, values)
+
+    def invalidate(self, title: Optional[str] = None):
+        """캐시 비우기 + 버전 증가 (시트를 직접 수정한 경우 등, 다음 조회 시 전체 재로드)"""
+        with self._lock:
+            titles = [title] if title else list(ALL_SHEETS)
+            for name in titles:
+                self._frames.pop(name, None)
+                self._raw.pop(name, None)
+                self._tail_rows.pop(name, None)
+                self._loaded_versions.pop(name, None)
+                self._versions[name] += 1
+            if SHEET_AT_BATS in titles:
+                self._box_scores.reset()
+
+    # === 디스크 스냅샷 ===
+
+    def _restore_snapshot(self) -> bool:
+        """디스크 스냅샷으로 전체 시트 캐시 채우기 (모든 시트가 있을 때만)"""
+        if self._snapshot_cache is None:
+            return False
+        snapshot = self._snapshot_cache.load(self.spreadsheet_url)
+        if set(snapshot) != set(ALL_SHEETS):
+            return False
+        with self._lock:
+            for title, values in snapshot.items():
+                self._remember(title, values)
+                self._loaded_versions[title] = self._versions[title]
+        logger.info("디스크 스냅샷으로 시작 (%s)", ", ".join(f"{t} {len(v) - 1}행" for t, v in snapshot.items()))
+        return True
+
+    def _persist_snapshot(self, titles: list):
+        """방금 읽은 시트를 저장 대상으로 표시하고 SNAPSHOT_DEBOUNCE초 뒤 백그라운드 저장 예약
+
+        self._lock을 쥔 채 호출되므로 여기서는 파일을 쓰지 않는다.
+        """
+        if self._snapshot_cache is None or not titles:
+            return
+        with self._snapshot_lock:
+            self._snapshot_dirty.update(titles)
+            if self._snapshot_timer is None:
+                self._snapshot_timer = threading.Timer(self.SNAPSHOT_DEBOUNCE, self.save_snapshot)
+                self._snapshot_timer.daemon = True
+                self._snapshot_timer.start()
+
+    def save_snapshot(self):
+        """저장 대기 중인 시트를 디스크 스냅샷에 바로 저장 (종료 직전 등)
+
+        원본 값 목록은 갱신 시 통째로 교체되므로(_remember/_merge_tail) self._lock 안에서
+        참조만 복사하고, Parquet 기록은 잠금 밖에서 한다.
+        """
+        with self._snapshot_save_lock:
+            with self._snapshot_lock:
+                titles, self._snapshot_dirty = self._snapshot_dirty, set()
+                if self._snapshot_timer is not None:
+                    self._snapshot_timer.cancel()
+                    self._snapshot_timer = None
+            if not titles:
+                return
+            with self._lock:
+                tables = {title: self._raw[title] for title in titles if title in self._raw}
+            self._snapshot_cache.save(self.spreadsheet_url, tables)
+
+    def _connect_and_revalidate(self):
+        """(백그라운드) 연결 후 전체 시트를 다시 읽어 스냅샷과 달라진 시트만 교체"""
+        try:
+            try:
+                self._open()  # self._lock 없이 실행 (_wait_ready가 이 구간만 기다림)
+            finally:
+                self._opened.set()
+            self.revalidate()  # 스냅샷과 달라진 시트만 교체
+        except Exception as e:
+            logger.warning("스냅샷 재검증 실패 (다음 조회 시 다시 연결): %s", e)
 
     # === 선수 관리 ===
 
     def get_players_sheet(self) -> gspread.Worksheet:
-        headers = ["선수ID", "이름", "등번호", "포지션", "투타", "생성일"]
-        return self._get_or_create_sheet(SHEET_PLAYERS, headers)
+        return self._get_or_create_sheet(SHEET_PLAYERS, PLAYERS_HEADERS)
 
     def add_player(self, name: str, number: int, position: str, bat_throw: str) -> str:
-        sheet = self.get_players_sheet()
-        player_id = f"P{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        sheet.append_row([player_id, name, number, position, bat_throw, datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        player_id = _new_ids("P")[0]
+        self._append(SHEET_PLAYERS, [player_id, name, number, position, bat_throw, datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
         return player_id
 
+    def add_players_batch(self, records: list) -> list:
+        """선수 배치 등록 (API 호출 1회)
+
+        Returns:
+            생성된 선수ID 리스트 (records 순서)
+        """
+        if not records:
+            return []
+        created = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ids = _new_ids("P", len(records))
+        rows = [[player_id, r['name'], r['number'], r['position'], r['bat_throw'], created]
+                for player_id, r in zip(ids, records)]
+        self._append_many(SHEET_PLAYERS, rows)
+        return ids
+
     def get_players(self) -> pd.DataFrame:
-        sheet = self.get_players_sheet()
-        data = sheet.get_all_records()
-        return pd.DataFrame(data)
+        return self.load_tables([SHEET_PLAYERS])[SHEET_PLAYERS]
 
     def get_player_by_name(self, name: str) -> Optional[dict]:
         df = self.get_players()
@@ -97,34 +895,37 @@ class SheetsDB:
     # === 경기 관리 ===
 
     def get_games_sheet(self) -> gspread.Worksheet:
-        headers = ["경기ID", "날짜", "상대팀", "홈/원정", "우리점수", "상대점수", "결과", "구장", "메모"]
-        return self._get_or_create_sheet(SHEET_GAMES, headers)
+        return self._get_or_create_sheet(SHEET_GAMES, GAMES_HEADERS)
 
     def add_game(self, date: str, opponent: str, home_away: str,
                  our_score: int, their_score: int, stadium: str = "", memo: str = "") -> str:
-        sheet = self.get_games_sheet()
-        game_id = f"G{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        if our_score > their_score:
-            result = "승"
-        elif our_score < their_score:
-            result = "패"
-        else:
-            result = "무"
-        sheet.append_row([game_id, date, opponent, home_away, our_score, their_score, result, stadium, memo])
+        game_id = _new_ids("G")[0]
+        result = game_result(our_score, their_score)
+        self._append(SHEET_GAMES, [game_id, date, opponent, home_away, our_score, their_score, result, stadium, memo])
         return game_id
 
+    def add_games_batch(self, records: list) -> list:
+        """경기 배치 등록 (API 호출 1회)
+
+        Returns:
+            생성된 경기ID 리스트 (records 순서)
+        """
+        if not records:
+            return []
+        ids = _new_ids("G", len(records))
+        rows = [[game_id, r['date'], r['opponent'], r['home_away'], r['our_score'], r['their_score'],
+                 game_result(r['our_score'], r['their_score']), r.get('stadium', ''), r.get('memo', '')]
+                for game_id, r in zip(ids, records)]
+        self._append_many(SHEET_GAMES, rows)
+        return ids
+
     def get_games(self) -> pd.DataFrame:
-        sheet = self.get_games_sheet()
-        data = sheet.get_all_records()
-        return pd.DataFrame(data)
+        return self.load_tables([SHEET_GAMES])[SHEET_GAMES]
 
     # === 타석 기록 ===
 
     def get_at_bats_sheet(self) -> gspread.Worksheet:
-        headers = ["기록ID", "경기ID", "선수ID", "선수명", "이닝", "타순",
-                   "결과", "안타종류", "타점", "득점", "도루", "도실",
-                   "볼넷", "삼진", "사구", "희생플라이", "희생번트", "기록일시"]
-        return self._get_or_create_sheet(SHEET_AT_BATS, headers)
+        return self._get_or_create_sheet(SHEET_AT_BATS, AT_BATS_HEADERS)
 
     def add_at_bat(self, game_id: str, player_id: str, player_name: str,
                    inning: int, batting_order: int, result: str,
@@ -132,22 +933,19 @@ class SheetsDB:
                    stolen_bases: int = 0, caught_stealing: int = 0,
                    walks: int = 0, strikeouts: int = 0, hit_by_pitch: int = 0,
                    sacrifice_flies: int = 0, sacrifice_bunts: int = 0) -> str:
-        sheet = self.get_at_bats_sheet()
-        record_id = f"AB{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-        sheet.append_row([record_id, game_id, player_id, player_name, inning, batting_order,
-                          result, hit_type, rbis, runs, stolen_bases, caught_stealing,
-                          walks, strikeouts, hit_by_pitch, sacrifice_flies, sacrifice_bunts,
-                          datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        record_id = _new_ids("AB")[0]
+        self._append(SHEET_AT_BATS, [record_id, game_id, player_id, player_name, inning, batting_order,
+                                     result, hit_type, rbis, runs, stolen_bases, caught_stealing,
+                                     walks, strikeouts, hit_by_pitch, sacrifice_flies, sacrifice_bunts,
+                                     datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
         return record_id
 
     def add_at_bats_batch(self, records: list) -> int:
         """타석 기록 배치 추가 (API 호출 최소화)"""
         if not records:
             return 0
-        sheet = self.get_at_bats_sheet()
         rows = []
-        for r in records:
-            record_id = f"AB{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        for record_id, r in zip(_new_ids("AB", len(records)), records):
             rows.append([
                 record_id, r['game_id'], r['player_id'], r['player_name'],
                 r['inning'], r['batting_order'], r['result'], r['hit_type'],
@@ -156,61 +954,65 @@ class SheetsDB:
                 r['sacrifice_flies'], r['sacrifice_bunts'],
                 datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             ])
-        sheet.append_rows(rows)
+        self._append_many(SHEET_AT_BATS, rows)
         return len(rows)
 
     def get_at_bats(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
-        sheet = self.get_at_bats_sheet()
-        data = sheet.get_all_records()
-        df = pd.DataFrame(data)
-        if game_id and len(df) > 0:
-            df = df[df['경기ID'] == game_id]
-        if player_id and len(df) > 0:
-            df = df[df['선수ID'] == player_id]
-        return df
+        return filter_records(self.load_tables([SHEET_AT_BATS])[SHEET_AT_BATS], game_id, player_id)
+
+    def get_box_scores(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        """경기별 선수 박스스코어 (새로 읽은 타석만 누적 반영)"""
+        with self._lock:
+            box_scores = self._box_scores.sync(self.load_tables([SHEET_AT_BATS])[SHEET_AT_BATS]).frame()
+        return filter_records(box_scores, game_id, player_id)
 
     # === 투구 기록 ===
 
     def get_pitching_sheet(self) -> gspread.Worksheet:
-        headers = ["기록ID", "경기ID", "선수ID", "선수명",
-                   "이닝", "피안타", "실점", "자책", "볼넷", "삼진", "피홈런",
-                   "승", "패", "세이브", "기록일시"]
-        return self._get_or_create_sheet(SHEET_PITCHING, headers)
+        return self._get_or_create_sheet(SHEET_PITCHING, PITCHING_HEADERS)
 
     def add_pitching(self, game_id: str, player_id: str, player_name: str,
                      innings: float, hits: int, runs: int, earned_runs: int,
                      walks: int, strikeouts: int, home_runs: int = 0,
                      win: bool = False, loss: bool = False, save: bool = False) -> str:
-        sheet = self.get_pitching_sheet()
-        record_id = f"P{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-        sheet.append_row([record_id, game_id, player_id, player_name,
-                          innings, hits, runs, earned_runs, walks, strikeouts, home_runs,
-                          1 if win else 0, 1 if loss else 0, 1 if save else 0,
-                          datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        record_id = _new_ids("PT")[0]
+        self._append(SHEET_PITCHING, [record_id, game_id, player_id, player_name,
+                                      innings, hits, runs, earned_runs, walks, strikeouts, home_runs,
+                                      1 if win else 0, 1 if loss else 0, 1 if save else 0,
+                                      datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
         return record_id
 
+    def add_pitching_batch(self, records: list) -> list:
+        """투구 기록 배치 추가 (API 호출 1회)
+
+        Returns:
+            생성된 기록ID 리스트 (records 순서)
+        """
+        if not records:
+            return []
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ids = _new_ids("PT", len(records))
+        rows = [[record_id, r['game_id'], r['player_id'], r['player_name'],
+                 r['innings'], r['hits'], r['runs'], r['earned_runs'], r['walks'], r['strikeouts'],
+                 r.get('home_runs', 0), 1 if r.get('win') else 0, 1 if r.get('loss') else 0,
+                 1 if r.get('save') else 0, recorded]
+                for record_id, r in zip(ids, records)]
+        self._append_many(SHEET_PITCHING, rows)
+        return ids
+
     def get_pitching(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
-        sheet = self.get_pitching_sheet()
-        data = sheet.get_all_records()
-        df = pd.DataFrame(data)
-        if game_id and len(df) > 0:
-            df = df[df['경기ID'] == game_id]
-        if player_id and len(df) > 0:
-            df = df[df['선수ID'] == player_id]
-        return df
+        return filter_records(self.load_tables([SHEET_PITCHING])[SHEET_PITCHING], game_id, player_id)
 
     # === 참석 기록 ===
 
     def get_attendance_sheet(self) -> gspread.Worksheet:
-        headers = ["기록ID", "경기ID", "경기일", "선수ID", "선수명", "참석여부", "사유", "기록일시"]
-        return self._get_or_create_sheet(SHEET_ATTENDANCE, headers)
+        return self._get_or_create_sheet(SHEET_ATTENDANCE, ATTENDANCE_HEADERS)
 
     def add_attendance(self, game_id: str, game_date: str, player_id: str, player_name: str,
                        attended: bool, reason: str = "") -> str:
         """참석 기록 추가"""
-        sheet = self.get_attendance_sheet()
-        record_id = f"ATT{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-        sheet.append_row([
+        record_id = _new_ids("ATT")[0]
+        self._append(SHEET_ATTENDANCE, [
             record_id, game_id, game_date, player_id, player_name,
             "참석" if attended else "불참", reason,
             datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -221,110 +1023,187 @@ class SheetsDB:
         """참석 기록 배치 추가"""
         if not records:
             return 0
-        sheet = self.get_attendance_sheet()
         rows = []
-        for r in records:
-            record_id = f"ATT{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        for record_id, r in zip(_new_ids("ATT", len(records)), records):
             rows.append([
                 record_id, r['game_id'], r['game_date'], r['player_id'], r['player_name'],
                 "참석" if r['attended'] else "불참", r.get('reason', ''),
                 datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             ])
-        sheet.append_rows(rows)
+        self._append_many(SHEET_ATTENDANCE, rows)
         return len(rows)
 
     def get_attendance(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
-        """참석 기록 조회"""
-        sheet = self.get_attendance_sheet()
-        data = sheet.get_all_records()
-        df = pd.DataFrame(data)
-        if game_id and len(df) > 0:
-            df = df[df['경기ID'] == game_id]
-        if player_id and len(df) > 0:
-            df = df[df['선수ID'] == player_id]
-        return df
+        """참석 기록 조회 (새로 추가된 행만 가져와 병합)"""
+        return filter_records(self.load_tables([SHEET_ATTENDANCE])[SHEET_ATTENDANCE], game_id, player_id)
 
     def get_attendance_stats(self) -> pd.DataFrame:
         """선수별 참석률 통계"""
-        df = self.get_attendance()
-        if len(df) == 0:
-            return pd.DataFrame(columns=['선수명', '총경기', '참석', '불참', '참석률'])
-
-        stats = df.groupby(['선수ID', '선수명']).agg(
-            총경기=('기록ID', 'count'),
-            참석=('참석여부', lambda x: (x == '참석').sum())
-        ).reset_index()
-        stats['불참'] = stats['총경기'] - stats['참석']
-        stats['참석률'] = (stats['참석'] / stats['총경기'] * 100).round(1)
-        return stats[['선수명', '총경기', '참석', '불참', '참석률']].sort_values('참석률', ascending=False)
+        return attendance_stats(self.get_attendance())
 
 
 class SheetsDBFromSecrets(SheetsDB):
     """Streamlit Cloud secrets용 Google Sheets 데이터베이스"""
 
-    def __init__(self, credentials_dict: dict, spreadsheet_url: str):
-        super().__init__()
+    def __init__(self, credentials_dict: dict, spreadsheet_url: str,
+                 write_buffer: Optional[WriteBehindBuffer] = None, limiter: Optional[QuotaLimiter] = None,
+                 snapshot_cache: Optional[SnapshotCache] = None):
+        super().__init__(write_buffer=write_buffer, limiter=limiter, snapshot_cache=snapshot_cache)
         self.credentials_dict = credentials_dict
         self.spreadsheet_url = spreadsheet_url
 
-    def connect(self):
-        """Google Sheets에 연결 (secrets 사용)"""
+    def _open(self):
+        """인증 후 스프레드시트 열기 (secrets 사용)"""
         creds = Credentials.from_service_account_info(self.credentials_dict, scopes=SCOPES)
         self._client = gspread.authorize(creds)
-        self._spreadsheet = self._client.open_by_url(self.spreadsheet_url)
+        self._spreadsheet = self._read(self._client.open_by_url, self.spreadsheet_url)
+
+
+class ColumnBuffer:
+    """헤더 순서의 컬럼별 리스트에 행을 이어 붙이는 추가 전용 테이블
+
+    DataFrame은 조회 시점에 버전이 바뀌었을 때만 한 번 만든다.
+    반환한 DataFrame은 이후 추가와 무관한 복사본이라 호출자가 수정해도 다른 조회에 영향이 없다.
+    """
+
+    def __init__(self, headers: list, title: Optional[str] = None):
+        self.headers = headers
+        self.title = title  # TABLE_SCHEMAS 키 (타입 변환용)
+        self._columns = [[] for _ in headers]
+        self.version = 0
+        self._frame = None
+        self._frame_version = -1
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    def extend(self, rows: list):
+        """헤더 순서의 행 리스트 추가"""
+        if not rows:
+            return
+        for column, values in zip(self._columns, zip(*rows)):
+            column.extend(values)
+        self.version += 1
+
+    def frame(self) -> pd.DataFrame:
+        if self._frame_version != self.version:
+            frame = pd.DataFrame(dict(zip(self.headers, self._columns)), columns=self.headers)
+            self._frame = apply_schema(frame, self.title)
+            self._frame_version = self.version
+        return private_copy(self._frame)
 
 
 class MockSheetsDB:
-    """테스트/데모용 Mock 데이터베이스"""
+    """테스트/데모용 인메모리 데이터베이스
+
+    행은 ColumnBuffer에 추가만 하므로 삽입은 행 수에 비례하고,
+    get_*은 버전당 한 번 만든 DataFrame의 Copy-on-Write 복사본을 돌려준다(수정해도 캐시는 그대로).
+    """
+
+    ID_PREFIXES = {SHEET_PLAYERS: "P", SHEET_GAMES: "G", SHEET_AT_BATS: "AB",
+                   SHEET_PITCHING: "PT", SHEET_ATTENDANCE: "ATT"}
 
     def __init__(self):
-        self.players = pd.DataFrame(columns=["선수ID", "이름", "등번호", "포지션", "투타", "생성일"])
-        self.games = pd.DataFrame(columns=["경기ID", "날짜", "상대팀", "홈/원정", "우리점수", "상대점수", "결과", "구장", "메모"])
-        self.at_bats = pd.DataFrame(columns=["기록ID", "경기ID", "선수ID", "선수명", "이닝", "타순",
-                                              "결과", "안타종류", "타점", "득점", "도루", "도실",
-                                              "볼넷", "삼진", "사구", "희생플라이", "희생번트", "기록일시"])
-        self.pitching = pd.DataFrame(columns=["기록ID", "경기ID", "선수ID", "선수명",
-                                               "이닝", "피안타", "실점", "자책", "볼넷", "삼진", "피홈런",
-                                               "승", "패", "세이브", "기록일시"])
+        self._tables = {title: ColumnBuffer(headers, title) for title, headers in ALL_SHEETS.items()}
+        self._invalidations = {title: 0 for title in ALL_SHEETS}
+        self._box_scores = BoxScoreTable()
+        self._lock = threading.Lock()
 
     def connect(self):
         pass
 
+    def flush(self) -> int:
+        return 0
+
+    def flush_if_due(self):
+        pass
+
+    def pending_writes(self) -> int:
+        return 0
+
+    def last_flush_error(self) -> Optional[str]:
+        return None
+
+    def _insert(self, title: str, build_rows) -> list:
+        """ID를 발급해 build_rows(ids)가 만든 행들을 추가하고 ID 목록 반환"""
+        with self._lock:
+            table = self._tables[title]
+            start = len(table) + 1
+            rows = build_rows(lambda i: f"{self.ID_PREFIXES[title]}{start + i:03d}")
+            table.extend(rows)
+            return [row[0] for row in rows]
+
+    def _frame(self, title: str) -> pd.DataFrame:
+        with self._lock:
+            return self._tables[title].frame()
+
+    def load_tables(self, titles: Optional[list] = None) -> dict:
+        """테이블별 DataFrame 조회 (호출자별 복사본)"""
+        return {title: self._frame(title) for title in (titles or ALL_SHEETS)}
+
+    def load_all(self) -> dict:
+        """전체 테이블 스냅샷"""
+        return self.load_tables()
+
+    def data_version(self, title: str) -> int:
+        with self._lock:
+            return self._tables[title].version + self._invalidations[title]
+
+    def invalidate(self, title: Optional[str] = None):
+        with self._lock:
+            for name in ([title] if title else ALL_SHEETS):
+                self._invalidations[name] += 1
+
+    def clear_records(self, title: str):
+        """테이블의 모든 행 삭제 (버전은 계속 증가하도록 이전 버전을 보존)"""
+        with self._lock:
+            self._invalidations[title] += self._tables[title].version + 1
+            self._tables[title] = ColumnBuffer(ALL_SHEETS[title], title)
+            if title == SHEET_AT_BATS:
+                self._box_scores.reset()
+
+    # === 선수 관리 ===
+
     def add_player(self, name: str, number: int, position: str, bat_throw: str) -> str:
-        player_id = f"P{len(self.players) + 1:03d}"
-        new_row = pd.DataFrame([{"선수ID": player_id, "이름": name, "등번호": number,
-                                  "포지션": position, "투타": bat_throw,
-                                  "생성일": datetime.now().strftime("%Y-%m-%d")}])
-        self.players = pd.concat([self.players, new_row], ignore_index=True)
-        return player_id
+        return self.add_players_batch([{'name': name, 'number': number,
+                                        'position': position, 'bat_throw': bat_throw}])[0]
+
+    def add_players_batch(self, records: list) -> list:
+        created = datetime.now().strftime("%Y-%m-%d")
+        return self._insert(SHEET_PLAYERS, lambda new_id: [
+            [new_id(i), r['name'], r['number'], r['position'], r['bat_throw'], created]
+            for i, r in enumerate(records)
+        ])
 
     def get_players(self) -> pd.DataFrame:
-        return self.players.copy()
+        return self._frame(SHEET_PLAYERS)
 
     def get_player_by_name(self, name: str) -> Optional[dict]:
-        matches = self.players[self.players['이름'] == name]
+        players = self.get_players()
+        matches = players[players['이름'] == name]
         if len(matches) > 0:
             return matches.iloc[0].to_dict()
         return None
 
+    # === 경기 관리 ===
+
     def add_game(self, date: str, opponent: str, home_away: str,
                  our_score: int, their_score: int, stadium: str = "", memo: str = "") -> str:
-        game_id = f"G{len(self.games) + 1:03d}"
-        if our_score > their_score:
-            result = "승"
-        elif our_score < their_score:
-            result = "패"
-        else:
-            result = "무"
-        new_row = pd.DataFrame([{"경기ID": game_id, "날짜": date, "상대팀": opponent,
-                                  "홈/원정": home_away, "우리점수": our_score,
-                                  "상대점수": their_score, "결과": result,
-                                  "구장": stadium, "메모": memo}])
-        self.games = pd.concat([self.games, new_row], ignore_index=True)
-        return game_id
+        return self.add_games_batch([{'date': date, 'opponent': opponent, 'home_away': home_away,
+                                      'our_score': our_score, 'their_score': their_score,
+                                      'stadium': stadium, 'memo': memo}])[0]
+
+    def add_games_batch(self, records: list) -> list:
+        return self._insert(SHEET_GAMES, lambda new_id: [
+            [new_id(i), r['date'], r['opponent'], r['home_away'], r['our_score'], r['their_score'],
+             game_result(r['our_score'], r['their_score']), r.get('stadium', ''), r.get('memo', '')]
+            for i, r in enumerate(records)
+        ])
 
     def get_games(self) -> pd.DataFrame:
-        return self.games.copy()
+        return self._frame(SHEET_GAMES)
+
+    # === 타석 기록 ===
 
     def add_at_bat(self, game_id: str, player_id: str, player_name: str,
                    inning: int, batting_order: int, result: str,
@@ -332,44 +1211,79 @@ class MockSheetsDB:
                    stolen_bases: int = 0, caught_stealing: int = 0,
                    walks: int = 0, strikeouts: int = 0, hit_by_pitch: int = 0,
                    sacrifice_flies: int = 0, sacrifice_bunts: int = 0) -> str:
-        record_id = f"AB{len(self.at_bats) + 1:03d}"
-        new_row = pd.DataFrame([{"기록ID": record_id, "경기ID": game_id, "선수ID": player_id,
-                                  "선수명": player_name, "이닝": inning, "타순": batting_order,
-                                  "결과": result, "안타종류": hit_type, "타점": rbis, "득점": runs,
-                                  "도루": stolen_bases, "도실": caught_stealing,
-                                  "볼넷": walks, "삼진": strikeouts, "사구": hit_by_pitch,
-                                  "희생플라이": sacrifice_flies, "희생번트": sacrifice_bunts,
-                                  "기록일시": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}])
-        self.at_bats = pd.concat([self.at_bats, new_row], ignore_index=True)
-        return record_id
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert(SHEET_AT_BATS, lambda new_id: [
+            [new_id(0), game_id, player_id, player_name, inning, batting_order,
+             result, hit_type, rbis, runs, stolen_bases, caught_stealing,
+             walks, strikeouts, hit_by_pitch, sacrifice_flies, sacrifice_bunts, recorded]
+        ])[0]
+
+    def add_at_bats_batch(self, records: list) -> int:
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return len(self._insert(SHEET_AT_BATS, lambda new_id: [
+            [new_id(i), r['game_id'], r['player_id'], r['player_name'],
+             r['inning'], r['batting_order'], r['result'], r['hit_type'],
+             r['rbis'], r['runs'], r['stolen_bases'], r['caught_stealing'],
+             r['walks'], r['strikeouts'], r['hit_by_pitch'],
+             r['sacrifice_flies'], r['sacrifice_bunts'], recorded]
+            for i, r in enumerate(records)
+        ]))
 
     def get_at_bats(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
-        df = self.at_bats.copy()
-        if game_id and len(df) > 0:
-            df = df[df['경기ID'] == game_id]
-        if player_id and len(df) > 0:
-            df = df[df['선수ID'] == player_id]
-        return df
+        return filter_records(self._frame(SHEET_AT_BATS), game_id, player_id)
+
+    def get_box_scores(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        with self._lock:
+            at_bats = self._tables[SHEET_AT_BATS].frame()
+            box_scores = self._box_scores.sync(at_bats).frame()
+        return filter_records(box_scores, game_id, player_id)
+
+    # === 투구 기록 ===
 
     def add_pitching(self, game_id: str, player_id: str, player_name: str,
                      innings: float, hits: int, runs: int, earned_runs: int,
                      walks: int, strikeouts: int, home_runs: int = 0,
                      win: bool = False, loss: bool = False, save: bool = False) -> str:
-        record_id = f"PT{len(self.pitching) + 1:03d}"
-        new_row = pd.DataFrame([{"기록ID": record_id, "경기ID": game_id, "선수ID": player_id,
-                                  "선수명": player_name, "이닝": innings, "피안타": hits,
-                                  "실점": runs, "자책": earned_runs, "볼넷": walks,
-                                  "삼진": strikeouts, "피홈런": home_runs,
-                                  "승": 1 if win else 0, "패": 1 if loss else 0,
-                                  "세이브": 1 if save else 0,
-                                  "기록일시": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}])
-        self.pitching = pd.concat([self.pitching, new_row], ignore_index=True)
-        return record_id
+        return self.add_pitching_batch([{
+            'game_id': game_id, 'player_id': player_id, 'player_name': player_name,
+            'innings': innings, 'hits': hits, 'runs': runs, 'earned_runs': earned_runs,
+            'walks': walks, 'strikeouts': strikeouts, 'home_runs': home_runs,
+            'win': win, 'loss': loss, 'save': save
+        }])[0]
+
+    def add_pitching_batch(self, records: list) -> list:
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert(SHEET_PITCHING, lambda new_id: [
+            [new_id(i), r['game_id'], r['player_id'], r['player_name'],
+             r['innings'], r['hits'], r['runs'], r['earned_runs'], r['walks'], r['strikeouts'],
+             r.get('home_runs', 0), 1 if r.get('win') else 0, 1 if r.get('loss') else 0,
+             1 if r.get('save') else 0, recorded]
+            for i, r in enumerate(records)
+        ])
 
     def get_pitching(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
-        df = self.pitching.copy()
-        if game_id and len(df) > 0:
-            df = df[df['경기ID'] == game_id]
-        if player_id and len(df) > 0:
-            df = df[df['선수ID'] == player_id]
-        return df
+        return filter_records(self._frame(SHEET_PITCHING), game_id, player_id)
+
+    # === 참석 기록 ===
+
+    def add_attendance(self, game_id: str, game_date: str, player_id: str, player_name: str,
+                       attended: bool, reason: str = "") -> str:
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert(SHEET_ATTENDANCE, lambda new_id: [
+            [new_id(0), game_id, game_date, player_id, player_name,
+             "참석" if attended else "불참", reason, recorded]
+        ])[0]
+
+    def add_attendance_batch(self, records: list) -> int:
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return len(self._insert(SHEET_ATTENDANCE, lambda new_id: [
+            [new_id(i), r['game_id'], r['game_date'], r['player_id'], r['player_name'],
+             "참석" if r['attended'] else "불참", r.get('reason', ''), recorded]
+            for i, r in enumerate(records)
+        ]))
+
+    def get_attendance(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        return filter_records(self._frame(SHEET_ATTENDANCE), game_id, player_id)
+
+    def get_attendance_stats(self) -> pd.DataFrame:
+        return attendance_stats(self.get_attendance())
@@ -0,0 +1,212 @@
+"""
+경기 시뮬레이션 엔진 모듈
+여러 경기를 배열의 레인(lane)으로 동시에 진행하는 NumPy 몬테카를로 시뮬레이터
+주자 진루 규칙은 simulate_*.py 스크립트와 동일
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from distributions import as_distribution
+from events import DOUBLE, HIT_BY_PITCH, HOME_RUN, OUTCOME_COUNT, SAC_BUNT, SAC_FLY, SINGLE, TRIPLE, WALK
+
+LINEUP_SIZE = 9
+INNINGS = 9
+
+# 상대팀 이닝별 득점 분포 (스크립트의 random.choices([0,0,0,0,1,1,2,3], weights=[40,20,15,10,8,4,2,1]))
+OPPONENT_RUN_VALUES = np.array([0, 1, 2, 3])
+OPPONENT_RUN_PROBS = np.array([85, 12, 2, 1]) / 100
+
+# 단타 도루 시도 확률 / 도루 성공 시 도루자 기록 확률 (스크립트와 동일)
+STEAL_ATTEMPT_RATE = 0.15
+CAUGHT_STEALING_RATE = 0.3
+
+BASE_STATES = 8  # 주자 상황 비트마스크 (1루=1, 2루=2, 3루=4)
+
+
+def _advance(bases: int, outcome: int):
+    """주자 상황 + 타석 결과 -> (다음 주자 상황, 득점, 아웃 증가)"""
+    r0, r1, r2 = bases & 1, (bases >> 1) & 1, (bases >> 2) & 1
+    if outcome == SINGLE:
+        # 3루/2루 주자 득점, 1루 주자 2루로
+        return 1 | (r0 << 1), r1 + r2, 0
+    if outcome == DOUBLE:
+        return 2 | (r0 << 2), r1 + r2, 0
+    if outcome == TRIPLE:
+        return 4, r0 + r1 + r2, 0
+    if outcome == HOME_RUN:
+        return 0, r0 + r1 + r2 + 1, 0
+    if outcome in (WALK, HIT_BY_PITCH):
+        if bases == 7:
+            return 7, 1, 0
+        return 1 | ((r1 | r0) << 1) | ((r2 | (r1 & r0)) << 2), 0, 0
+    if outcome == SAC_FLY:
+        return bases & 3, r2, 1
+    if outcome == SAC_BUNT:
+        return (r0 << 1) | (r1 << 2), r2, 1
+    return bases, 0, 1  # 아웃/삼진: 주자 그대로
+
+
+def transition_table():
+    """주자 상황(8) x 결과 코드 -> (다음 주자 상황, 득점, 아웃 증가) 조회 테이블 3개"""
+    next_bases = np.zeros((BASE_STATES, OUTCOME_COUNT), dtype=np.int8)
+    runs = np.zeros((BASE_STATES, OUTCOME_COUNT), dtype=np.int8)
+    outs = np.zeros((BASE_STATES, OUTCOME_COUNT), dtype=np.int8)
+    for bases in range(BASE_STATES):
+        for outcome in range(OUTCOME_COUNT):
+            next_bases[bases, outcome], runs[bases, outcome], outs[bases, outcome] = _advance(bases, outcome)
+    return next_bases, runs, outs
+
+
+NEXT_BASES, RUNS_SCORED, OUTS_ADDED = transition_table()
+
+
+@dataclass
+class SimulationResult:
+    """시뮬레이션 결과 (경기별 득점 + 타순별 누적 기록)"""
+    runs: np.ndarray                    # 경기별 우리 득점
+    opponent_runs: np.ndarray           # 경기별 상대 득점
+    slot_counts: np.ndarray             # (9, OUTCOME_COUNT) 타순별 결과 코드 개수
+    slot_rbis: np.ndarray               # 타순별 타점
+    events: Optional[dict] = field(default=None, repr=False)  # record=True일 때 타석별 배열
+    game_slot_counts: Optional[np.ndarray] = field(default=None, repr=False)  # (경기, 9, OUTCOME_COUNT)
+
+    @property
+    def games(self) -> int:
+        return len(self.runs)
+
+    @property
+    def plate_appearances(self) -> int:
+        return int(self.slot_counts.sum())
+
+    @property
+    def wins(self) -> int:
+        return int((self.runs > self.opponent_runs).sum())
+
+    @property
+    def losses(self) -> int:
+        return int((self.runs < self.opponent_runs).sum())
+
+    @property
+    def draws(self) -> int:
+        return self.games - self.wins - self.losses
+
+    def runs_per_game(self) -> float:
+        return float(self.runs.mean()) if self.games else 0.0
+
+
+def _rng(seed) -> np.random.Generator:
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def opponent_runs(n_games: int, seed=None, innings: int = INNINGS) -> np.ndarray:
+    """상대팀 경기별 득점 (이닝별 득점 분포의 합)"""
+    rng = _rng(seed)
+    per_inning = rng.choice(OPPONENT_RUN_VALUES, size=(n_games, innings), p=OPPONENT_RUN_PROBS)
+    return per_inning.sum(axis=1)
+
+
+def simulate_games(probabilities, n_games: int, seed=None, innings: int = INNINGS,
+                   record: bool = False, per_game: bool = False, lineups=None) -> SimulationResult:
+    """n_games 경기를 레인 배열로 동시에 시뮬레이션
+
+    모든 경기는 1번 타자부터 시작하므로 k번째 타석의 타순은 경기와 무관하게 k % 9이다.
+    따라서 한 스텝에 진행 중인 모든 레인의 k번째 타석을 같은 타자의 별칭 테이블에서 한 번에 뽑고,
+    주자 상황 전이는 transition_table() 조회로 처리한다. 9이닝을 마친 레인은 배열에서 뺀다.
+
+    Args:
+        probabilities: 타순 9명의 OutcomeDistribution 또는 (9, OUTCOME_COUNT) 확률 (9명 공통이면 OUTCOME_COUNT 길이)
+        n_games: 경기 수
+        seed: 시드 또는 np.random.Generator (같은 시드면 같은 결과)
+        innings: 경기당 공격 이닝 수
+        record: True면 타석별 배열(경기, 이닝, 타순, 결과, 타점, 득점, 도루, 도실)을 events에 담음
+        per_game: True면 경기별 타순별 결과 코드 개수를 game_slot_counts에 담음
+        lineups: (n_games, 9) 경기별 타순의 선수 번호 (probabilities 행 번호).
+            주면 probabilities는 선수 전체의 분포이고, 한 스텝에서 레인마다 다른 선수를 뽑는다.
+            record=True면 events['player']에 타석별 선수 번호를 담음
+
+    Returns:
+        SimulationResult
+    """
+    rng = _rng(seed)
+    distribution = as_distribution(probabilities, LINEUP_SIZE)
+    if lineups is not None:
+        lineups = np.asarray(lineups, dtype=np.intp)
+        if lineups.shape != (n_games, LINEUP_SIZE):
+            raise ValueError(f"lineups는 (경기 수, {LINEUP_SIZE}) 배열이어야 합니다")
+    elif len(distribution) != LINEUP_SIZE:
+        raise ValueError(f"타순은 {LINEUP_SIZE}명이어야 합니다")
+
+    runs = np.zeros(n_games, dtype=np.int64)
+    slot_counts = np.zeros((LINEUP_SIZE, OUTCOME_COUNT), dtype=np.int64)
+    slot_rbis = np.zeros(LINEUP_SIZE, dtype=np.int64)
+    log = {key: [] for key in ('game', 'inning', 'slot', 'outcome', 'rbis')} if record else None
+    game_slot_counts = np.zeros((n_games, LINEUP_SIZE, OUTCOME_COUNT), dtype=np.int32) if per_game else None
+
+    # 진행 중인 레인 상태 (끝난 레인은 제거)
+    lanes = np.arange(n_games)
+    bases = np.zeros(n_games, dtype=np.int8)
+    outs = np.zeros(n_games, dtype=np.int8)
+    inning = np.zeros(n_games, dtype=np.int16)
+    lane_runs = np.zeros(n_games, dtype=np.int64)
+
+    step = 0
+    while len(lanes):
+        slot = step % LINEUP_SIZE
+        players = slot if lineups is None else lineups[lanes, slot]
+        outcome = distribution.sample(players, rng, rng.random(len(lanes)))
+        scored = RUNS_SCORED[bases, outcome]
+        lane_runs += scored
+        outs += OUTS_ADDED[bases, outcome]
+        bases = NEXT_BASES[bases, outcome]
+
+        slot_counts[slot] += np.bincount(outcome, minlength=OUTCOME_COUNT)
+        slot_rbis[slot] += scored.sum()
+        if per_game:
+            game_slot_counts[lanes, slot, outcome] += 1  # 한 스텝에서 레인은 중복되지 않음
+        if record:
+            log['game'].append(lanes)
+            log['inning'].append(inning + 1)
+            log['slot'].append(np.full(len(lanes), slot, dtype=np.int8))
+            log['outcome'].append(outcome)
+            log['rbis'].append(scored)
+
+        # 3아웃: 이닝 교대
+        side_out = outs >= 3
+        if side_out.any():
+            inning += side_out
+            outs[side_out] = 0
+            bases[side_out] = 0
+            done = inning >= innings
+            if done.any():
+                runs[lanes[done]] = lane_runs[done]
+                keep = ~done
+                lanes, bases, outs, inning, lane_runs = (
+                    lanes[keep], bases[keep], outs[keep], inning[keep], lane_runs[keep])
+        step += 1
+
+    events = None
+    if record:
+        events = {key: np.concatenate(values) if values else np.zeros(0, dtype=np.int64)
+                  for key, values in log.items()}
+        order = np.argsort(events['game'], kind='stable')  # 경기별, 타석 순서대로
+        events = {key: values[order] for key, values in events.items()}
+        if lineups is not None:
+            events['player'] = lineups[events['game'], events['slot']]
+        events['runs'] = (events['outcome'] == HOME_RUN).astype(np.int8)  # 타자 본인 득점은 홈런만 기록
+        singles = events['outcome'] == SINGLE
+        attempts = singles & (rng.random(len(singles)) < STEAL_ATTEMPT_RATE)
+        events['stolen_bases'] = (attempts & (rng.integers(0, 2, len(singles)) == 1)).astype(np.int8)
+        events['caught_stealing'] = (
+            (events['stolen_bases'] == 1) & (rng.random(len(singles)) < CAUGHT_STEALING_RATE)).astype(np.int8)
+
+    return SimulationResult(
+        runs=runs,
+        opponent_runs=opponent_runs(n_games, rng, innings),
+        slot_counts=slot_counts,
+        slot_rbis=slot_rbis,
+        events=events,
+        game_slot_counts=game_slot_counts,
+    )
@@ -0,0 +1,110 @@
+"""
+시트 스냅샷 디스크 캐시
+마지막으로 읽은 시트 원본 값을 Parquet 파일로 저장해 두었다가
+프로세스 재시작(재배포) 직후 네트워크 없이 바로 응답하는 데 사용
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = ".statz_snapshot"
+META_FILE = "meta.json"
+
+
+class SnapshotCache:
+    """시트별 원본 값(헤더 행 + 데이터 행, 모두 문자열)을 Parquet으로 보관
+
+    meta.json에 원본 스프레드시트와 시트별 행 수/저장 시각을 기록하며,
+    다른 스프레드시트의 스냅샷이거나 파일이 깨졌으면 없는 것으로 취급한다.
+    캐시는 보조 수단이므로 읽기/쓰기 실패는 경고만 남긴다.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.environ.get('STATZ_SNAPSHOT_DIR', DEFAULT_SNAPSHOT_DIR)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_meta(self) -> dict:
+        try:
+            with open(self._path(META_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, meta: dict):
+        tmp_path = self._path(META_FILE + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._path(META_FILE))
+
+    def load(self, source: str) -> dict:
+        """저장된 스냅샷 읽기
+
+        Args:
+            source: 스프레드시트 URL (저장 시와 다르면 무시)
+
+        Returns:
+            {시트 이름: 원본 값 리스트}. 없으면 빈 dict
+        """
+        meta = self._read_meta()
+        if meta.get('source') != source:
+            return {}
+        snapshot = {}
+        for title, info in meta.get('tables', {}).items():
+            try:
+                frame = pd.read_parquet(self._path(info['file']))
+            except Exception as e:
+                logger.warning("스냅샷 읽기 실패 (%s): %s", title, e)
+                return {}
+            snapshot[title] = [list(frame.columns)] + frame.values.tolist()
+        return snapshot
+
+    def save(self, source: str, tables: dict):
+        """시트별 원본 값 저장 (전달한 시트만 교체)
+
+        Args:
+            source: 스프레드시트 URL
+            tables: {시트 이름: 원본 값 리스트 (첫 행은 헤더)}
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            meta = self._read_meta()
+            if meta.get('source') != source:
+                meta = {'source': source, 'tables': {}}
+            for title, values in tables.items():
+                if not values:
+                    continue
+                file_name = f"{title}.parquet"
+                frame = pd.DataFrame(values[1:], columns=values[0], dtype=str)
+                tmp_path = self._path(file_name + ".tmp")
+                frame.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, self._path(file_name))
+                meta['tables'][title] = {
+                    'file': file_name,
+                    'rows': len(frame),
+                    'saved_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                }
+            self._write_meta(meta)
+        except Exception as e:
+            logger.warning("스냅샷 저장 실패: %s", e)
+
+    def clear(self):
+        """저장된 스냅샷 삭제"""
+        meta = self._read_meta()
+        for info in meta.get('tables', {}).values():
+            try:
+                os.remove(self._path(info['file']))
+            except OSError:
+                pass
+        try:
+            os.remove(self._path(META_FILE))
+        except OSError:
+            pass
@@ -0,0 +1,282 @@
+"""
+스플릿 집계 큐브 모듈
+타석/투구 기록을 (선수, 이닝, 타순, 상대팀, 구장, 홈/원정, 리그) 조합별로 미리 합산해 두고
+차원 값별 역색인(inverted index)으로 조건에 맞는 셀만 골라 롤업
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from events import EVENT_STAT_COLUMNS, OUTCOME_COUNT, counting_columns, encode_at_bats
+from sabermetrics import (
+    BATTING_COUNT_COLUMNS, BATTING_RATE_COLUMNS, PITCHING_COUNT_COLUMNS,
+    SabermetricsCalculator, outs_to_innings, pitching_lines
+)
+
+# 경기 시트에서 가져오는 차원 (차원 이름 -> 경기 컬럼, 리그는 메모에 기록)
+GAME_DIMENSIONS = {'상대팀': '상대팀', '구장': '구장', '홈/원정': '홈/원정', '리그': '메모'}
+
+BATTING_SPLIT_DIMENSIONS = ['선수ID', '이닝', '타순'] + list(GAME_DIMENSIONS)
+PITCHING_SPLIT_DIMENSIONS = ['선수ID'] + list(GAME_DIMENSIONS)
+
+# 경기 시트에 없는 경기의 차원 값
+_NO_GAME = ('',) * len(GAME_DIMENSIONS)
+
+# 값이 정수인 차원 (범위 조건용, 나머지는 문자열)
+_INTEGER_DIMENSIONS = ('이닝', '타순')
+
+
+def _dimension_values(dim: str, values) -> np.ndarray:
+    if dim in _INTEGER_DIMENSIONS:
+        return pd.to_numeric(pd.Series(values), errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    return pd.Series(values, dtype=object).fillna('').astype(str).to_numpy(dtype=object)
+
+
+def game_attributes(games: pd.DataFrame) -> dict:
+    """경기ID -> (상대팀, 구장, 홈/원정, 리그)"""
+    if len(games) == 0:
+        return {}
+    columns = [games[column].astype(object).where(games[column].notna(), '').astype(str)
+               if column in games.columns else pd.Series('', index=games.index)
+               for column in GAME_DIMENSIONS.values()]
+    return dict(zip(games['경기ID'].astype(str), zip(*columns)))
+
+
+class SplitCube(ABC):
+    """차원 조합(셀)별 정수 측정값 합계를 보관하는 희소 큐브
+
+    셀은 기록에 실제로 나타난 차원 조합만 만들며, 차원마다 값 -> 셀 번호 목록(역색인)을 유지한다.
+    query()는 where 조건마다 역색인으로 셀 집합을 구해 교집합을 취한 뒤 by 차원으로 롤업하므로
+    기록 행을 훑지 않는다. sync()는 추가 전용 기록에서 새 행만 셀에 더한다
+    (이미 반영한 경기의 상대팀/구장 등이 바뀌었거나 기록이 수정/삭제되었으면 처음부터 다시 쌓음).
+    """
+
+    dimensions: list = []
+    measures: list = []
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self._levels = {dim: [] for dim in self.dimensions}    # 차원별 값 목록 (코드 = 위치)
+        self._codes = {dim: {} for dim in self.dimensions}     # 차원별 값 -> 코드
+        self._cells = {}                                       # 코드 조합 -> 셀 번호
+        self._coords = {dim: [] for dim in self.dimensions}    # 셀별 차원 코드
+        self._postings = {dim: [] for dim in self.dimensions}  # 차원 코드별 셀 번호 목록 (역색인)
+        self._values = np.zeros((0, len(self.measures)), dtype=np.int64)
+        self._player_names = {}
+        self._game_attrs = {}  # 반영한 경기의 차원 값 (변경 감지용)
+        self._arrays = None    # 조회용 numpy 변환 캐시
+        self.consumed = 0
+        self.last_record_id = None
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    # === 적재 ===
+
+    @abstractmethod
+    def _measure_values(self, records: pd.DataFrame) -> np.ndarray:
+        """기록 행별 측정값 (행 수 x len(measures) 정수 배열)"""
+
+    @abstractmethod
+    def _finish(self, table: pd.DataFrame) -> pd.DataFrame:
+        """롤업 결과(차원 + 측정값 컬럼)에 지표 컬럼 추가"""
+
+    def _encode(self, dim: str, values) -> np.ndarray:
+        """차원 값 -> 코드 (처음 보는 값은 새 코드 발급)"""
+        uniques, inverse = np.unique(_dimension_values(dim, values), return_inverse=True)
+        codes = self._codes[dim]
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, value in enumerate(uniques.tolist()):
+            code = codes.get(value)
+            if code is None:
+                code = len(self._levels[dim])
+                codes[value] = code
+                self._levels[dim].append(value)
+                self._postings[dim].append([])
+            mapping[i] = code
+        return mapping[inverse.ravel()]
+
+    def append(self, records: pd.DataFrame, attributes: dict):
+        """새 기록 행을 셀에 더함 (attributes: game_attributes() 결과)"""
+        if len(records) == 0:
+            return
+        with self._lock:
+            game_ids = records['경기ID'].astype(str).tolist()
+            rows_attrs = [attributes.get(game_id, _NO_GAME) for game_id in game_ids]
+            for game_id, attrs in zip(game_ids, rows_attrs):
+                self._game_attrs.setdefault(game_id, attrs)
+
+            columns = {}
+            for dim in self.dimensions:
+                if dim in GAME_DIMENSIONS:
+                    position = list(GAME_DIMENSIONS).index(dim)
+                    columns[dim] = [attrs[position] for attrs in rows_attrs]
+                else:
+                    columns[dim] = records[dim].to_numpy() if dim in records.columns else np.zeros(len(records))
+            coords = np.column_stack([self._encode(dim, columns[dim]) for dim in self.dimensions])
+
+            # 이번 묶음의 셀 -> 전체 셀 번호
+            local, inverse = np.unique(coords, axis=0, return_inverse=True)
+            inverse = inverse.ravel()
+            cell_ids = np.empty(len(local), dtype=np.int64)
+            for i, key in enumerate(map(tuple, local.tolist())):
+                cell = self._cells.get(key)
+                if cell is None:
+                    cell = len(self._cells)
+                    self._cells[key] = cell
+                    for dim, code in zip(self.dimensions, key):
+                        self._coords[dim].append(code)
+                        self._postings[dim][code].append(cell)
+                cell_ids[i] = cell
+
+            if len(self._cells) > len(self._values):
+                grown = np.zeros((max(len(self._cells), len(self._values) * 2, 16), len(self.measures)), dtype=np.int64)
+                grown[:len(self._values)] = self._values
+                self._values = grown
+            values = self._measure_values(records)
+            for j in range(len(self.measures)):
+                self._values[cell_ids, j] += np.bincount(inverse, weights=values[:, j], minlength=len(local)).astype(np.int64)
+
+            if '선수ID' in records.columns and '선수명' in records.columns:
+                for player_id, name in zip(records['선수ID'].astype(str), records['선수명']):
+                    self._player_names.setdefault(player_id, name)
+            self.consumed += len(records)
+            if '기록ID' in records.columns:
+                self.last_record_id = records['기록ID'].iloc[-1]
+            self._arrays = None
+            self.version += 1
+
+    def sync(self, records: pd.DataFrame, games: pd.DataFrame) -> 'SplitCube':
+        """전체 기록 중 아직 반영하지 않은 뒤쪽 행만 append"""
+        attributes = game_attributes(games)
+        with self._lock:
+            changed = any(attributes.get(game_id, _NO_GAME) != attrs for game_id, attrs in self._game_attrs.items())
+            if self.consumed:
+                last = records['기록ID'].iloc[self.consumed - 1] if len(records) >= self.consumed else None
+                changed = changed or last != self.last_record_id
+            if changed:
+                self.reset()
+            self.append(records.iloc[self.consumed:], attributes)
+        return self
+
+    # === 조회 ===
+
+    def levels(self, dim: str) -> list:
+        """차원에 나타난 값 목록 (정렬)"""
+        return sorted(self._levels[dim])
+
+    def _array_cache(self):
+        if self._arrays is None:
+            self._arrays = (
+                {dim: np.asarray(self._coords[dim], dtype=np.int64) for dim in self.dimensions},
+                {dim: [np.asarray(cells, dtype=np.int64) for cells in self._postings[dim]] for dim in self.dimensions},
+            )
+        return self._arrays
+
+    def _matching_codes(self, dim: str, condition) -> list:
+        """조건(값 / 값 목록 / 값을 받는 함수)에 맞는 차원 코드"""
+        levels = self._levels[dim]
+        if callable(condition):
+            return [code for code, value in enumerate(levels) if condition(value)]
+        values = condition if isinstance(condition, (list, tuple, set)) else [condition]
+        codes = self._codes[dim]
+        return [codes[key] for key in _dimension_values(dim, list(values)).tolist() if key in codes]
+
+    def select(self, where: Optional[dict] = None) -> np.ndarray:
+        """where 조건을 모두 만족하는 셀 번호 (역색인 교집합)"""
+        with self._lock:
+            _, postings = self._array_cache()
+            candidates = []
+            for dim, condition in (where or {}).items():
+                lists = [postings[dim][code] for code in self._matching_codes(dim, condition)]
+                cells = np.unique(np.concatenate(lists)) if len(lists) > 1 else (lists[0] if lists else np.zeros(0, np.int64))
+                candidates.append(cells)
+            if not candidates:
+                return np.arange(len(self._cells), dtype=np.int64)
+            candidates.sort(key=len)
+            result = candidates[0]
+            for cells in candidates[1:]:
+                result = np.intersect1d(result, cells, assume_unique=True)
+            return result
+
+    def query(self, by: Optional[list] = None, where: Optional[dict] = None) -> pd.DataFrame:
+        """where 조건으로 자른 셀을 by 차원별로 롤업한 기록 테이블
+
+        Args:
+            by: 그룹 차원 목록 (없으면 전체 합계 한 행)
+            where: {차원: 값 | 값 목록 | 값을 받아 bool을 돌려주는 함수}
+                   예) {'상대팀': '청룡 베이스볼', '구장': '잠실', '이닝': lambda i: i >= 7}
+
+        Returns:
+            by 차원 컬럼 + 누적 기록 + 지표 컬럼 (by 차원 값 순으로 정렬)
+        """
+        by = list(by or [])
+        with self._lock:
+            coords, _ = self._array_cache()
+            cells = self.select(where)
+            if by:
+                keys = np.column_stack([coords[dim][cells] for dim in by])
+                groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+                inverse = inverse.ravel()
+            else:
+                groups, inverse = np.zeros((1, 0), dtype=np.int64), np.zeros(len(cells), dtype=np.int64)
+            values = self._values[cells]
+            sums = np.column_stack([
+                np.bincount(inverse, weights=values[:, j], minlength=len(groups)).astype(np.int64)
+                for j in range(len(self.measures))
+            ]) if len(self.measures) else np.zeros((len(groups), 0), dtype=np.int64)
+            table = pd.DataFrame({dim: [self._levels[dim][code] for code in groups[:, i]] for i, dim in enumerate(by)})
+            if '선수ID' in by:
+                table.insert(by.index('선수ID') + 1, '선수명',
+                             [self._player_names.get(player_id, '') for player_id in table['선수ID']])
+            for j, measure in enumerate(self.measures):
+                table[measure] = sums[:, j]
+        table = self._finish(table)
+        return table.sort_values(by).reset_index(drop=True) if by else table
+
+
+class BattingSplitCube(SplitCube):
+    """타격 스플릿 큐브 (측정값: 결과 코드 개수 + 타점/득점/도루/도실)"""
+
+    dimensions = BATTING_SPLIT_DIMENSIONS
+    measures = [f'결과{code}' for code in range(OUTCOME_COUNT)] + EVENT_STAT_COLUMNS
+
+    def _measure_values(self, records: pd.DataFrame) -> np.ndarray:
+        log = encode_at_bats(records)
+        values = np.zeros((len(records), len(self.measures)), dtype=np.int64)
+        values[np.arange(len(records)), log.outcome] = 1
+        for j, column in enumerate(EVENT_STAT_COLUMNS):
+            values[:, OUTCOME_COUNT + j] = log.stats[column]
+        return values
+
+    def _finish(self, table: pd.DataFrame) -> pd.DataFrame:
+        counts = table[self.measures[:OUTCOME_COUNT]].to_numpy()
+        stats = {column: table[column].to_numpy() for column in EVENT_STAT_COLUMNS}
+        keys = table.drop(columns=self.measures)
+        table = pd.concat([keys, pd.DataFrame(counting_columns(counts, stats), index=table.index)], axis=1)
+        table = SabermetricsCalculator.add_batting_rates(table)
+        return table[list(keys.columns) + BATTING_COUNT_COLUMNS + BATTING_RATE_COLUMNS]
+
+
+class PitchingSplitCube(SplitCube):
+    """투구 스플릿 큐브 (측정값: 등판 수 + 아웃 + 피안타 ... 세이브)"""
+
+    dimensions = PITCHING_SPLIT_DIMENSIONS
+    measures = ['경기'] + [column for column in PITCHING_COUNT_COLUMNS if column != '이닝']
+
+    def _measure_values(self, records: pd.DataFrame) -> np.ndarray:
+        lines = pitching_lines(records)
+        lines.insert(0, '경기', 1)
+        return lines[self.measures].to_numpy(dtype=np.int64)
+
+    def _finish(self, table: pd.DataFrame) -> pd.DataFrame:
+        table.insert(table.columns.get_loc('아웃') + 1, '이닝', outs_to_innings(table['아웃'].to_numpy()))
+        return SabermetricsCalculator.add_pitching_rates(table)
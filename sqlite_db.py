@@ -0,0 +1,395 @@
+"""
+SQLite 데이터베이스 모듈
+SheetsDB와 동일한 인터페이스로 선수, 경기, 타석, 투구, 참석 기록을 로컬 SQLite 파일에 저장/조회
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+
+from box_scores import BoxScoreTable
+from sheets_db import (
+    SHEET_PLAYERS, SHEET_GAMES, SHEET_AT_BATS, SHEET_PITCHING, SHEET_ATTENDANCE,
+    PLAYERS_HEADERS, GAMES_HEADERS, AT_BATS_HEADERS, PITCHING_HEADERS, ATTENDANCE_HEADERS,
+    apply_schema, filter_records, game_result
+)
+
+# 기본 DB 파일 경로
+DEFAULT_SQLITE_PATH = "statz.db"
+
+# 테이블별 (헤더, ID 컬럼, ID 접두어) - 테이블 이름은 시트 이름과 동일
+TABLES = {
+    SHEET_PLAYERS: (PLAYERS_HEADERS, "선수ID", "P"),
+    SHEET_GAMES: (GAMES_HEADERS, "경기ID", "G"),
+    SHEET_AT_BATS: (AT_BATS_HEADERS, "기록ID", "AB"),
+    SHEET_PITCHING: (PITCHING_HEADERS, "기록ID", "PT"),
+    SHEET_ATTENDANCE: (ATTENDANCE_HEADERS, "기록ID", "ATT"),
+}
+
+# 테이블별 마지막 발급 ID 번호 (행을 지워도 줄지 않아 ID가 재사용되지 않음)
+SEQUENCE_TABLE = "id_sequences"
+
+# 정수/실수 컬럼 (나머지는 TEXT)
+INTEGER_COLUMNS = {
+    "등번호", "우리점수", "상대점수", "타순", "타점", "득점", "도루", "도실",
+    "볼넷", "삼진", "사구", "희생플라이", "희생번트", "피안타", "실점", "자책", "피홈런",
+    "승", "패", "세이브"
+}
+REAL_COLUMNS = {"이닝"}
+
+# 조회 조건에 쓰이는 컬럼 인덱스
+INDEXES = [
+    (SHEET_GAMES, "날짜"),
+    (SHEET_AT_BATS, "경기ID"),
+    (SHEET_AT_BATS, "선수ID"),
+    (SHEET_PITCHING, "경기ID"),
+    (SHEET_PITCHING, "선수ID"),
+    (SHEET_ATTENDANCE, "경기ID"),
+    (SHEET_ATTENDANCE, "선수ID"),
+    (SHEET_ATTENDANCE, "경기일"),
+]
+
+
+def _q(identifier: str) -> str:
+    """SQL 식별자 따옴표 처리 (한글/특수문자 컬럼용)"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _column_type(table: str, column: str) -> str:
+    if column == "이닝" and table == SHEET_AT_BATS:
+        return "INTEGER"  # 타석기록의 이닝은 회차
+    if column in REAL_COLUMNS:
+        return "REAL"
+    if column in INTEGER_COLUMNS:
+        return "INTEGER"
+    return "TEXT"
+
+
+class SqliteDB:
+    """SQLite 기반 로컬 데이터베이스 (SheetsDB와 동일한 메서드 구성)
+
+    필터(경기ID/선수ID)와 참석률 집계는 SQL로 처리하므로
+    시즌 전체 기록이 쌓여도 필요한 행만 읽는다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get('STATZ_SQLITE_PATH', DEFAULT_SQLITE_PATH)
+        self._conn = None
+        self._lock = threading.Lock()
+        self._versions = {table: 0 for table in TABLES}  # 테이블별 데이터 버전 (쓰기마다 증가)
+        self._box_scores = BoxScoreTable()  # 타석기록에서 증분 유지하는 경기별 박스스코어
+        self._box_lock = threading.Lock()   # 박스스코어 동기화 직렬화 (_lock보다 먼저 잡음)
+
+    def connect(self):
+        """DB 파일 열기 및 테이블/인덱스 생성"""
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            for table, (headers, id_column, _) in TABLES.items():
+                columns = []
+                for column in headers:
+                    definition = f"{_q(column)} {_column_type(table, column)}"
+                    if column == id_column:
+                        definition += " PRIMARY KEY"
+                    columns.append(definition)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_q(table)} ({', '.join(columns)})")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {SEQUENCE_TABLE} (name TEXT PRIMARY KEY, last INTEGER NOT NULL)"
+            )
+            for table in TABLES:
+                # 일련번호 테이블이 없던 기존 DB는 rowid 기반으로 발급했던 마지막 번호에서 이어감
+                self._conn.execute(
+                    f"INSERT OR IGNORE INTO {SEQUENCE_TABLE} (name, last) "
+                    f"SELECT ?, COALESCE(MAX(rowid), 0) FROM {_q(table)}", [table]
+                )
+            for table, column in INDEXES:
+                index_name = f"idx_{table}_{column}"
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {_q(index_name)} ON {_q(table)} ({_q(column)})")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # === 내부 헬퍼 ===
+
+    def _next_ids(self, table: str, count: int) -> list:
+        """다음 ID 목록 생성 (단조 증가 일련번호, 쓰기 트랜잭션 안에서 호출)
+
+        clear_records로 행을 지워도 번호가 되돌아가지 않으므로 지운 기록의 ID를 다시 발급하지 않는다.
+        """
+        _, _, prefix = TABLES[table]
+        self._conn.execute(f"UPDATE {SEQUENCE_TABLE} SET last = last + ? WHERE name = ?", [count, table])
+        end = self._conn.execute(f"SELECT last FROM {SEQUENCE_TABLE} WHERE name = ?", [table]).fetchone()[0]
+        return [f"{prefix}{i:03d}" for i in range(end - count + 1, end + 1)]
+
+    def _insert_rows(self, table: str, count: int, build_rows) -> list:
+        """ID를 count개 발급받아 행들을 한 트랜잭션으로 추가하고 ID 목록 반환
+
+        build_rows(ids) -> 헤더 순서의 행 리스트
+        """
+        headers, _, _ = TABLES[table]
+        placeholders = ", ".join("?" for _ in headers)
+        sql = f"INSERT INTO {_q(table)} ({', '.join(_q(h) for h in headers)}) VALUES ({placeholders})"
+        with self._lock, self._conn:
+            ids = self._next_ids(table, count)
+            self._conn.executemany(sql, build_rows(ids))
+            self._versions[table] += 1
+        return ids
+
+    def _select(self, table: str, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        """경기ID/선수ID 조건을 WHERE 절로 내려 조회"""
+        headers, _, _ = TABLES[table]
+        sql = f"SELECT {', '.join(_q(h) for h in headers)} FROM {_q(table)}"
+        conditions = []
+        params = []
+        if game_id:
+            conditions.append(f"{_q('경기ID')} = ?")
+            params.append(game_id)
+        if player_id:
+            conditions.append(f"{_q('선수ID')} = ?")
+            params.append(player_id)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY rowid"
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        return apply_schema(df, table)
+
+    def flush(self) -> int:
+        """즉시 커밋하므로 대기 쓰기 없음 (SheetsDB 인터페이스 호환)"""
+        return 0
+
+    def flush_if_due(self):
+        pass
+
+    def pending_writes(self) -> int:
+        return 0
+
+    def last_flush_error(self) -> Optional[str]:
+        return None
+
+    def load_tables(self, titles: Optional[list] = None) -> dict:
+        """테이블별 DataFrame 조회 ({테이블 이름: DataFrame})"""
+        return {table: self._select(table) for table in (titles or TABLES)}
+
+    def load_all(self) -> dict:
+        """전체 테이블 스냅샷 ({테이블 이름: DataFrame})"""
+        return self.load_tables()
+
+    def data_version(self, title: str) -> int:
+        """테이블 데이터 버전 (캐시 키용)
+
+        이 연결을 거친 쓰기 횟수에 SQLite의 PRAGMA data_version(다른 연결의 커밋마다 증가)을 더한 값.
+        둘 다 단조 증가하므로 데이터가 바뀌면 반드시 값이 커진다.
+        """
+        with self._lock:
+            external = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return self._versions[title] + external
+
+    def clear_records(self, title: str):
+        """테이블의 모든 행 삭제 (SheetsDB.clear_records와 동일, ID 일련번호는 유지)"""
+        with self._box_lock:
+            with self._lock, self._conn:
+                self._conn.execute(f"DELETE FROM {_q(title)}")
+            if title == SHEET_AT_BATS:
+                self._box_scores.reset()  # 삭제와 다음 조회 사이에 이전 박스스코어가 보이지 않도록
+        self.invalidate(title)
+
+    def invalidate(self, title: Optional[str] = None):
+        """버전 증가 (다음 조회 시 캐시를 거치지 않고 다시 읽도록)"""
+        tables = [title] if title else list(TABLES)
+        if SHEET_AT_BATS in tables:
+            with self._box_lock:
+                self._box_scores.reset()
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+    # === 선수 관리 ===
+
+    def add_player(self, name: str, number: int, position: str, bat_throw: str) -> str:
+        created = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert_rows(SHEET_PLAYERS, 1, lambda ids: [
+            [ids[0], name, number, position, bat_throw, created]
+        ])[0]
+
+    def add_players_batch(self, records: list) -> list:
+        """선수 배치 등록 (단일 트랜잭션, 생성된 선수ID 리스트 반환)"""
+        if not records:
+            return []
+        created = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert_rows(SHEET_PLAYERS, len(records), lambda ids: [
+            [player_id, r['name'], r['number'], r['position'], r['bat_throw'], created]
+            for player_id, r in zip(ids, records)
+        ])
+
+    def get_players(self) -> pd.DataFrame:
+        return self._select(SHEET_PLAYERS)
+
+    def get_player_by_name(self, name: str) -> Optional[dict]:
+        sql = f"SELECT * FROM {_q(SHEET_PLAYERS)} WHERE {_q('이름')} = ? ORDER BY rowid LIMIT 1"
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=[name])
+        if len(df) > 0:
+            return apply_schema(df, SHEET_PLAYERS).iloc[0].to_dict()
+        return None
+
+    # === 경기 관리 ===
+
+    def add_game(self, date: str, opponent: str, home_away: str,
+                 our_score: int, their_score: int, stadium: str = "", memo: str = "") -> str:
+        result = game_result(our_score, their_score)
+        return self._insert_rows(SHEET_GAMES, 1, lambda ids: [
+            [ids[0], date, opponent, home_away, our_score, their_score, result, stadium, memo]
+        ])[0]
+
+    def add_games_batch(self, records: list) -> list:
+        """경기 배치 등록 (단일 트랜잭션, 생성된 경기ID 리스트 반환)"""
+        if not records:
+            return []
+        return self._insert_rows(SHEET_GAMES, len(records), lambda ids: [
+            [game_id, r['date'], r['opponent'], r['home_away'], r['our_score'], r['their_score'],
+             game_result(r['our_score'], r['their_score']), r.get('stadium', ''), r.get('memo', '')]
+            for game_id, r in zip(ids, records)
+        ])
+
+    def get_games(self) -> pd.DataFrame:
+        return self._select(SHEET_GAMES)
+
+    # === 타석 기록 ===
+
+    def add_at_bat(self, game_id: str, player_id: str, player_name: str,
+                   inning: int, batting_order: int, result: str,
+                   hit_type: str = "", rbis: int = 0, runs: int = 0,
+                   stolen_bases: int = 0, caught_stealing: int = 0,
+                   walks: int = 0, strikeouts: int = 0, hit_by_pitch: int = 0,
+                   sacrifice_flies: int = 0, sacrifice_bunts: int = 0) -> str:
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert_rows(SHEET_AT_BATS, 1, lambda ids: [
+            [ids[0], game_id, player_id, player_name, inning, batting_order,
+             result, hit_type, rbis, runs, stolen_bases, caught_stealing,
+             walks, strikeouts, hit_by_pitch, sacrifice_flies, sacrifice_bunts, recorded]
+        ])[0]
+
+    def add_at_bats_batch(self, records: list) -> int:
+        """타석 기록 배치 추가 (단일 트랜잭션)"""
+        if not records:
+            return 0
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        def build_rows(ids):
+            return [[
+                record_id, r['game_id'], r['player_id'], r['player_name'],
+                r['inning'], r['batting_order'], r['result'], r['hit_type'],
+                r['rbis'], r['runs'], r['stolen_bases'], r['caught_stealing'],
+                r['walks'], r['strikeouts'], r['hit_by_pitch'],
+                r['sacrifice_flies'], r['sacrifice_bunts'], recorded
+            ] for record_id, r in zip(ids, records)]
+
+        return len(self._insert_rows(SHEET_AT_BATS, len(records), build_rows))
+
+    def get_at_bats(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        return self._select(SHEET_AT_BATS, game_id=game_id, player_id=player_id)
+
+    def _at_bats_after(self, offset: int) -> pd.DataFrame:
+        """rowid 순서로 offset번째 이후의 타석 기록만 조회"""
+        headers, _, _ = TABLES[SHEET_AT_BATS]
+        sql = (f"SELECT {', '.join(_q(h) for h in headers)} FROM {_q(SHEET_AT_BATS)} "
+               f"ORDER BY rowid LIMIT -1 OFFSET ?")
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=[offset])
+        return apply_schema(df, SHEET_AT_BATS)
+
+    def get_box_scores(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        """경기별 선수 박스스코어 (마지막으로 반영한 타석 이후 행만 읽어 누적)"""
+        box = self._box_scores
+        with self._box_lock:
+            consumed = box.consumed
+            if consumed:
+                sql = f"SELECT {_q('기록ID')} FROM {_q(SHEET_AT_BATS)} ORDER BY rowid LIMIT 1 OFFSET ?"
+                with self._lock:
+                    last = self._conn.execute(sql, [consumed - 1]).fetchone()
+                if last is None or last[0] != box.last_record_id:
+                    box.reset()
+                    consumed = 0
+            box.append(self._at_bats_after(consumed))
+        return filter_records(box.frame(), game_id, player_id)
+
+    # === 투구 기록 ===
+
+    def add_pitching(self, game_id: str, player_id: str, player_name: str,
+                     innings: float, hits: int, runs: int, earned_runs: int,
+                     walks: int, strikeouts: int, home_runs: int = 0,
+                     win: bool = False, loss: bool = False, save: bool = False) -> str:
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert_rows(SHEET_PITCHING, 1, lambda ids: [
+            [ids[0], game_id, player_id, player_name,
+             innings, hits, runs, earned_runs, walks, strikeouts, home_runs,
+             1 if win else 0, 1 if loss else 0, 1 if save else 0, recorded]
+        ])[0]
+
+    def add_pitching_batch(self, records: list) -> list:
+        """투구 기록 배치 추가 (단일 트랜잭션, 생성된 기록ID 리스트 반환)"""
+        if not records:
+            return []
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert_rows(SHEET_PITCHING, len(records), lambda ids: [
+            [record_id, r['game_id'], r['player_id'], r['player_name'],
+             r['innings'], r['hits'], r['runs'], r['earned_runs'], r['walks'], r['strikeouts'],
+             r.get('home_runs', 0), 1 if r.get('win') else 0, 1 if r.get('loss') else 0,
+             1 if r.get('save') else 0, recorded]
+            for record_id, r in zip(ids, records)
+        ])
+
+    def get_pitching(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        return self._select(SHEET_PITCHING, game_id=game_id, player_id=player_id)
+
+    # === 참석 기록 ===
+
+    def add_attendance(self, game_id: str, game_date: str, player_id: str, player_name: str,
+                       attended: bool, reason: str = "") -> str:
+        """참석 기록 추가"""
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self._insert_rows(SHEET_ATTENDANCE, 1, lambda ids: [
+            [ids[0], game_id, game_date, player_id, player_name,
+             "참석" if attended else "불참", reason, recorded]
+        ])[0]
+
+    def add_attendance_batch(self, records: list) -> int:
+        """참석 기록 배치 추가 (단일 트랜잭션)"""
+        if not records:
+            return 0
+        recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        def build_rows(ids):
+            return [[
+                record_id, r['game_id'], r['game_date'], r['player_id'], r['player_name'],
+                "참석" if r['attended'] else "불참", r.get('reason', ''), recorded
+            ] for record_id, r in zip(ids, records)]
+
+        return len(self._insert_rows(SHEET_ATTENDANCE, len(records), build_rows))
+
+    def get_attendance(self, game_id: Optional[str] = None, player_id: Optional[str] = None) -> pd.DataFrame:
+        """참석 기록 조회"""
+        return self._select(SHEET_ATTENDANCE, game_id=game_id, player_id=player_id)
+
+    def get_attendance_stats(self) -> pd.DataFrame:
+        """선수별 참석률 통계 (SQL GROUP BY 집계)"""
+        table = _q(SHEET_ATTENDANCE)
+        sql = f"""
+            SELECT {_q('선수명')},
+                   COUNT({_q('기록ID')}) AS {_q('총경기')},
+                   SUM({_q('참석여부')} = '참석') AS {_q('참석')},
+                   COUNT({_q('기록ID')}) - SUM({_q('참석여부')} = '참석') AS {_q('불참')},
+                   ROUND(SUM({_q('참석여부')} = '참석') * 100.0 / COUNT({_q('기록ID')}), 1) AS {_q('참석률')}
+            FROM {table}
+            GROUP BY {_q('선수ID')}, {_q('선수명')}
+            ORDER BY {_q('참석률')} DESC
+        """
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn)
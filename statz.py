@@ -0,0 +1,145 @@
+"""
+statz 명령줄 도구
+python statz.py simulate --team blackmonkeys --games 10000 --seed 42 --backend sqlite
+
+팀 명단으로 경기를 NumPy 시뮬레이터로 생성해 선택한 저장소(Sheets/SQLite/인메모리/Parquet)에
+경기 묶음 단위의 배치 쓰기로 기록한다. 같은 시드면 같은 데이터가 만들어진다.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from rosters import TEAMS, get_team
+from synthetic import BATCH_GAMES, DatabaseSink, ParquetSink, generate_batches
+
+# app.py와 같은 기본 스프레드시트
+DEFAULT_SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1rcWR_qwVAo_PU0ecO4_gVpWjolOq07Uifs0NlqTn5FY/edit"
+
+BACKENDS = ['sheets', 'sqlite', 'memory', 'parquet']
+
+# 경기별 결과를 출력하는 최대 경기 수
+PRINT_GAMES = 20
+
+
+def _open_sink(args, team):
+    """--backend 옵션 -> 저장 대상 (DatabaseSink / ParquetSink)"""
+    if args.backend == 'parquet':
+        return ParquetSink(args.parquet_dir, team, reset=args.reset)
+    if args.backend == 'sqlite':
+        from sqlite_db import SqliteDB
+        db = SqliteDB(args.sqlite_path)
+    elif args.backend == 'memory':
+        from sheets_db import MockSheetsDB
+        db = MockSheetsDB()
+    else:
+        from sheets_db import SheetsDB
+        db = SheetsDB(credentials_path=args.credentials, spreadsheet_url=args.spreadsheet_url)
+    db.connect()
+    return DatabaseSink(db, team, reset=args.reset)
+
+
+def _print_projection(team, seasons: int, games_per_season: int, seed: int):
+    """최적 타순으로 시즌 성적 분포 예측"""
+    from lineup import LineupEvaluator, optimize_lineup
+    from seasons import simulate_seasons
+
+    distribution = team.distribution()
+    best = optimize_lineup(LineupEvaluator(distribution))
+    summary = simulate_seasons(distribution.subset(best.lineup), seasons, games_per_season, seed=seed)
+    print(f"\n=== 시즌 예측 ({seasons:,}시즌 x {games_per_season}경기) ===")
+    print("  최적 타순: " + " - ".join(distribution.names[i] for i in best.lineup))
+    print(f"  경기당 기대 득점: {best.runs:.2f}점 (시뮬레이션 {summary.runs_per_game():.2f}점)")
+    print(f"  시즌 평균 승수: {summary.mean_wins():.2f}승 | 시즌 총득점 표준편차: {summary.season_runs_std():.1f}점")
+
+
+def simulate(args) -> int:
+    team = get_team(args.team)
+    seed = args.seed if args.seed is not None else int(np.random.SeedSequence().entropy % 2**32)
+    start_date = datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+
+    print(f"=== {team.name} {args.games:,}경기 시뮬레이션 (시드 {seed}, 저장소 {args.backend}) ===")
+    started = time.perf_counter()
+    sink = _open_sink(args, team)
+    if sink.new_players:
+        print(f"  선수 {sink.new_players}명 등록")
+
+    wins = losses = games = runs_for = runs_against = at_bats = 0
+    try:
+        for batch in generate_batches(team, args.games, seed, args.batch_games, start_date):
+            sink.write(batch)
+            games += len(batch.games)
+            wins += batch.wins
+            losses += batch.losses
+            runs_for += int(batch.games['our_score'].sum())
+            runs_against += int(batch.games['their_score'].sum())
+            at_bats += len(batch.at_bats)
+            if args.games <= PRINT_GAMES:
+                for game in batch.games.itertuples():
+                    print(f"  {game.game_number}차전 {game.date} vs {game.opponent}: "
+                          f"{game.our_score} - {game.their_score}")
+            else:
+                print(f"  {games:,}/{args.games:,}경기 저장 ({time.perf_counter() - started:.1f}초)")
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - started
+
+    draws = games - wins - losses
+    print("\n" + "=" * 50)
+    print("          시뮬레이션 완료!")
+    print("=" * 50)
+    print(f"\n  시즌 성적: {wins}승 {losses}패 {draws}무")
+    if wins + losses > 0:
+        print(f"  승률: {wins / (wins + losses) * 100:.1f}%")
+    print(f"  총 득점: {runs_for}점 | 총 실점: {runs_against}점")
+    if games:
+        print(f"  평균 득점: {runs_for / games:.1f}점 | 평균 실점: {runs_against / games:.1f}점")
+    print(f"  타석 기록 {at_bats:,}개 | {elapsed:.2f}초")
+    if args.backend == 'parquet':
+        print(f"  Parquet 파일: {os.path.abspath(args.parquet_dir)}")
+    elif args.backend == 'sqlite':
+        print(f"  SQLite 파일: {os.path.abspath(sink.db.path)}")
+
+    if args.project_seasons:
+        _print_projection(team, args.project_seasons, args.games, seed)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='statz', description="statz 명령줄 도구")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sim = commands.add_parser('simulate', help="경기 시뮬레이션 데이터 생성 및 저장")
+    sim.add_argument('--team', choices=sorted(TEAMS), default='blackmonkeys', help="팀 명단")
+    sim.add_argument('--games', type=int, default=10, help="경기 수")
+    sim.add_argument('--seed', type=int, default=None, help="난수 시드 (생략하면 새로 만들어 출력)")
+    sim.add_argument('--backend', choices=BACKENDS, default='sqlite', help="저장소")
+    sim.add_argument('--reset', action='store_true', help="저장 전에 기존 기록 삭제")
+    sim.add_argument('--batch-games', type=int, default=BATCH_GAMES, help="배치 쓰기 1회당 경기 수")
+    sim.add_argument('--start-date', default=None, help="첫 경기 날짜 YYYY-MM-DD (기본: 마지막 경기가 오늘)")
+    sim.add_argument('--sqlite-path', default=None, help="SQLite 파일 (기본: STATZ_SQLITE_PATH 또는 statz.db)")
+    sim.add_argument('--parquet-dir', default='statz_parquet', help="Parquet 출력 폴더")
+    sim.add_argument('--credentials', default=os.environ.get('GOOGLE_CREDENTIALS_PATH', 'credentials.json'),
+                     help="Google 서비스 계정 키 파일")
+    sim.add_argument('--spreadsheet-url', default=os.environ.get('STATZ_SPREADSHEET_URL', DEFAULT_SPREADSHEET_URL),
+                     help="Google 스프레드시트 URL")
+    sim.add_argument('--project-seasons', type=int, default=0,
+                     help="최적 타순으로 --games 경기 시즌을 N번 시뮬레이션해 성적 분포 출력")
+    sim.set_defaults(handler=simulate)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'games', 1) < 1 or getattr(args, 'batch_games', 1) < 1:
+        parser.error("--games와 --batch-games는 1 이상이어야 합니다")
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+합성 데이터 생성 모듈
+팀 명단과 시드로 경기/타석/투구/참석 기록을 NumPy 시뮬레이터로 만들고
+저장소(Sheets/SQLite/인메모리/Parquet)에 경기 묶음 단위로 기록
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from events import HIT_BY_PITCH, OUTCOME_COUNT, SAC_BUNT, SAC_FLY, STRIKEOUT, WALK
+from sheets_db import ALL_SHEETS, SHEET_AT_BATS, SHEET_ATTENDANCE, SHEET_GAMES, SHEET_PITCHING, SHEET_PLAYERS
+from simulation import LINEUP_SIZE, simulate_games
+
+# 결과 코드 -> (결과, 안타종류) (앱 입력 화면과 같은 표기)
+_RESULTS = np.array(["아웃", "안타", "안타", "안타", "안타", "볼넷", "사구", "삼진", "희생플라이", "희생번트"], dtype=object)
+_HIT_TYPES = np.array(["", "1루타", "2루타", "3루타", "홈런", "", "", "", "", ""], dtype=object)
+assert len(_RESULTS) == len(_HIT_TYPES) == OUTCOME_COUNT
+
+ABSENCE_REASONS = np.array(["개인사정", "부상", "업무", ""], dtype=object)
+
+# 한 번에 시뮬레이션/저장하는 경기 수
+BATCH_GAMES = 1000
+
+
+@dataclass
+class SimulatedBatch:
+    """경기 묶음 하나의 기록 (add_*_batch 레코드와 같은 영문 키 + game_number/player_index)
+
+    game_number는 1부터 시작하는 전체 경기 번호, player_index는 팀 명단 순서의 선수 번호.
+    저장소가 경기ID/선수ID를 발급한 뒤 이 번호로 연결한다.
+    """
+    first_game: int
+    games: pd.DataFrame
+    at_bats: pd.DataFrame
+    pitching: pd.DataFrame
+    attendance: pd.DataFrame
+
+    @property
+    def wins(self) -> int:
+        return int((self.games['our_score'] > self.games['their_score']).sum())
+
+    @property
+    def losses(self) -> int:
+        return int((self.games['our_score'] < self.games['their_score']).sum())
+
+
+def _simulate_batch(team, distribution, numbers: np.ndarray, rng, start_date: date) -> SimulatedBatch:
+    count = len(numbers)
+    names = np.asarray(team.names, dtype=object)
+
+    # 경기마다 명단에서 9명을 무작위 타순으로 (스크립트의 random.sample(players_data, 9))
+    lineups = np.argsort(rng.random((count, len(names))), axis=1)[:, :LINEUP_SIZE]
+    result = simulate_games(distribution, count, rng, record=True, lineups=lineups)
+    events = result.events
+
+    dates = [(start_date + timedelta(days=int(n) - 1)).strftime("%Y-%m-%d") for n in numbers]
+    games = pd.DataFrame({
+        'game_number': numbers,
+        'date': dates,
+        'opponent': np.asarray(team.opponents, dtype=object)[(numbers - 1) % len(team.opponents)],
+        'home_away': rng.choice(np.array(["홈", "원정"], dtype=object), count),
+        'our_score': result.runs,
+        'their_score': result.opponent_runs,
+        'stadium': rng.choice(np.asarray(team.stadiums, dtype=object), count),
+        'memo': [f"시뮬레이션 {n}차전" for n in numbers],
+    })
+
+    outcome = events['outcome']
+    at_bats = pd.DataFrame({
+        'game_number': numbers[events['game']],
+        'player_index': events['player'],
+        'player_name': names[events['player']],
+        'inning': events['inning'].astype(np.int64),
+        'batting_order': events['slot'].astype(np.int64) + 1,
+        'result': _RESULTS[outcome],
+        'hit_type': _HIT_TYPES[outcome],
+        'rbis': events['rbis'].astype(np.int64),
+        'runs': events['runs'].astype(np.int64),
+        'stolen_bases': events['stolen_bases'].astype(np.int64),
+        'caught_stealing': events['caught_stealing'].astype(np.int64),
+        'walks': (outcome == WALK).astype(np.int64),
+        'strikeouts': (outcome == STRIKEOUT).astype(np.int64),
+        'hit_by_pitch': (outcome == HIT_BY_PITCH).astype(np.int64),
+        'sacrifice_flies': (outcome == SAC_FLY).astype(np.int64),
+        'sacrifice_bunts': (outcome == SAC_BUNT).astype(np.int64),
+    })
+
+    # 선발 투수 기록 (스크립트와 같은 범위의 난수)
+    their = result.opponent_runs
+    pitcher = rng.choice(np.asarray(team.pitchers), count)
+    pitching = pd.DataFrame({
+        'game_number': numbers,
+        'player_index': pitcher,
+        'player_name': names[pitcher],
+        'innings': rng.choice(np.array([5.0, 6.0, 7.0, 8.0, 9.0]), count),
+        'hits': rng.integers(4, 11, count),
+        'runs': their,
+        'earned_runs': np.maximum(0, their - rng.integers(0, np.minimum(2, their) + 1)),
+        'walks': rng.integers(1, 6, count),
+        'strikeouts': rng.integers(3, 11, count),
+        'home_runs': rng.integers(0, 3, count),
+        'win': result.runs > their,
+        'loss': result.runs < their,
+        'save': np.zeros(count, dtype=bool),
+    })
+
+    # 참석 기록 (경기마다 선수별 참석률 70~100%)
+    players = len(names)
+    attended = rng.random((count, players)) < rng.uniform(0.7, 1.0, (count, players))
+    reasons = rng.choice(ABSENCE_REASONS, (count, players))
+    attendance = pd.DataFrame({
+        'game_number': np.repeat(numbers, players),
+        'game_date': np.repeat(np.asarray(dates, dtype=object), players),
+        'player_index': np.tile(np.arange(players), count),
+        'player_name': np.tile(names, count),
+        'attended': attended.ravel(),
+        'reason': np.where(attended, "", reasons).ravel(),
+    })
+    return SimulatedBatch(int(numbers[0]), games, at_bats, pitching, attendance)
+
+
+def generate_batches(team, n_games: int, seed=None, batch_games: int = BATCH_GAMES,
+                     start_date: Optional[date] = None):
+    """n_games 경기의 기록을 batch_games 경기씩 SimulatedBatch로 생성 (제너레이터)
+
+    같은 seed/batch_games/start_date면 같은 기록이 나온다.
+    start_date를 주지 않으면 마지막 경기가 오늘이 되도록 날짜를 매긴다.
+    """
+    if len(team.players) < LINEUP_SIZE:
+        raise ValueError(f"명단이 {LINEUP_SIZE}명 이상이어야 합니다")
+    rng = np.random.default_rng(seed)
+    distribution = team.distribution()
+    start_date = start_date or (date.today() - timedelta(days=n_games - 1))
+    for first in range(1, n_games + 1, batch_games):
+        numbers = np.arange(first, min(first + batch_games, n_games + 1))
+        yield _simulate_batch(team, distribution, numbers, rng, start_date)
+
+
+def _records(frame: pd.DataFrame) -> list:
+    """DataFrame -> add_*_batch 레코드 목록 (열마다 tolist()로 파이썬 기본 타입 변환, to_dict보다 빠름)"""
+    columns = list(frame.columns)
+    return [dict(zip(columns, row)) for row in zip(*(frame[column].tolist() for column in columns))]
+
+
+class DatabaseSink:
+    """add_*_batch 메서드를 가진 저장소(SheetsDB/SqliteDB/MockSheetsDB)에 묶음 단위로 쓰기
+
+    묶음마다 시트(테이블)별 배치 호출 1회. 선수는 이름이 같은 기존 선수를 재사용하고 없는 선수만 등록한다.
+    """
+
+    def __init__(self, db, team, reset: bool = False):
+        self.db = db
+        if reset:
+            for title in ALL_SHEETS:
+                db.clear_records(title)
+        existing = db.get_players()
+        known = dict(zip(existing['이름'], existing['선수ID'].astype(object))) if len(existing) else {}
+        missing = [p for p in team.players if p[0] not in known]
+        new_ids = db.add_players_batch([
+            {'name': name, 'number': number, 'position': position, 'bat_throw': bat_throw}
+            for name, number, position, bat_throw in missing
+        ])
+        known.update({p[0]: player_id for p, player_id in zip(missing, new_ids)})
+        self.player_ids = np.array([known[name] for name in team.names], dtype=object)
+        self.new_players = len(missing)
+
+    def write(self, batch: SimulatedBatch):
+        game_ids = np.asarray(self.db.add_games_batch(_records(batch.games.drop(columns='game_number'))), dtype=object)
+
+        def link(frame):
+            return frame.assign(
+                game_id=game_ids[frame['game_number'].to_numpy() - batch.first_game],
+                player_id=self.player_ids[frame['player_index'].to_numpy()],
+            ).drop(columns=['game_number', 'player_index'])
+
+        self.db.add_at_bats_batch(_records(link(batch.at_bats)))
+        self.db.add_pitching_batch(_records(link(batch.pitching)))
+        self.db.add_attendance_batch(_records(link(batch.attendance)))
+
+    def close(self):
+        self.db.flush()
+
+
+class ParquetSink:
+    """시트별 Parquet 파일(directory/<시트 이름>.parquet)에 묶음마다 row group 하나씩 쓰기
+
+    컬럼은 시트 헤더와 같고 ID는 저장소와 같은 접두어의 일련번호(G000001 등)로 매긴다.
+    """
+
+    def __init__(self, directory: str, team, reset: bool = False):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow)") from e
+        self._pa, self._pq = pa, pq
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        if not reset and any(os.path.exists(self.path(title)) for title in ALL_SHEETS):
+            raise FileExistsError(f"{directory}에 이미 Parquet 파일이 있습니다 (덮어쓰려면 --reset)")
+        self._writers = {}
+        self._next_ids = {SHEET_AT_BATS: 1, SHEET_PITCHING: 1, SHEET_ATTENDANCE: 1}
+        self._recorded = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        self.player_ids = np.array([f"P{i:03d}" for i in range(1, len(team.players) + 1)], dtype=object)
+        self.new_players = len(team.players)
+        self._write_table(SHEET_PLAYERS, pd.DataFrame({
+            '선수ID': self.player_ids,
+            '이름': team.names,
+            '등번호': [number for _, number, _, _ in team.players],
+            '포지션': [position for _, _, position, _ in team.players],
+            '투타': [bat_throw for _, _, _, bat_throw in team.players],
+            '생성일': self._recorded,
+        }))
+
+    def path(self, title: str) -> str:
+        return os.path.join(self.directory, f"{title}.parquet")
+
+    def _write_table(self, title: str, frame: pd.DataFrame):
+        table = self._pa.Table.from_pandas(frame[ALL_SHEETS[title]], preserve_index=False)
+        writer = self._writers.get(title)
+        if writer is None:
+            writer = self._writers[title] = self._pq.ParquetWriter(self.path(title), table.schema)
+        writer.write_table(table.cast(writer.schema))
+
+    def _record_ids(self, title: str, prefix: str, count: int) -> list:
+        start = self._next_ids[title]
+        self._next_ids[title] += count
+        return [f"{prefix}{i:07d}" for i in range(start, start + count)]
+
+    def _linked(self, frame: pd.DataFrame, title: str, prefix: str, game_ids: np.ndarray, first_game: int) -> dict:
+        """공통 컬럼 (기록ID, 경기ID, 선수ID, 선수명)"""
+        return {
+            '기록ID': self._record_ids(title, prefix, len(frame)),
+            '경기ID': game_ids[frame['game_number'].to_numpy() - first_game],
+            '선수ID': self.player_ids[frame['player_index'].to_numpy()],
+            '선수명': frame['player_name'].to_numpy(),
+        }
+
+    def write(self, batch: SimulatedBatch):
+        games = batch.games
+        game_ids = np.array([f"G{n:06d}" for n in games['game_number']], dtype=object)
+        self._write_table(SHEET_GAMES, pd.DataFrame({
+            '경기ID': game_ids,
+            '날짜': games['date'],
+            '상대팀': games['opponent'],
+            '홈/원정': games['home_away'],
+            '우리점수': games['our_score'],
+            '상대점수': games['their_score'],
+            '결과': np.select([games['our_score'] > games['their_score'], games['our_score'] < games['their_score']],
+                            ["승", "패"], "무"),
+            '구장': games['stadium'],
+            '메모': games['memo'],
+        }))
+
+        at_bats = batch.at_bats
+        self._write_table(SHEET_AT_BATS, pd.DataFrame({
+            **self._linked(at_bats, SHEET_AT_BATS, "AB", game_ids, batch.first_game),
+            '이닝': at_bats['inning'], '타순': at_bats['batting_order'],
+            '결과': at_bats['result'], '안타종류': at_bats['hit_type'],
+            '타점': at_bats['rbis'], '득점': at_bats['runs'],
+            '도루': at_bats['stolen_bases'], '도실': at_bats['caught_stealing'],
+            '볼넷': at_bats['walks'], '삼진': at_bats['strikeouts'], '사구': at_bats['hit_by_pitch'],
+            '희생플라이': at_bats['sacrifice_flies'], '희생번트': at_bats['sacrifice_bunts'],
+            '기록일시': self._recorded,
+        }))
+
+        pitching = batch.pitching
+        self._write_table(SHEET_PITCHING, pd.DataFrame({
+            **self._linked(pitching, SHEET_PITCHING, "PT", game_ids, batch.first_game),
+            '이닝': pitching['innings'], '피안타': pitching['hits'],
+            '실점': pitching['runs'], '자책': pitching['earned_runs'],
+            '볼넷': pitching['walks'], '삼진': pitching['strikeouts'], '피홈런': pitching['home_runs'],
+            '승': pitching['win'].astype(np.int64), '패': pitching['loss'].astype(np.int64),
+            '세이브': pitching['save'].astype(np.int64),
+            '기록일시': self._recorded,
+        }))
+
+        attendance = batch.attendance
+        self._write_table(SHEET_ATTENDANCE, pd.DataFrame({
+            **self._linked(attendance, SHEET_ATTENDANCE, "ATT", game_ids, batch.first_game),
+            '경기일': attendance['game_date'],
+            '참석여부': np.where(attendance['attended'], "참석", "불참"),
+            '사유': attendance['reason'],
+            '기록일시': self._recorded,
+        }))
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
@@ -0,0 +1,289 @@
+"""
+SheetsDB 재시작 경로 회귀 테스트
+디스크 스냅샷 + 스풀에 남은 쓰기로 재시작한 직후의 첫 조회가 백그라운드 연결과 교착되지 않는지 확인
+(gspread 대신 메모리 가짜 스프레드시트 사용)
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+
+import gspread
+import pytest
+
+from instrumentation import METRICS
+from sheets_db import ALL_SHEETS, SHEET_ATTENDANCE, SHEET_PITCHING, SHEET_PLAYERS, MockSheetsDB, SheetsDB, WriteBehindBuffer
+from snapshot_cache import SnapshotCache
+
+URL = "https://docs.google.com/spreadsheets/d/test"
+
+
+class FakeWorksheet:
+    def __init__(self, title: str, rows: list, calls: Counter):
+        self.title = title
+        self.rows = [list(row) for row in rows]
+        self.calls = calls
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def append_row(self, row):
+        self.rows.append(list(row))
+
+    def append_rows(self, rows):
+        self.calls['append_rows'] += 1
+        self.rows.extend([str(value) for value in row] for row in rows)
+
+    def get_all_values(self):
+        return [list(row) for row in self.rows]
+
+    def delete_rows(self, start, end):
+        del self.rows[start - 1:end]
+
+
+class FakeSpreadsheet:
+    def __init__(self, tables: dict):
+        self.calls = Counter()  # API 메서드별 호출 수
+        self._worksheets = {title: FakeWorksheet(title, rows, self.calls) for title, rows in tables.items()}
+
+    def worksheet(self, title):
+        if title not in self._worksheets:
+            raise gspread.WorksheetNotFound(title)
+        return self._worksheets[title]
+
+    def worksheets(self):
+        return list(self._worksheets.values())
+
+    def add_worksheet(self, title, rows, cols):
+        self._worksheets[title] = FakeWorksheet(title, [], self.calls)
+        return self._worksheets[title]
+
+    def values_batch_get(self, ranges):
+        self.calls['values_batch_get'] += 1
+        value_ranges = []
+        for value_range in ranges:
+            match = re.match(r"'(.+)'(?:!A(\d+):[A-Z]+)?$", value_range)
+            start = int(match.group(2) or 1)
+            value_ranges.append({'values': self._worksheets[match.group(1)].get_all_values()[start - 1:]})
+        return {'valueRanges': value_ranges}
+
+
+class FakeSheetsDB(SheetsDB):
+    """가짜 스프레드시트에 연결하는 SheetsDB (connect_delay: 연결에 걸리는 시간)"""
+
+    def __init__(self, spreadsheet: FakeSpreadsheet, connect_delay: float = 0.0, **kwargs):
+        super().__init__(spreadsheet_url=URL, **kwargs)
+        self._fake = spreadsheet
+        self._connect_delay = connect_delay
+
+    def _open(self):
+        time.sleep(self._connect_delay)
+        self._client = object()
+        self._spreadsheet = self._fake
+
+
+def _lock_is_free(lock) -> bool:
+    """다른 스레드에서 lock을 잡을 수 있는지 (호출 스레드가 잡고 있으면 False)"""
+    acquired = []
+
+    def probe():
+        if lock.acquire(timeout=1):
+            lock.release()
+            acquired.append(True)
+
+    thread = threading.Thread(target=probe)
+    thread.start()
+    thread.join()
+    return bool(acquired)
+
+
+class RecordingSnapshotCache(SnapshotCache):
+    """저장할 때마다 저장한 시트와 그 순간 db._lock이 비어 있었는지 기록"""
+
+    db = None
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self.saves = []
+
+    def save(self, source: str, tables: dict):
+        self.saves.append((sorted(tables), _lock_is_free(self.db._lock)))
+        super().save(source, tables)
+
+
+def test_restart_with_snapshot_and_spooled_writes_does_not_deadlock(tmp_path):
+    tables = {title: [headers] for title, headers in ALL_SHEETS.items()}
+    player = ["P1", "홍길동", "7", "유격수", "우투우타", "2024-01-01 00:00:00"]
+    tables[SHEET_PLAYERS] = [ALL_SHEETS[SHEET_PLAYERS], player]
+    snapshot = SnapshotCache(str(tmp_path / "snapshot"))
+    snapshot.save(URL, tables)
+
+    # 이전 프로세스가 전송하지 못하고 스풀에 남긴 행
+    spool_path = str(tmp_path / "spool.jsonl")
+    WriteBehindBuffer(spool_path=spool_path).add(SHEET_PLAYERS, [["P2", "김철수", "10", "투수", "좌투좌타", "2024-01-02 00:00:00"]])
+
+    spreadsheet = FakeSpreadsheet(tables)
+    # 재시작 직후 첫 조회가 연결보다 먼저 오도록 연결을 늦춤
+    db = FakeSheetsDB(spreadsheet, connect_delay=0.3, write_buffer=WriteBehindBuffer(spool_path=spool_path),
+                      snapshot_cache=snapshot)
+    db.connect()
+
+    result = {}
+    reader = threading.Thread(target=lambda: result.setdefault('players', db.get_players()), daemon=True)
+    reader.start()
+    reader.join(timeout=5)
+    assert not reader.is_alive(), "재시작 직후 첫 조회가 백그라운드 연결과 교착됨"
+    db._connecting.join(timeout=5)
+    assert not db._connecting.is_alive()
+
+    assert list(result['players']['선수ID']) == ["P1", "P2"]  # 스풀의 대기 행도 조회에 반영
+    assert db.flush() == 1
+    assert db.pending_writes() == 0
+    assert spreadsheet.worksheet(SHEET_PLAYERS).get_all_values()[-1][0] == "P2"
+    assert list(db.get_players()['선수ID']) == ["P1", "P2"]
+
+
+def test_ids_are_unique_across_batches_in_the_same_second():
+    db = SheetsDB(spreadsheet_url=URL, write_buffer=WriteBehindBuffer(flush_size=10 ** 6, flush_interval=3600))
+    records = [{'name': f"선수{i}", 'number': i, 'position': "투수", 'bat_throw': "우투우타"} for i in range(5)]
+    ids = db.add_players_batch(records) + db.add_players_batch(records) + [db.add_player("단건", 99, "포수", "우투우타")]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def test_snapshot_saves_are_batched_and_written_outside_the_lock(tmp_path):
+    tables = {title: [headers] for title, headers in ALL_SHEETS.items()}
+    snapshot = RecordingSnapshotCache(str(tmp_path / "snapshot"))
+    db = FakeSheetsDB(FakeSpreadsheet(tables), snapshot_cache=snapshot)
+    db.SNAPSHOT_DEBOUNCE = 0.2
+    snapshot.db = db
+    db.connect()
+
+    db.load_all()
+    db.add_attendance("G1", "2024-01-01", "P1", "홍길동", True)
+    db.get_attendance()  # 추가 전용 시트의 증분 병합
+    assert snapshot.saves == []  # 조회 경로에서는 저장하지 않음
+
+    time.sleep(0.6)
+    assert snapshot.saves == [(sorted(ALL_SHEETS), True)]
+    assert len(SnapshotCache(snapshot.directory).load(URL)[SHEET_ATTENDANCE]) == 2
+
+
+def test_remote_edits_are_picked_up_by_periodic_revalidation():
+    tables = {title: [headers] for title, headers in ALL_SHEETS.items()}
+    tables[SHEET_PLAYERS] = [ALL_SHEETS[SHEET_PLAYERS], ["P1", "홍길동", "7", "유격수", "우투우타", "2024-01-01 00:00:00"]]
+    spreadsheet = FakeSpreadsheet(tables)
+    db = FakeSheetsDB(spreadsheet)
+    db.connect()
+    db.load_all()
+    version = db.data_version(SHEET_PLAYERS)
+    assert db._revalidation is None  # 주기 전에는 확인하지 않음
+
+    # 스프레드시트에서 직접 수정
+    spreadsheet.worksheet(SHEET_PLAYERS).rows[1][1] = "홍길순"
+    db.REVALIDATE_INTERVAL = 0
+    assert db.data_version(SHEET_PLAYERS) == version  # 확인은 백그라운드에서 진행
+    db._revalidation.join(timeout=5)
+
+    assert db.data_version(SHEET_PLAYERS) > version
+    assert list(db.get_players()['이름']) == ["홍길순"]
+    assert db.revalidate() == []  # 바뀐 것이 없으면 버전 유지
+
+
+def test_buffered_at_bats_are_read_back_without_a_round_trip():
+    tables = {title: [headers] for title, headers in ALL_SHEETS.items()}
+    spreadsheet = FakeSpreadsheet(tables)
+    db = FakeSheetsDB(spreadsheet, write_buffer=WriteBehindBuffer(flush_size=50, flush_interval=3600))
+    db.connect()
+    db.load_all()
+    spreadsheet.calls.clear()
+
+    # 경기 기록 화면: 타석마다 저장 후 rerun으로 다시 조회
+    for i in range(6):
+        db.add_at_bat("G1", "P1", "홍길동", 1, 1, "안타", "1루타")
+        at_bats = db.get_at_bats(game_id="G1")
+        assert len(at_bats) == i + 1
+        assert db.pending_writes() == i + 1
+    assert spreadsheet.calls == Counter()  # 모아 두기만 하고 API 호출 없음
+    assert at_bats['타순'].dtype == 'int64'
+
+    assert db.flush() == 6
+    assert spreadsheet.calls == Counter({'append_rows': 1})
+    at_bats = db.get_at_bats()
+    assert len(at_bats) == 6 and at_bats['기록ID'].is_unique  # 전송 후 다시 읽어도 중복 없음
+    assert spreadsheet.calls == Counter({'append_rows': 1, 'values_batch_get': 1})
+
+
+def test_buffer_is_sent_in_the_background_once_the_interval_passes():
+    spreadsheet = FakeSpreadsheet({title: [headers] for title, headers in ALL_SHEETS.items()})
+    db = FakeSheetsDB(spreadsheet, write_buffer=WriteBehindBuffer(flush_size=50, flush_interval=0.2))
+    db.connect()
+    db.add_player("홍길동", 7, "유격수", "우투우타")
+    db.add_player("김철수", 10, "투수", "좌투좌타")
+    assert db.pending_writes() == 2
+
+    time.sleep(0.6)
+    assert db.pending_writes() == 0
+    assert spreadsheet.calls['append_rows'] == 1
+    assert list(db.get_players()['이름']) == ["홍길동", "김철수"]
+
+
+def test_flush_sends_outside_the_lock_and_records_failures():
+    spreadsheet = FakeSpreadsheet({title: [headers] for title, headers in ALL_SHEETS.items()})
+    db = FakeSheetsDB(spreadsheet, write_buffer=WriteBehindBuffer(flush_size=50, flush_interval=3600))
+    db.connect()
+    db.load_all()
+    db.add_player("홍길동", 7, "유격수", "우투우타")
+
+    worksheet = spreadsheet.worksheet(SHEET_PLAYERS)
+    lock_free = []
+
+    def failing_append_rows(rows):
+        lock_free.append(_lock_is_free(db._lock))
+        raise ConnectionError("네트워크 끊김")
+
+    worksheet.append_rows = failing_append_rows
+    with pytest.raises(ConnectionError):
+        db.flush()
+    assert lock_free == [True]  # 전송 중에도 다른 세션의 조회는 진행
+    assert db.pending_writes() == 1
+    assert list(db.get_players()['이름']) == ["홍길동"]
+    assert db.last_flush_error() == "ConnectionError: 네트워크 끊김"
+    assert METRICS.recent_events().iloc[0]['event'] == 'flush_error'
+
+    del worksheet.append_rows  # 원래 메서드로 복구
+    assert db.flush() == 1
+    assert db.last_flush_error() is None
+    assert list(db.get_players()['이름']) == ["홍길동"]
+
+
+def test_mock_frames_are_private_copies():
+    db = MockSheetsDB()
+    db.add_player("홍길동", 7, "유격수", "우투우타")
+    db.add_at_bat("G001", "P001", "홍길동", 1, 1, "안타", "1루타")
+
+    players = db.get_players()
+    players.loc[0, '이름'] = "김철수"
+    players['메모'] = "추가 컬럼"
+    at_bats = db.get_at_bats()
+    at_bats.loc[0, '타순'] = 9
+    box_scores = db.get_box_scores()
+    box_scores.loc[0, '안타'] = 5
+
+    assert list(db.get_players()['이름']) == ["홍길동"]
+    assert list(db.get_players().columns) == list(ALL_SHEETS[SHEET_PLAYERS])
+    assert list(db.get_at_bats()['타순']) == [1]
+    assert list(db.get_box_scores()['안타']) == [1]
+
+
+def test_pitching_ids_use_the_same_prefix_as_other_backends():
+    db = SheetsDB(spreadsheet_url=URL, write_buffer=WriteBehindBuffer(flush_size=10 ** 6, flush_interval=3600))
+    record = {'game_id': "G1", 'player_id': "P1", 'player_name': "홍길동", 'innings': 5.0, 'hits': 3,
+              'runs': 1, 'earned_runs': 1, 'walks': 2, 'strikeouts': 4, 'home_runs': 0,
+              'win': True, 'loss': False, 'save': False}
+    ids = db.add_pitching_batch([record, record])
+    ids.append(db.add_pitching(**record))
+    assert all(record_id.startswith("PT") for record_id in ids)
+    assert MockSheetsDB.ID_PREFIXES[SHEET_PITCHING] == "PT"
@@ -0,0 +1,35 @@
+"""
+SqliteDB 회귀 테스트
+기록을 지운 뒤 새로 발급하는 ID가 이전 ID와 겹치지 않는지, 박스스코어가 지운 기록을 남기지 않는지 확인
+"""
+
+from sqlite_db import SqliteDB
+
+
+def _add_at_bats(db, game_id, results):
+    return [db.add_at_bat(game_id, "P001", "홍길동", 1, 1, result, "1루타" if result == "안타" else "")
+            for result in results]
+
+
+def test_ids_are_not_reused_after_clear_records(tmp_path):
+    db = SqliteDB(str(tmp_path / "statz.db"))
+    db.connect()
+    first = _add_at_bats(db, "G001", ["안타", "삼진"])
+    assert db.get_box_scores()['타석'].sum() == 2
+
+    db.clear_records("타석기록")
+    assert db.get_box_scores().empty
+    second = _add_at_bats(db, "G002", ["삼진", "볼넷"])
+    assert not set(first) & set(second)
+
+    box = db.get_box_scores()
+    assert list(box['경기ID']) == ["G002"]
+    assert box['안타'].sum() == 0 and box['타석'].sum() == 2
+    db.close()
+
+    # 다시 열어도 일련번호가 이어짐
+    db = SqliteDB(str(tmp_path / "statz.db"))
+    db.connect()
+    third = _add_at_bats(db, "G003", ["안타"])
+    assert third[0] > max(second)
+    db.close()